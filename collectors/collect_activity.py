@@ -1,95 +1,370 @@
 #!/usr/bin/env python3
+"""
+collect_activity.py - Recent chat activity collector for Rebecca's Room
+
+Ingests OpenClaw session logs (*.jsonl) incrementally into an indexed
+SQLite store (domain/activity.py) and writes src/data/activity.json as a
+query over it: the latest user/assistant messages plus per-day counts and
+an hourly heatmap. Each session line is read once; per-session
+checkpoints (inode, size, mtime, offset) skip unchanged files and resume
+grown ones. Messages of session files that were deleted are dropped.
+
+With --no-db, the newest session files are read directly instead:
+they are read backwards from the end in blocks and reading stops
+once `limit` qualifying messages are found, so runtime does not depend on
+session file size. A checkpoint (inode, size, mtime and the messages
+already found per file) is persisted between runs: unchanged sessions are
+not opened at all, and grown sessions are only read past the old end.
+
+Usage:
+    python3 collectors/collect_activity.py           # ingest + query DB
+    python3 collectors/collect_activity.py --no-db   # tail reader only
+
+Dependencies: Python 3.9+ stdlib only (no pip packages)
+"""
+
 import json
 import os
 import sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+# -- Domain layer import --
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from domain import activity as domain_activity
+from domain.schema import write_json_atomic
+
 # Constants
 JST = timezone(timedelta(hours=9))
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "src" / "data"
 OUTPUT_FILE = OUTPUT_DIR / "activity.json"
 SESSIONS_DIR = Path.home() / ".openclaw" / "agents" / "main" / "sessions"
+CHECKPOINT_FILE = PROJECT_ROOT / ".activity-checkpoint.json"
+ACTIVITY_DB = PROJECT_ROOT / "activity.db"
+
+MAX_SESSIONS = 10  # newest session files considered
+BLOCK_SIZE = 64 * 1024  # bytes read per backward step
+DISPLAY_TEXT_MAX = 120  # characters of a message shown in activity.json
+INDEX_TEXT_MAX = 1000  # characters of a message stored for search
+DAILY_COUNT_DAYS = 14
+HOURLY_COUNT_DAYS = 30
+
 
 def log(msg):
     print(f"[activity] {msg}", file=sys.stderr)
 
-def get_recent_activity(limit=15):
+
+# ---------------------------------------------------------------------------
+# Reverse block reader
+# ---------------------------------------------------------------------------
+
+def complete_end(f, start, end, block_size=BLOCK_SIZE):
+    """Offset just past the last newline in f[start:end] (start if there is none)."""
+    pos = end
+    while pos > start:
+        size = min(block_size, pos - start)
+        pos -= size
+        f.seek(pos)
+        i = f.read(size).rfind(b"\n")
+        if i >= 0:
+            return pos + i + 1
+    return start
+
+
+def read_lines_reverse(f, start, end, block_size=BLOCK_SIZE):
+    """
+    Yield the non-empty lines of f[start:end] (bytes, no newline), last first.
+    `start` must be at a line boundary.
+    """
+    pos = end
+    tail = b""
+    while pos > start:
+        size = min(block_size, pos - start)
+        pos -= size
+        f.seek(pos)
+        lines = (f.read(size) + tail).split(b"\n")
+        tail = lines[0]
+        for line in reversed(lines[1:]):
+            if line:
+                yield line
+    if tail:
+        yield tail
+
+
+def read_lines_forward(f, start, end):
+    """Yield (offset, line) for the non-empty lines of f[start:end], first first."""
+    f.seek(start)
+    pos = start
+    while pos < end:
+        line = f.readline()
+        if not line:
+            break
+        offset = pos
+        pos += len(line)
+        line = line.rstrip(b"\n")
+        if line:
+            yield offset, line
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def truncate(text, max_len=DISPLAY_TEXT_MAX):
+    return text[:max_len] + ("..." if len(text) > max_len else "")
+
+
+def parse_activity(line, fallback_mtime, max_len=DISPLAY_TEXT_MAX):
+    """Return an activity dict for a qualifying chat message line, else None."""
+    try:
+        data = json.loads(line)
+        if data.get('type') != 'message':
+            return None
+        msg = data.get('message', {})
+        role = msg.get('role')
+        if role not in ['user', 'assistant']:
+            return None
+
+        # Convert ISO timestamp (handling Z or +00:00)
+        ts_str = data.get('timestamp')
+        if ts_str:
+            timestamp = datetime.fromisoformat(ts_str.replace('Z', '+00:00')).astimezone(JST)
+        else:
+            timestamp = datetime.fromtimestamp(fallback_mtime, tz=JST)
+
+        text = ""
+        for item in msg.get('content', []):
+            if item.get('type') == 'text':
+                text += item.get('text', '')
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+    # Truncate and clean
+    text = text.strip().replace('\n', ' ')
+    # Filter out the heartbeat and progress reporting garbage if possible
+    if "HEARTBEAT" in text and role == "user":
+        return None
+    if "[cron:" in text:
+        return None
+
+    text = truncate(text, max_len)
+    if not text or len(text) < 10:
+        return None
+
+    return {
+        "timestamp": timestamp.isoformat(),
+        "role": role,
+        "text": text,
+        "type": "chat"
+    }
+
+
+def scan_session(path, st, limit, cached=None):
+    """
+    Return the checkpoint record for one session file: its newest `limit`
+    activities (newest first) plus the identity/offset used to resume.
+    `cached` is the previous record; it is reused or extended when valid.
+    """
+    ident = {"inode": st.st_ino, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if cached is not None and cached.get("limit", 0) >= limit:
+        if all(cached.get(k) == v for k, v in ident.items()):
+            return cached  # unchanged: not even opened
+        resumable = cached["inode"] == st.st_ino and st.st_size >= cached["offset"]
+    else:
+        resumable = False
+
+    start = cached["offset"] if resumable else 0
+    found = []
+    with open(path, "rb") as f:
+        end = complete_end(f, start, st.st_size)  # ignore a half-written last line
+        for line in read_lines_reverse(f, start, end):
+            activity = parse_activity(line, st.st_mtime)
+            if activity is not None:
+                found.append(activity)
+                if len(found) >= limit:
+                    break
+    if resumable:
+        found = (found + cached["activities"])[:limit]
+    return {**ident, "offset": end, "limit": limit, "activities": found}
+
+
+# ---------------------------------------------------------------------------
+# Ingestion (indexed store)
+# ---------------------------------------------------------------------------
+
+def ingest_session(conn, path, st):
+    """
+    Load new messages of one session file into the activity DB.
+    Returns the number of messages inserted.
+    """
+    session = Path(path).stem
+    cp = domain_activity.get_checkpoint(conn, session)
+    ident = {"inode": st.st_ino, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if cp is not None and all(cp[k] == v for k, v in ident.items()):
+        return 0
+    resumable = cp is not None and cp["inode"] == st.st_ino and st.st_size >= cp["offset"]
+
+    with conn:
+        if cp is not None and not resumable:
+            domain_activity.delete_session(conn, session)  # replaced or truncated
+        start = cp["offset"] if resumable else 0
+        with open(path, "rb") as f:
+            end = complete_end(f, start, st.st_size)  # ignore a half-written last line
+            rows = []
+            for offset, line in read_lines_forward(f, start, end):
+                activity = parse_activity(line, st.st_mtime, INDEX_TEXT_MAX)
+                if activity is not None:
+                    ts = datetime.fromisoformat(activity["timestamp"]).timestamp()
+                    rows.append((session, offset, ts, activity["role"], activity["text"]))
+        inserted = domain_activity.insert_messages(conn, rows)
+        domain_activity.set_checkpoint(conn, session, offset=end, **ident)
+    return inserted
+
+
+def ingest_sessions(conn, sessions_dir=None):
+    """
+    Ingest every session file and drop sessions whose file was deleted.
+    Returns the number of messages inserted.
+    """
+    sessions_dir = SESSIONS_DIR if sessions_dir is None else Path(sessions_dir)
+    if not sessions_dir.is_dir():
+        return 0  # unmounted or moved: keep what is stored
+    inserted = 0
+    with os.scandir(sessions_dir) as it:
+        entries = [e for e in it if e.name.endswith(".jsonl") and e.is_file()]
+    for entry in entries:
+        try:
+            inserted += ingest_session(conn, entry.path, entry.stat())
+        except OSError as e:
+            log(f"Error reading {entry.path}: {e}")
+
+    present = {Path(e.name).stem for e in entries}
+    gone = domain_activity.checkpointed_sessions(conn) - present
+    if gone:
+        with conn:  # the FTS delete trigger drops their index rows
+            removed = sum(domain_activity.delete_session(conn, s) for s in sorted(gone))
+        log(f"Removed {removed} messages of {len(gone)} deleted sessions")
+    return inserted
+
+
+def activity_from_row(row):
+    """Format a stored message like get_recent_activity() does."""
+    return {
+        "timestamp": datetime.fromtimestamp(row["ts"], tz=JST).isoformat(),
+        "role": row["role"],
+        "text": truncate(row["text"]),
+        "type": "chat"
+    }
+
+
+def build_output(conn, limit=15, now=None):
+    """activity.json payload as a query over the activity DB."""
+    now = datetime.now(JST) if now is None else now
+    epoch = now.timestamp()
+    return {
+        "timestamp": now.isoformat(),
+        "activities": [activity_from_row(r) for r in domain_activity.recent(conn, limit)],
+        "daily_counts": domain_activity.daily_counts(conn, epoch - DAILY_COUNT_DAYS * 86400),
+        "hourly_counts": domain_activity.hourly_counts(conn, epoch - HOURLY_COUNT_DAYS * 86400),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint (--no-db tail reader)
+# ---------------------------------------------------------------------------
+
+def load_checkpoint(path=CHECKPOINT_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoint(checkpoint, path=CHECKPOINT_FILE):
+    try:
+        write_json_atomic(checkpoint, path, compact=True)
+    except OSError as e:
+        log(f"Could not save checkpoint: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def get_recent_activity(limit=15, sessions_dir=None, checkpoint=None):
+    """
+    Latest `limit` chat messages across the newest MAX_SESSIONS sessions.
+    `checkpoint` (a dict, updated in place) lets unchanged sessions be skipped.
+    """
+    sessions_dir = SESSIONS_DIR if sessions_dir is None else Path(sessions_dir)
+    checkpoint = {} if checkpoint is None else checkpoint
     activities = []
     try:
-        if not SESSIONS_DIR.is_dir():
+        if not sessions_dir.is_dir():
             return []
-        
-        # Get all .jsonl files, sorted by mtime
-        jsonl_files = sorted(
-            SESSIONS_DIR.glob("*.jsonl"),
-            key=lambda f: f.stat().st_mtime,
-            reverse=True
-        )
-        
-        for f in jsonl_files[:10]: # Check last 10 sessions
-            with open(f, 'r') as file:
-                lines = file.readlines()
-                for line in reversed(lines):
-                    try:
-                        data = json.loads(line)
-                        if data.get('type') == 'message':
-                            msg = data.get('message', {})
-                            role = msg.get('role')
-                            content = msg.get('content', [])
-                            
-                            if role in ['user', 'assistant']:
-                                # Convert ISO timestamp (handling Z or +00:00)
-                                ts_str = data.get('timestamp')
-                                if ts_str:
-                                    timestamp = datetime.fromisoformat(ts_str.replace('Z', '+00:00')).astimezone(JST)
-                                else:
-                                    timestamp = datetime.fromtimestamp(f.stat().st_mtime, tz=JST)
-                                
-                                text = ""
-                                for item in content:
-                                    if item.get('type') == 'text':
-                                        text += item.get('text', '')
-                                
-                                # Truncate and clean
-                                text = text.strip().replace('\n', ' ')
-                                # Filter out the heartbeat and progress reporting garbage if possible
-                                if "HEARTBEAT" in text and role == "user": continue
-                                if "[cron:" in text: continue
-                                
-                                text = text[:120] + ("..." if len(text) > 120 else "")
-                                if not text or len(text) < 10: continue
-                                
-                                activities.append({
-                                    "timestamp": timestamp.isoformat(),
-                                    "role": role,
-                                    "text": text,
-                                    "type": "chat"
-                                })
-                                if len(activities) >= limit: break
-                    except:
-                        continue
-            if len(activities) >= limit: break
-            
+
+        # One stat per entry, newest sessions first
+        sessions = []
+        with os.scandir(sessions_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".jsonl") and entry.is_file():
+                    sessions.append((entry.path, entry.stat()))
+        sessions.sort(key=lambda s: s[1].st_mtime, reverse=True)
+        sessions = sessions[:MAX_SESSIONS]
+
+        for path, st in sessions:
+            if len(activities) >= limit:
+                break
+            try:
+                record = scan_session(path, st, limit, checkpoint.get(path))
+            except OSError as e:
+                log(f"Error reading {path}: {e}")
+                continue
+            checkpoint[path] = record
+            activities.extend(record["activities"][:limit - len(activities)])
+
+        # Forget sessions that dropped out of the newest MAX_SESSIONS
+        current = {path for path, _ in sessions}
+        for path in list(checkpoint):
+            if path not in current:
+                del checkpoint[path]
+
     except Exception as e:
         log(f"Error: {e}")
-    
+
     return sorted(activities, key=lambda x: x['timestamp'], reverse=True)
 
+
 def main():
-    if not OUTPUT_DIR.exists():
-        os.makedirs(OUTPUT_DIR)
-    
-    activities = get_recent_activity()
-    output = {
-        "timestamp": datetime.now(JST).isoformat(),
-        "activities": activities
-    }
-    
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    log(f"Wrote {len(activities)} activities to {OUTPUT_FILE}")
+    if "--no-db" in sys.argv:
+        checkpoint = load_checkpoint()
+        activities = get_recent_activity(checkpoint=checkpoint)
+        save_checkpoint(checkpoint)
+        output = {
+            "timestamp": datetime.now(JST).isoformat(),
+            "activities": activities
+        }
+    else:
+        conn = domain_activity.init_db(ACTIVITY_DB)
+        try:
+            inserted = ingest_sessions(conn)
+            log(f"Ingested {inserted} new messages")
+            output = build_output(conn)
+        finally:
+            conn.close()
+
+    result = write_json_atomic(output, OUTPUT_FILE, skip_unchanged=True)
+    if result.written:
+        log(f"Wrote {len(output['activities'])} activities to {OUTPUT_FILE}")
+    else:
+        log(f"Unchanged, skipped writing {OUTPUT_FILE} ({result.bytes} bytes)")
+
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 """
-collect_health.py - Mac system health collector for Rebecca's Room
+collect_health.py - System health collector for Rebecca's Room
 
-Collects CPU, memory, disk, temperature, and uptime metrics from macOS,
-delegates classification/scoring to domain layer, and writes the result
-to src/data/health.json.
+Collects CPU, memory, disk, temperature, and uptime metrics through a
+metric source (macOS: top/vm_stat/sysctl, Linux: /proc and /sys read
+directly), delegates classification/scoring to domain layer, and writes
+the result to src/data/health.json.
 
 Usage:
     python3 collectors/collect_health.py        # normal run
@@ -14,12 +15,15 @@ Dependencies: Python 3.9+ stdlib only (no pip packages)
 """
 
 import json
+import math
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
@@ -29,6 +33,7 @@ if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
 from domain import health as domain_health
+from domain import history as domain_history
 from domain.schema import inject_version, inject_staleness, write_json_atomic
 
 # ---------------------------------------------------------------------------
@@ -39,9 +44,34 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "src", "data")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "health.json")
+HISTORY_FILE = os.path.join(OUTPUT_DIR, "health_history.json")
+HISTORY_DB = os.path.join(PROJECT_ROOT, "health_history.db")
+# Previous CPU tick reading + EWMA, kept between one-shot (cron) runs
+CPU_STATE_FILE = os.path.join(PROJECT_ROOT, ".cpu-state.json")
+
+# Time constant of the smoothed CPU usage (seconds): a step change is
+# ~63% reflected after one time constant, regardless of sampling interval
+CPU_EWMA_TAU_SEC = 900.0
+# host_statistics() tick counters are 32-bit and wrap around
+MACH_TICK_WRAP = 2 ** 32
+# Boot times closer than this are the same boot (clock adjustments shift them)
+BOOT_TIME_TOLERANCE_SEC = 60.0
 
 JST = timezone(timedelta(hours=9))
 
+# Per-probe deadlines (seconds) and the budget for a whole collection.
+# Probes run concurrently, so a collection takes as long as its slowest probe.
+PROBE_TIMEOUTS = {
+    "cpu": 5.0,
+    "memory": 3.0,
+    "disk": 3.0,
+    "temperature": 3.0,
+    "uptime": 3.0,
+}
+COLLECT_BUDGET_SEC = 8.0
+# Subprocess timeout when a metric function is called outside run_probes()
+COMMAND_TIMEOUT_SEC = 10.0
+
 VERBOSE = "-v" in sys.argv
 
 
@@ -55,6 +85,20 @@ def log(msg):
 # Metric Collection Functions (I/O — unchanged)
 # ---------------------------------------------------------------------------
 
+# Deadline (time.monotonic()) of the probe running on this thread, set by run_probes()
+_probe_deadline = threading.local()
+
+
+def run_command(args):
+    # type: (list) -> subprocess.CompletedProcess
+    """
+    Run a command with captured text output. Inside a probe the child is
+    killed at the probe's deadline, so a hung command cannot outlive it.
+    """
+    deadline = getattr(_probe_deadline, "value", None)
+    timeout = COMMAND_TIMEOUT_SEC if deadline is None else max(0.0, deadline - time.monotonic())
+    return subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+
 def get_cpu_usage():
     # type: () -> float
     """
@@ -62,10 +106,7 @@ def get_cpu_usage():
     Parses the "CPU usage" line: "CPU usage: XX.XX% user, YY.YY% sys, ZZ.ZZ% idle"
     Returns user + sys as total percentage.
     """
-    result = subprocess.run(
-        ["/usr/bin/top", "-l", "1", "-n", "0"],
-        capture_output=True, text=True, timeout=30
-    )
+    result = run_command(["/usr/bin/top", "-l", "1", "-n", "0"])
     output = result.stdout
     for line in output.splitlines():
         if "CPU usage" in line:
@@ -94,19 +135,13 @@ def get_memory():
     - inactive pages are file cache, NOT counted as "used"
     """
     # Get total memory
-    result = subprocess.run(
-        ["/usr/sbin/sysctl", "-n", "hw.memsize"],
-        capture_output=True, text=True, timeout=10
-    )
+    result = run_command(["/usr/sbin/sysctl", "-n", "hw.memsize"])
     total_bytes = int(result.stdout.strip())
     total_gb = total_bytes / (1024 ** 3)
     log(f"Total memory: {total_bytes} bytes ({total_gb:.1f} GB)")
 
     # Get vm_stat
-    result = subprocess.run(
-        ["/usr/bin/vm_stat"],
-        capture_output=True, text=True, timeout=10
-    )
+    result = run_command(["/usr/bin/vm_stat"])
     vm_output = result.stdout
     log(f"vm_stat output:\n{vm_output}")
 
@@ -179,10 +214,7 @@ def get_temperature():
             log("osx-cpu-temp not found, skipping temperature")
             return None
 
-        result = subprocess.run(
-            [osx_cpu_temp],
-            capture_output=True, text=True, timeout=10
-        )
+        result = run_command([osx_cpu_temp])
         output = result.stdout.strip()
         log(f"osx-cpu-temp output: {output}")
 
@@ -207,10 +239,7 @@ def get_uptime():
     Parses the epoch timestamp and computes delta from now.
     Returns {"seconds": int, "display": str} like "3d 14h 2m".
     """
-    result = subprocess.run(
-        ["/usr/sbin/sysctl", "-n", "kern.boottime"],
-        capture_output=True, text=True, timeout=10
-    )
+    result = run_command(["/usr/sbin/sysctl", "-n", "kern.boottime"])
     output = result.stdout.strip()
     log(f"kern.boottime: {output}")
 
@@ -226,7 +255,19 @@ def get_uptime():
     if delta_seconds < 0:
         delta_seconds = 0
 
-    # Format display string
+    display = format_uptime(delta_seconds)
+
+    log(f"Uptime: {delta_seconds}s ({display})")
+
+    return {
+        "seconds": delta_seconds,
+        "display": display,
+    }
+
+
+def format_uptime(delta_seconds):
+    # type: (int) -> str
+    """Format seconds as a display string like "3d 14h 2m"."""
     days = delta_seconds // 86400
     hours = (delta_seconds % 86400) // 3600
     minutes = (delta_seconds % 3600) // 60
@@ -237,70 +278,436 @@ def get_uptime():
     if days > 0 or hours > 0:
         parts.append(f"{hours}h")
     parts.append(f"{minutes}m")
-    display = " ".join(parts)
+    return " ".join(parts)
 
-    log(f"Uptime: {delta_seconds}s ({display})")
 
-    return {
-        "seconds": delta_seconds,
-        "display": display,
+# ---------------------------------------------------------------------------
+# CPU Sampling (cumulative tick counters)
+# ---------------------------------------------------------------------------
+
+_mach_host = None
+
+
+def read_mach_cpu_ticks():
+    # type: () -> tuple
+    """
+    Return (busy, total) CPU ticks since boot on macOS via host_statistics()
+    (HOST_CPU_LOAD_INFO), called through ctypes: no subprocess, no sampling delay.
+    """
+    global _mach_host
+    import ctypes
+    import ctypes.util
+
+    libc = ctypes.CDLL(ctypes.util.find_library("c"))
+    if _mach_host is None:
+        _mach_host = libc.mach_host_self()
+    info = (ctypes.c_uint * 4)()  # user, system, idle, nice
+    count = ctypes.c_uint(4)
+    kr = libc.host_statistics(_mach_host, 3, info, ctypes.byref(count))
+    if kr != 0:
+        raise OSError(f"host_statistics failed (kern_return_t={kr})")
+    user, system, idle, nice = info
+    busy = user + system + nice
+    return busy, busy + idle
+
+
+def read_mach_boot_time():
+    # type: () -> float
+    """Return the boot time (epoch seconds) from sysctl kern.boottime via ctypes."""
+    import ctypes
+    import ctypes.util
+
+    libc = ctypes.CDLL(ctypes.util.find_library("c"))
+    timeval = (ctypes.c_long * 2)()  # tv_sec, tv_usec (+ padding)
+    size = ctypes.c_size_t(ctypes.sizeof(timeval))
+    if libc.sysctlbyname(b"kern.boottime", timeval, ctypes.byref(size), None, 0) != 0:
+        raise OSError("sysctlbyname(kern.boottime) failed")
+    return float(timeval[0])
+
+
+class CpuSampler:
+    """
+    CPU usage from cumulative (busy, total) tick counters.
+
+    Each sample() reports the exact utilisation since the previous reading
+    (since boot for the first one, or after a reboot resets the counters)
+    and updates an exponentially weighted moving average whose weight
+    follows the elapsed time (time constant `tau` seconds).
+
+    Counters that wrap at `wrap` (e.g. 2**32) are differenced modulo
+    `wrap`. A reboot is detected by `read_boot_time` changing; without it
+    (or its value), counters going backwards are taken as a reboot.
+
+    The previous reading lives in memory and, if `state_path` is given, in a
+    small JSON file so one-shot runs continue where the last one stopped.
+    """
+
+    def __init__(self, read_ticks, state_path=None, tau=CPU_EWMA_TAU_SEC, clock=time.time,
+                 wrap=None, read_boot_time=None):
+        self.read_ticks = read_ticks
+        self.state_path = state_path
+        self.tau = tau
+        self.clock = clock
+        self.wrap = wrap
+        self.read_boot_time = read_boot_time
+        self.state = None  # {"busy", "total", "time", "ewma", "boot"}
+        self.usage = None
+        self.ewma = None
+        if state_path:
+            self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            loaded = {k: float(state[k]) for k in ("busy", "total", "time", "ewma")}
+            boot = state.get("boot")
+            loaded["boot"] = float(boot) if boot is not None else None
+            return loaded
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _boot_time(self):
+        if self.read_boot_time is None:
+            return None
+        try:
+            return self.read_boot_time()
+        except (OSError, AttributeError, ValueError) as e:
+            log(f"Boot time unavailable: {e}")
+            return None
+
+    def _deltas(self, prev, busy, total, boot):
+        # type: (dict | None, int, int, float | None) -> tuple | None
+        """(d_busy, d_total) since prev, or None if prev is from another boot."""
+        if prev is None:
+            return None
+        prev_boot = prev.get("boot")
+        if boot is not None and prev_boot is not None and abs(boot - prev_boot) > BOOT_TIME_TOLERANCE_SEC:
+            return None
+        d_busy = busy - prev["busy"]
+        d_total = total - prev["total"]
+        if self.wrap:
+            d_busy %= self.wrap
+            d_total %= self.wrap
+        elif d_total <= 0 or d_busy < 0:
+            return None  # counters went backwards: rebooted
+        if d_busy > d_total:
+            return None  # inconsistent pair: start over rather than report >100%
+        return d_busy, d_total
+
+    def _save_state(self):
+        try:
+            write_json_atomic(self.state, self.state_path, compact=True)
+        except OSError as e:
+            log(f"Could not save CPU state: {e}")
+
+    def sample(self):
+        # type: () -> float
+        busy, total = self.read_ticks()
+        boot = self._boot_time()
+        now = self.clock()
+        prev = self.state
+        deltas = self._deltas(prev, busy, total, boot)
+        if deltas is None:
+            prev = None
+            d_busy, d_total = busy, total
+        else:
+            d_busy, d_total = deltas
+        usage = d_busy / d_total * 100 if d_total > 0 else 0.0
+
+        if prev is None:
+            ewma = usage
+        else:
+            weight = 1.0 - math.exp(-max(0.0, now - prev["time"]) / self.tau)
+            ewma = prev["ewma"] + weight * (usage - prev["ewma"])
+
+        self.state = {"busy": busy, "total": total, "time": now, "ewma": ewma, "boot": boot}
+        if self.state_path:
+            self._save_state()
+        self.usage = round(usage, 1)
+        self.ewma = round(ewma, 1)
+        log(f"CPU: busy={d_busy}, total={d_total} ticks, usage={self.usage}%, ewma={self.ewma}%")
+        return self.usage
+
+
+# ---------------------------------------------------------------------------
+# Metric Sources
+# ---------------------------------------------------------------------------
+#
+# A metric source exposes cpu_usage(), memory(), disk(), temperature() and
+# uptime() with the same return shapes as the get_* functions above.
+# Sources with a `cpu_sampler` (CpuSampler) also provide smoothed CPU usage.
+
+class MacSource:
+    """
+    macOS metrics via host_statistics (CPU), vm_stat, sysctl and osx-cpu-temp.
+    Falls back to a `top` snapshot if the CPU tick counters are unavailable.
+    """
+
+    name = "darwin"
+
+    def __init__(self, state_path=None):
+        self.cpu_sampler = CpuSampler(
+            read_mach_cpu_ticks, state_path, wrap=MACH_TICK_WRAP, read_boot_time=read_mach_boot_time,
+        )
+
+    def cpu_usage(self):
+        try:
+            return self.cpu_sampler.sample()
+        except (OSError, AttributeError, ValueError) as e:
+            log(f"CPU tick counters unavailable ({e}), falling back to top")
+            self.cpu_sampler.ewma = None
+            return get_cpu_usage()
+
+    def memory(self):
+        return get_memory()
+
+    def disk(self):
+        return get_disk()
+
+    def temperature(self):
+        return get_temperature()
+
+    def uptime(self):
+        return get_uptime()
+
+
+class LinuxProcSource:
+    """
+    Linux metrics read directly from /proc and /sys (no subprocesses).
+
+    `root` is the filesystem root holding proc/ and sys/, so tests can
+    point it at a fixture tree.
+
+    CPU usage is computed from the /proc/stat tick counters by a
+    CpuSampler (see there for the first reading and the smoothed value).
+    """
+
+    name = "linux"
+
+    # Thermal zone types preferred for "CPU temperature", in order
+    CPU_THERMAL_TYPES = ("x86_pkg_temp", "cpu-thermal", "cpu_thermal", "coretemp", "k10temp")
+
+    def __init__(self, root="/", state_path=None):
+        # type: (str, str | None) -> None
+        self.root = root
+        self.cpu_sampler = CpuSampler(self.read_cpu_ticks, state_path, read_boot_time=self.read_boot_time)
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def _read(self, *parts):
+        with open(self._path(*parts), encoding="ascii") as f:
+            return f.read()
+
+    def read_cpu_ticks(self):
+        # type: () -> tuple
+        """Return (busy, total) jiffies from the aggregate "cpu" line of /proc/stat."""
+        with open(self._path("proc", "stat"), encoding="ascii") as f:
+            line = f.readline()
+        fields = line.split()
+        if not fields or fields[0] != "cpu":
+            raise ValueError(f"Unexpected /proc/stat header: {line.strip()}")
+        ticks = [int(v) for v in fields[1:]]
+        # user nice system idle iowait irq softirq steal [guest guest_nice]
+        # guest time is already counted in user/nice
+        ticks = ticks[:8]
+        idle = ticks[3] + (ticks[4] if len(ticks) > 4 else 0)
+        total = sum(ticks)
+        return total - idle, total
+
+    def read_boot_time(self):
+        # type: () -> float | None
+        """Return the boot time (epoch seconds) from the btime line of /proc/stat."""
+        with open(self._path("proc", "stat"), encoding="ascii") as f:
+            for line in f:
+                if line.startswith("btime "):
+                    return float(line.split()[1])
+        return None
+
+    def cpu_usage(self):
+        return self.cpu_sampler.sample()
+
+    def memory(self):
+        fields = {}
+        for line in self._read("proc", "meminfo").splitlines():
+            key, _, rest = line.partition(":")
+            value = rest.split()
+            if value:
+                fields[key] = int(value[0]) * 1024  # kB
+        total_bytes = fields["MemTotal"]
+        if "MemAvailable" in fields:
+            available = fields["MemAvailable"]
+        else:
+            # Kernels before 3.14: free + page cache is reclaimable
+            available = fields.get("MemFree", 0) + fields.get("Buffers", 0) + fields.get("Cached", 0)
+        used_bytes = max(0, total_bytes - available)
+        usage_percent = (used_bytes / total_bytes) * 100 if total_bytes > 0 else 0.0
+        log(f"Memory: total={total_bytes}, available={available}")
+        return {
+            "used_gb": round(used_bytes / (1024 ** 3), 1),
+            "total_gb": round(total_bytes / (1024 ** 3), 1),
+            "usage_percent": round(usage_percent, 1),
+        }
+
+    def disk(self):
+        return get_disk()
+
+    def temperature(self):
+        """Return the CPU thermal zone temperature, or None. Never raises."""
+        try:
+            base = self._path("sys", "class", "thermal")
+            readings = {}
+            for zone in sorted(os.listdir(base)):
+                if not zone.startswith("thermal_zone"):
+                    continue
+                try:
+                    kind = self._read("sys", "class", "thermal", zone, "type").strip()
+                    milli = int(self._read("sys", "class", "thermal", zone, "temp").strip())
+                except (OSError, ValueError):
+                    continue
+                readings.setdefault(kind, milli / 1000.0)
+            if not readings:
+                log("No readable thermal zones, skipping temperature")
+                return None
+            for kind in self.CPU_THERMAL_TYPES:
+                if kind in readings:
+                    temp = readings[kind]
+                    break
+            else:
+                temp = max(readings.values())
+            log(f"Temperature: {temp}C (zones: {readings})")
+            return round(temp, 1)
+        except Exception as e:
+            log(f"Temperature collection failed: {e}")
+            return None
+
+    def uptime(self):
+        delta_seconds = max(0, int(float(self._read("proc", "uptime").split()[0])))
+        display = format_uptime(delta_seconds)
+        log(f"Uptime: {delta_seconds}s ({display})")
+        return {
+            "seconds": delta_seconds,
+            "display": display,
+        }
+
+
+def default_source(state_path=None):
+    """
+    Return the metric source for the running platform.
+    `state_path` persists the previous CPU reading (see CpuSampler).
+    """
+    if sys.platform.startswith("linux") and os.path.exists("/proc/stat"):
+        return LinuxProcSource(state_path=state_path)
+    return MacSource(state_path)
+
+
+# ---------------------------------------------------------------------------
+# Concurrent Probing
+# ---------------------------------------------------------------------------
+
+# Probe name -> source method
+PROBES = {
+    "cpu": "cpu_usage",
+    "memory": "memory",
+    "disk": "disk",
+    "temperature": "temperature",
+    "uptime": "uptime",
+}
+
+
+def _start_probe(fn, deadline):
+    # type: (object, float) -> Future
+    """Run fn() on a daemon thread (never joined at exit) with its deadline set."""
+    future = Future()
+
+    def target():
+        _probe_deadline.value = deadline
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, name=f"probe-{getattr(fn, '__name__', 'fn')}", daemon=True).start()
+    return future
+
+
+def run_probes(source, timeouts=None, budget=COLLECT_BUDGET_SEC):
+    # type: (object, dict | None, float) -> tuple
+    """
+    Run every probe of `source` concurrently, each on a daemon thread.
+    Each probe gets min(its timeout, budget) seconds from the common start;
+    commands it runs through run_command() are killed at that deadline.
+    Returns (results, timed_out): results maps probe name to its value for
+    probes that finished without raising; timed_out lists probes that
+    missed their deadline (their threads are abandoned, not waited for).
+    """
+    timeouts = PROBE_TIMEOUTS if timeouts is None else timeouts
+    results = {}
+    timed_out = []
+    start = time.monotonic()
+    deadlines = {name: start + min(timeouts.get(name, budget), budget) for name in PROBES}
+    futures = {
+        name: _start_probe(getattr(source, method), deadlines[name])
+        for name, method in PROBES.items()
     }
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0.0, deadlines[name] - time.monotonic()))
+        except FutureTimeout:
+            timed_out.append(name)
+            log(f"{name} probe timed out")
+        except Exception as e:
+            log(f"{name} collection failed: {e}")
+    log(f"Probes finished in {(time.monotonic() - start) * 1000:.1f} ms")
+    return results, timed_out
 
 
 # ---------------------------------------------------------------------------
 # Main Logic
 # ---------------------------------------------------------------------------
 
-def collect_all():
-    # type: () -> dict
+def collect_all(source=None):
+    # type: (object) -> dict
     """
     Collect all raw metrics, delegate classification to domain layer.
-    Individual metric failures set that metric to null instead of crashing.
+    Individual metric failures set that metric to null instead of crashing;
+    probes that miss their deadline are also listed in "timed_out".
+    `source` defaults to default_source().
     """
+    if source is None:
+        source = default_source()
     now = datetime.now(JST)
     timestamp = now.isoformat()
-    log(f"Collection started at {timestamp}")
+    log(f"Collection started at {timestamp} (source: {source.name})")
 
-    # -- Collect raw metrics --
-    cpu_usage = 0.0
-    try:
-        cpu_usage = get_cpu_usage()
-    except Exception as e:
-        log(f"CPU collection failed: {e}")
+    # -- Collect raw metrics (concurrently) --
+    results, timed_out = run_probes(source)
 
-    mem_raw = None
-    mem_usage = 0.0
-    try:
-        mem_raw = get_memory()
-        mem_usage = mem_raw["usage_percent"]
-    except Exception as e:
-        log(f"Memory collection failed: {e}")
+    cpu_usage = results.get("cpu")
+    if cpu_usage is None:
+        cpu_usage = 0.0
 
-    disk_raw = None
-    disk_usage = 0.0
-    try:
-        disk_raw = get_disk()
-        disk_usage = disk_raw["usage_percent"]
-    except Exception as e:
-        log(f"Disk collection failed: {e}")
+    # Classify/score on the smoothed CPU usage when the source provides it
+    cpu_smoothed = None
+    sampler = getattr(source, "cpu_sampler", None)
+    if sampler is not None and "cpu" in results:
+        cpu_smoothed = sampler.ewma
 
-    temp_celsius = None
-    try:
-        temp_celsius = get_temperature()
-    except Exception as e:
-        log(f"Temperature collection failed: {e}")
+    mem_raw = results.get("memory")
+    mem_usage = mem_raw["usage_percent"] if mem_raw is not None else 0.0
 
-    uptime_raw = None
-    uptime_seconds = 0
-    try:
-        uptime_raw = get_uptime()
-        uptime_seconds = uptime_raw["seconds"]
-    except Exception as e:
-        log(f"Uptime collection failed: {e}")
+    disk_raw = results.get("disk")
+    disk_usage = disk_raw["usage_percent"] if disk_raw is not None else 0.0
+
+    temp_celsius = results.get("temperature")
+
+    uptime_raw = results.get("uptime")
+    uptime_seconds = uptime_raw["seconds"] if uptime_raw is not None else 0
 
     # -- Delegate to domain layer --
     raw_metrics = {
-        "cpu_usage": cpu_usage,
+        "cpu_usage": cpu_smoothed if cpu_smoothed is not None else cpu_usage,
         "mem_usage": mem_usage,
         "disk_usage": disk_usage,
         "temperature": temp_celsius,
@@ -309,8 +716,13 @@ def collect_all():
     domain_result = domain_health.evaluate(raw_metrics)
 
     # -- Merge raw data with domain classifications --
+    # (domain records are shared and read-only: always merge into new dicts)
     # CPU always has a default (0.0), so always build cpu_data
-    cpu_data = {"usage_percent": cpu_usage, **domain_result["cpu"]}
+    cpu_data = {
+        "usage_percent": cpu_usage,
+        "smoothed_percent": cpu_smoothed,
+        **domain_result["cpu"],
+    }
 
     memory_data = None
     if mem_raw is not None:
@@ -339,6 +751,7 @@ def collect_all():
         "overall": domain_result["overall"],
         "alert_level": domain_result["alert_level"],
         "alert_message": domain_result["alert_message"],
+        "timed_out": timed_out,
     }
 
     # -- Schema version and staleness --
@@ -348,10 +761,31 @@ def collect_all():
     return output
 
 
+def record_history(data, conn):
+    # type: (dict, object) -> dict
+    """
+    Append a collect_all() result to the history store.
+    Returns the recent-window export for health_history.json.
+    """
+    ts, values = domain_history.sample_from_health(data)
+    domain_history.record_sample(conn, ts, values)
+    return domain_history.export_recent(conn, ts)
+
+
 def main():
     try:
-        data = collect_all()
-        write_json_atomic(data, OUTPUT_FILE)
+        data = collect_all(default_source(CPU_STATE_FILE))
+        write_json_atomic(data, OUTPUT_FILE, skip_unchanged=True)
+
+        # History is best-effort: never fail the health.json update
+        try:
+            conn = domain_history.init_db(HISTORY_DB)
+            try:
+                write_json_atomic(record_history(data, conn), HISTORY_FILE)
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"WARN: history update failed: {e}", file=sys.stderr)
 
         if VERBOSE:
             print(json.dumps(data, ensure_ascii=False, indent=2))
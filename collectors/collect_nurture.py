@@ -2,9 +2,12 @@
 """
 collect_nurture.py - Nurture parameter calculator for Rebecca's Room
 
-Reads health.json, status.json, and visit_log.json to compute Rebecca's
-nurture state: mood, energy, trust, intimacy, EXP, and level.
-Outputs src/data/nurture.json and updates src/data/visit_log.json.
+Reads health.json and status.json to compute Rebecca's nurture state:
+mood, energy, trust, intimacy, EXP, and level. Each run records the
+current presence in the event-sourced visit store (visits.db, see
+domain/visits.py); an existing visit_log.json seeds the store once.
+Outputs src/data/nurture.json and src/data/visit_log.json (a view of the
+visit state).
 
 Calculation logic delegated to domain/nurture.py (Phase 2A).
 This collector handles I/O only.
@@ -12,6 +15,7 @@ This collector handles I/O only.
 Usage:
     python3 collectors/collect_nurture.py        # normal run
     python3 collectors/collect_nurture.py -v     # verbose/debug output
+    python3 collectors/collect_nurture.py --no-db  # legacy visit_log.json counters
 
 Dependencies: Python 3.9+ stdlib only (no pip packages)
 Frequency: every 5 minutes (cron)
@@ -28,6 +32,7 @@ if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
 from domain import nurture as domain_nurture
+from domain import visits as domain_visits
 from domain.schema import write_json_atomic, inject_version, inject_staleness
 
 # ---------------------------------------------------------------------------
@@ -44,6 +49,7 @@ STATUS_FILE = DATA_DIR / "status.json"
 SKILLS_FILE = DATA_DIR / "skills.json"
 VISIT_LOG_FILE = DATA_DIR / "visit_log.json"
 NURTURE_FILE = DATA_DIR / "nurture.json"
+VISIT_DB = PROJECT_ROOT / "visits.db"
 
 VERBOSE = "-v" in sys.argv or "--verbose" in sys.argv
 
@@ -94,16 +100,13 @@ def load_visit_log():
 # Main
 # ---------------------------------------------------------------------------
 
-def main():
-    log("Starting nurture collection...")
-
-    # Load input data (graceful degradation)
-    health_data = load_json(HEALTH_FILE)
-    status_data = load_json(STATUS_FILE)
-    skills_data = load_json(SKILLS_FILE)
-    visit_log = load_visit_log()
-
-    now = datetime.now(JST)
+def collect(health_data, status_data, skills_data, visit_log, now=None):
+    """
+    Compute nurture.json and the updated visit log from already loaded inputs.
+    Returns (nurture, updated_visit_log).
+    """
+    if now is None:
+        now = datetime.now(JST)
 
     # Calculate nurture parameters via domain layer
     nurture, updated_visit_log = domain_nurture.evaluate(
@@ -113,9 +116,60 @@ def main():
     # Inject schema version and staleness
     inject_version(nurture)
     inject_staleness(nurture, now)
+    return nurture, updated_visit_log
+
+
+def open_visit_store(db_path=VISIT_DB):
+    """Open the visit store, seeding an empty one from visit_log.json if present."""
+    conn = domain_visits.init_db(db_path)
+    if domain_visits.is_empty(conn):
+        legacy = load_json(VISIT_LOG_FILE)
+        if legacy is not None:
+            log("Seeding visit store from visit_log.json")
+            domain_visits.seed(conn, domain_nurture.state_from_visit_log(legacy))
+    return conn
+
+
+def collect_events(health_data, status_data, skills_data, conn, now=None):
+    """
+    Event-sourced variant of collect(): records the current status in the
+    visit store and evaluates from the replayed state.
+    Returns (nurture, visit_log view).
+    """
+    if now is None:
+        now = datetime.now(JST)
+
+    status = (status_data or {}).get("status", "offline")
+    state = domain_visits.record(conn, now.timestamp(), status)
+    nurture, visit_log = domain_nurture.evaluate_visits(
+        health_data, status_data, skills_data, state, now
+    )
+
+    inject_version(nurture)
+    inject_staleness(nurture, now)
+    return nurture, visit_log
+
+
+def main():
+    log("Starting nurture collection...")
+
+    # Load input data (graceful degradation)
+    health_data = load_json(HEALTH_FILE)
+    status_data = load_json(STATUS_FILE)
+    skills_data = load_json(SKILLS_FILE)
+
+    if "--no-db" in sys.argv:
+        visit_log = load_visit_log()
+        nurture, updated_visit_log = collect(health_data, status_data, skills_data, visit_log)
+    else:
+        conn = open_visit_store()
+        try:
+            nurture, updated_visit_log = collect_events(health_data, status_data, skills_data, conn)
+        finally:
+            conn.close()
 
     # Write outputs
-    write_json_atomic(nurture, str(NURTURE_FILE))
+    write_json_atomic(nurture, str(NURTURE_FILE), skip_unchanged=True)
     write_json_atomic(updated_visit_log, str(VISIT_LOG_FILE))
 
     if VERBOSE:
@@ -306,12 +306,17 @@ def build_output(skills, languages, integrations):
 # Main
 # ---------------------------------------------------------------------------
 
+def collect():
+    """Scan plugins and build the skills.json payload."""
+    skills, languages, integrations = scan_plugins()
+    return build_output(skills, languages, integrations)
+
+
 def main():
     log("Starting skill collection...")
 
-    skills, languages, integrations = scan_plugins()
-    data = build_output(skills, languages, integrations)
-    write_json_atomic(data, str(OUTPUT_FILE))
+    data = collect()
+    write_json_atomic(data, str(OUTPUT_FILE), skip_unchanged=True)
 
     if VERBOSE:
         print(json.dumps(data, ensure_ascii=False, indent=2))
@@ -6,22 +6,33 @@ Determines Rebecca's presence status (online/away/sleeping/offline)
 based on OpenClaw Gateway process, recent file activity, and time of day.
 
 Output: src/data/status.json (atomic write via .tmp + os.rename)
-Frequency: every 1 minute (cron / launchd)
-Dependencies: Python 3.9+ stdlib only (no pip packages)
+Frequency: every 1 minute (cron / launchd), or event-driven with --watch
+Dependencies: Python 3.9+ stdlib only (no pip packages);
+              --watch uses watchdog for filesystem events when installed
 
 Usage:
     python3 collectors/collect_status.py          # normal run
     python3 collectors/collect_status.py -v       # verbose/debug output
+    python3 collectors/collect_status.py --watch  # long-running, event-driven
 """
 
+import heapq
 import json
 import os
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # only --watch uses it; it falls back to stat polling
+    Observer = None
+    FileSystemEventHandler = object
 
 # -- Domain layer import --
 _PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
@@ -29,7 +40,13 @@ if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
 from domain import presence as domain_presence
-from domain.constants import HEARTBEAT_THRESHOLD_SEC
+from domain.constants import (
+    AWAY_THRESHOLD_SEC,
+    HEARTBEAT_THRESHOLD_SEC,
+    ONLINE_THRESHOLD_SEC,
+    SLEEPING_THRESHOLD_SEC,
+    TIME_PERIODS,
+)
 from domain.schema import inject_version, inject_staleness, write_json_atomic
 
 # -- Constants ----------------------------------------------------------------
@@ -46,6 +63,22 @@ OPENCLAW_WORKSPACE = Path.home() / ".openclaw" / "workspace"
 MEMORY_DIR = OPENCLAW_WORKSPACE / "memory"
 HEARTBEAT_FILE = OPENCLAW_WORKSPACE / "HEARTBEAT.md"
 
+# Memory-directory scan cache (see get_last_activity)
+SCAN_STATE_FILE = PROJECT_ROOT / ".memory-scan.json"
+HOT_SET_SIZE = 8  # most recently modified notes re-checked between full scans
+FULL_RESCAN_SEC = 600  # bounds how long an edit to an older note can go unnoticed
+
+# Gateway liveness without pgrep (--watch)
+GATEWAY_PROCESS = "openclaw-gateway"
+GATEWAY_PIDFILE = Path.home() / ".openclaw" / "gateway.pid"  # used when present
+PROC_ROOT = Path("/proc")
+
+# --watch wakeups besides file events and presence deadlines: a cheap gateway
+# liveness re-check (pid / pidfile; pidfile events also wake the loop), and
+# stat polling without watchdog (no more often than the cron job it replaces)
+GATEWAY_POLL_SEC = 300
+FS_POLL_SEC = 60
+
 # Verbose flag (set via -v CLI arg)
 VERBOSE = False
 
@@ -91,7 +124,11 @@ def check_gateway() -> bool:
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError) as e:
         log(f"pgrep failed: {e}")
 
-    # Fallback: check HEARTBEAT.md mtime
+    return heartbeat_alive()
+
+
+def heartbeat_alive() -> bool:
+    """Gateway fallback: HEARTBEAT.md exists and mtime < HEARTBEAT_THRESHOLD_SEC ago."""
     try:
         if HEARTBEAT_FILE.exists():
             mtime = HEARTBEAT_FILE.stat().st_mtime
@@ -109,28 +146,110 @@ def check_gateway() -> bool:
     return False
 
 
-def get_last_activity() -> Tuple[Optional[datetime], Optional[Path]]:
+def scan_memory_dir(directory: Path, keep: int = HOT_SET_SIZE) -> List[Tuple[float, str]]:
+    """
+    One os.scandir pass with one stat per entry.
+
+    Returns the `keep` most recently modified *.md files as
+    [(mtime, name), ...], newest first.
+    """
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(".md"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.name))
+                except OSError:
+                    continue  # removed while scanning
+    return heapq.nlargest(keep, entries)
+
+
+def _load_scan_state(path: Path) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if isinstance(state, dict) and isinstance(state.get("hot"), list):
+            return state
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def get_last_activity(
+    memory_dir: Optional[Path] = None,
+    state_path: Optional[Path] = SCAN_STATE_FILE,
+    clock=time.time,
+    force: bool = False,
+) -> Tuple[Optional[datetime], Optional[Path]]:
     """
-    Scan ~/.openclaw/workspace/memory/*.md for the most recently modified file.
+    Find the most recently modified memory/*.md file.
+
+    The directory's own mtime changes whenever a note is created, deleted
+    or renamed (editors save atomically by renaming). While it is
+    unchanged, only the hot set from the last scan is stat()ed and
+    compared with the persisted high-water mark; a full scan runs when
+    the directory changes, FULL_RESCAN_SEC has passed or `force` is set.
+
+    Staleness: an in-place edit (no rename) of a note outside the hot set
+    leaves the directory mtime alone, so it is noticed only at the next
+    full scan, up to FULL_RESCAN_SEC later. --watch passes force=True on
+    file events to avoid that.
+
+    The state file is rewritten only when its content changes. Pass
+    state_path=None to always scan.
 
     Returns:
         (mtime as datetime in JST, path to the file) or (None, None) if unavailable
     """
+    memory_dir = MEMORY_DIR if memory_dir is None else memory_dir
     try:
-        if not MEMORY_DIR.is_dir():
-            log(f"Memory directory not found: {MEMORY_DIR}")
+        try:
+            dir_mtime_ns = memory_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            log(f"Memory directory not found: {memory_dir}")
             return None, None
 
-        md_files = list(MEMORY_DIR.glob("*.md"))
-        if not md_files:
+        now = clock()
+        loaded = _load_scan_state(state_path) if state_path else None
+        state = loaded
+        hot = None
+        if (
+            not force
+            and state is not None
+            and state.get("dir") == str(memory_dir)
+            and state.get("dir_mtime_ns") == dir_mtime_ns
+            and now - state.get("scanned_at", 0) < FULL_RESCAN_SEC
+        ):
+            try:
+                hot = sorted(
+                    ((os.stat(memory_dir / name).st_mtime, name) for _, name in state["hot"]),
+                    reverse=True,
+                )
+                log(f"Memory dir unchanged, checked {len(hot)} hot files")
+            except OSError:
+                hot = None  # a hot file vanished: rescan
+        if hot is None:
+            hot = scan_memory_dir(memory_dir)
+            state = {"dir": str(memory_dir), "dir_mtime_ns": dir_mtime_ns, "scanned_at": now}
+            log(f"Scanned memory directory ({len(hot)} hot files)")
+
+        if state_path:
+            # Lists, as json.load returns them, so an unchanged state compares equal
+            state = dict(state, hot=[[mtime, name] for mtime, name in hot])
+            if state != loaded:
+                try:
+                    write_json_atomic(state, state_path, compact=True)
+                except OSError as e:
+                    log(f"Could not save scan state: {e}")
+
+        if not hot:
             log("No .md files in memory directory")
             return None, None
 
-        # Find the most recently modified file
-        latest_file = max(md_files, key=lambda f: f.stat().st_mtime)
-        mtime = latest_file.stat().st_mtime
+        mtime, name = hot[0]
+        latest_file = memory_dir / name
         dt = datetime.fromtimestamp(mtime, tz=JST)
-        log(f"Last activity: {latest_file.name} at {format_iso(dt)}")
+        log(f"Last activity: {name} at {format_iso(dt)}")
         return dt, latest_file
 
     except OSError as e:
@@ -165,22 +284,25 @@ def get_activity_type(last_activity_path: Optional[Path]) -> str:
 
 # -- Main ---------------------------------------------------------------------
 
-def main() -> None:
-    global VERBOSE
-
-    if "-v" in sys.argv or "--verbose" in sys.argv:
-        VERBOSE = True
-
-    log("Starting status collection...")
-
+def collect() -> dict:
+    """Build the status.json payload (no file I/O besides the checks)."""
     # Step 1: Gateway check
     gateway_alive = check_gateway()
 
     # Step 2: Last activity
     last_activity, last_activity_path = get_last_activity()
 
+    return build_status(gateway_alive, last_activity, last_activity_path, now_jst())
+
+
+def build_status(
+    gateway_alive: bool,
+    last_activity: Optional[datetime],
+    last_activity_path: Optional[Path],
+    now: datetime,
+) -> dict:
+    """Evaluate presence from already gathered inputs and build status.json."""
     # Step 3: Delegate to domain layer
-    now = now_jst()
     presence_result = domain_presence.evaluate(gateway_alive, last_activity, now)
 
     # Step 4: Activity type
@@ -203,9 +325,259 @@ def main() -> None:
     inject_staleness(output, now)
 
     log(f"Output: {json.dumps(output, ensure_ascii=False)}")
+    return output
+
+
+# -- Event-driven mode (--watch) ----------------------------------------------
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by someone else
+    return True
+
+
+class GatewayProbe:
+    """
+    Repeated gateway liveness checks without spawning pgrep.
+
+    Order: the last known PID (kill(pid, 0), name re-checked via /proc when
+    available), the pidfile, a /proc scan by process name, and finally
+    check_gateway() where /proc does not exist (macOS). HEARTBEAT.md
+    freshness stays the fallback in every case.
+    """
+
+    def __init__(self, proc_root: Path = PROC_ROOT, pidfile: Path = GATEWAY_PIDFILE):
+        self.proc_root = Path(proc_root)
+        self.pidfile = Path(pidfile)
+        self.pid: Optional[int] = None
+
+    def _is_gateway(self, pid: int) -> bool:
+        if not _pid_alive(pid):
+            return False
+        comm = self.proc_root / str(pid) / "comm"
+        if not self.proc_root.is_dir():
+            return True  # cannot verify the name; trust the pid
+        try:
+            # comm is truncated to 15 characters (TASK_COMM_LEN - 1)
+            return comm.read_text(encoding="utf-8").strip() == GATEWAY_PROCESS[:15]
+        except OSError:
+            return False
+
+    def _pidfile_pid(self) -> Optional[int]:
+        try:
+            return int(self.pidfile.read_text(encoding="ascii").split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _scan_proc(self) -> Optional[int]:
+        name = GATEWAY_PROCESS[:15]
+        with os.scandir(self.proc_root) as it:
+            for entry in it:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(os.path.join(entry.path, "comm"), encoding="utf-8") as f:
+                        if f.read().strip() == name:
+                            return int(entry.name)
+                except OSError:
+                    continue
+        return None
+
+    def alive(self) -> bool:
+        if self.pid is not None and self._is_gateway(self.pid):
+            return True
+        self.pid = None
+
+        pid = self._pidfile_pid()
+        if pid is not None and self._is_gateway(pid):
+            self.pid = pid
+        elif self.proc_root.is_dir():
+            self.pid = self._scan_proc()
+        else:
+            return check_gateway()
+
+        if self.pid is not None:
+            log(f"Gateway alive (PID {self.pid})")
+            return True
+        return heartbeat_alive()
+
+
+def seconds_until_change(
+    last_activity: Optional[datetime],
+    heartbeat_mtime: Optional[float],
+    now: datetime,
+) -> float:
+    """
+    Seconds until presence could change with no new input: an inactivity
+    threshold is crossed, HEARTBEAT.md goes stale or the time period ends.
+    """
+    candidates = []
+    now_ts = now.timestamp()
+    if last_activity is not None:
+        last_ts = last_activity.timestamp()
+        for threshold in (ONLINE_THRESHOLD_SEC, AWAY_THRESHOLD_SEC, SLEEPING_THRESHOLD_SEC):
+            # +1: determine_status compares with strict inequalities
+            candidates.append(last_ts + threshold + 1)
+    if heartbeat_mtime is not None:
+        candidates.append(heartbeat_mtime + HEARTBEAT_THRESHOLD_SEC + 1)
+
+    # Next time-period boundary (period starts are whole hours)
+    starts = {start for start, _, _ in TIME_PERIODS}
+    top_of_hour = now.replace(minute=0, second=0, microsecond=0)
+    for h in range(1, 25):
+        boundary = top_of_hour + timedelta(hours=h)
+        if boundary.hour in starts:
+            candidates.append(boundary.timestamp())
+            break
+
+    future = [t - now_ts for t in candidates if t > now_ts]
+    return min(future) if future else float(GATEWAY_POLL_SEC)
+
+
+class PresenceWatcher:
+    """
+    Recomputes status.json only when an input changes.
+
+    Inputs are the gateway liveness, the last memory activity and the
+    presence-relevant clock (threshold crossings / period changes, see
+    seconds_until_change). Filesystem events call notify() to wake the
+    loop immediately (and force a full note scan); otherwise it sleeps
+    until the next possible change or the next gateway check, whichever
+    comes first.
+    """
+
+    def __init__(
+        self,
+        gateway: Optional[GatewayProbe] = None,
+        *,
+        write: Callable[[dict, Path], None] = write_json_atomic,
+        output: Path = OUTPUT_FILE,
+        clock: Callable[[], datetime] = now_jst,
+        poll: float = GATEWAY_POLL_SEC,
+    ):
+        self.gateway = gateway or GatewayProbe()
+        self.write = write
+        self.output = output
+        self.clock = clock
+        self.poll = poll
+        self.last_output: Optional[dict] = None
+        self._inputs = None
+        self._due: Optional[float] = None  # epoch of the next time-based change
+        self._wake = threading.Event()
+        self._changed = False  # a file event arrived since the last update()
+
+    def notify(self) -> None:
+        """Signal that a watched file changed."""
+        self._changed = True
+        self._wake.set()
+
+    def _heartbeat_mtime(self) -> Optional[float]:
+        try:
+            return HEARTBEAT_FILE.stat().st_mtime
+        except OSError:
+            return None
+
+    def update(self) -> bool:
+        """Recompute and write status.json if an input changed. Returns True if written."""
+        now = self.clock()
+        gateway_alive = self.gateway.alive()
+        # An event may be an in-place edit of a note outside the hot set
+        force, self._changed = self._changed, False
+        last_activity, last_activity_path = get_last_activity(MEMORY_DIR, SCAN_STATE_FILE, force=force)
+        heartbeat_mtime = self._heartbeat_mtime()
+        inputs = (gateway_alive, last_activity, last_activity_path, heartbeat_mtime)
+
+        time_due = self._due is not None and now.timestamp() >= self._due
+        if inputs == self._inputs and not time_due:
+            return False
+
+        self._inputs = inputs
+        self._due = now.timestamp() + seconds_until_change(last_activity, heartbeat_mtime, now)
+        output = build_status(gateway_alive, last_activity, last_activity_path, now)
+        self.write(output, self.output)
+        self.last_output = output
+        log(f"status.json updated: {output['status']}")
+        return True
+
+    def timeout(self) -> float:
+        """Seconds to sleep before the next update() (without events)."""
+        if self._due is None:
+            return 0.0
+        return max(0.0, min(self.poll, self._due - self.clock().timestamp()))
+
+    def serve(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            self.update()
+            self._wake.wait(self.timeout())
+            self._wake.clear()
+
+
+# Event types that change what the watcher reads; opened/closed events
+# (any tool reading a note) are ignored
+_WAKE_EVENT_TYPES = frozenset(("created", "modified", "deleted", "moved"))
+
+
+class _WakeHandler(FileSystemEventHandler):
+    """Wakes a PresenceWatcher when memory notes, HEARTBEAT.md or the gateway pidfile change."""
+
+    def __init__(self, watcher: PresenceWatcher, pidfile: Path = GATEWAY_PIDFILE):
+        super().__init__()
+        self.watcher = watcher
+        self.pidfile = str(pidfile)
+
+    def on_any_event(self, event):
+        if getattr(event, "event_type", None) not in _WAKE_EVENT_TYPES:
+            return
+        paths = [getattr(event, "src_path", ""), getattr(event, "dest_path", "") or ""]
+        if any(p.endswith(".md") or p == self.pidfile for p in paths):
+            self.watcher.notify()
+
+
+def watch() -> int:
+    """Run the event-driven status loop until interrupted."""
+    # Without watchdog, file changes are picked up by stat polling instead
+    watcher = PresenceWatcher(poll=GATEWAY_POLL_SEC if Observer is not None else FS_POLL_SEC)
+    observer = None
+    if Observer is not None:
+        observer = Observer()
+        handler = _WakeHandler(watcher)
+        for d in dict.fromkeys((MEMORY_DIR, OPENCLAW_WORKSPACE, GATEWAY_PIDFILE.parent)):
+            if d.is_dir():
+                observer.schedule(handler, str(d), recursive=False)
+        observer.start()
+    else:
+        log("watchdog not installed; polling every %ss" % FS_POLL_SEC)
+
+    stop = threading.Event()
+    try:
+        watcher.serve(stop)
+    except KeyboardInterrupt:
+        stop.set()
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+    return 0
+
+
+def main() -> None:
+    global VERBOSE
+
+    if "-v" in sys.argv or "--verbose" in sys.argv:
+        VERBOSE = True
+
+    if "--watch" in sys.argv:
+        sys.exit(watch())
+
+    log("Starting status collection...")
+    output = collect()
 
-    # Step 6: Atomic write
-    write_json_atomic(output, OUTPUT_FILE)
+    # Atomic write
+    write_json_atomic(output, OUTPUT_FILE, skip_unchanged=True)
 
     if VERBOSE:
         print(json.dumps(output, ensure_ascii=False, indent=2))
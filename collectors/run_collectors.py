@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+run_collectors.py - Long-running collector scheduler for Rebecca's Room
+
+Replaces the per-collector cron/launchd entries with one process that runs
+each collector on its own interval:
+
+    status   every 1 minute
+    health   every 5 minutes
+    nurture  every 5 minutes
+    skills   every 1 hour
+
+The domain layer is imported once, and results are shared in memory:
+nurture consumes the latest health/status/skills payloads without
+re-reading their JSON files and keeps the visit store open, and each health sample is
+appended to the history store (health_history.json). Every result is still
+written to src/data/<name>.json via write_json_atomic, so the frontend
+sees exactly the same files as before, except that a file whose content
+is unchanged apart from its timestamp is not rewritten (see
+domain.schema.write_json_atomic).
+
+Usage:
+    python3 collectors/run_collectors.py        # run until interrupted
+    python3 collectors/run_collectors.py --once # run every collector once
+    python3 collectors/run_collectors.py -v     # verbose/debug output
+
+Dependencies: Python 3.9+ stdlib only (no pip packages)
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# -- Domain layer import --
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from domain.schema import WRITE_STATS, write_json_atomic
+
+# -- Constants ----------------------------------------------------------------
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "src" / "data"
+
+# Job name -> interval in seconds (same cadence as the old cron entries)
+INTERVALS = {
+    "status": 60,
+    "health": 300,
+    "skills": 3600,
+    "nurture": 300,
+}
+
+VERBOSE = "-v" in sys.argv or "--verbose" in sys.argv
+
+
+def log(msg: str) -> None:
+    if VERBOSE:
+        print(f"[scheduler] {msg}", file=sys.stderr)
+
+
+# -- Scheduler ----------------------------------------------------------------
+
+def write_output(data: dict, path: Path):
+    """Default writer: atomic, skipping payloads that did not change."""
+    return write_json_atomic(data, path, skip_unchanged=True)
+
+
+# A job receives the shared results and returns {result name: payload};
+# each payload is stored in the shared results and written to <name>.json.
+JobFn = Callable[[Dict[str, dict]], Dict[str, dict]]
+
+
+class Job:
+    """A collector run every `interval` seconds."""
+
+    def __init__(self, name: str, interval: float, run: JobFn):
+        self.name = name
+        self.interval = interval
+        self.run = run
+        self.next_run = 0.0  # due immediately
+
+
+class Scheduler:
+    """
+    Runs jobs when they are due, in registration order, on one thread.
+
+    Results are kept in `results` (name -> latest payload) so later jobs in
+    the same tick see fresh data. A failing job is logged and retried at
+    its next interval; it never stops the others.
+    """
+
+    def __init__(
+        self,
+        jobs: List[Job],
+        *,
+        data_dir: Path = DATA_DIR,
+        clock: Callable[[], float] = time.monotonic,
+        write: Callable[[dict, Path], object] = write_output,
+    ):
+        self.jobs = jobs
+        self.data_dir = Path(data_dir)
+        self.clock = clock
+        self.write = write
+        self.results: Dict[str, dict] = {}
+
+    def run_job(self, job: Job) -> bool:
+        """
+        Run one job and write its outputs. Returns True on success.
+        Errors from the job or from writing any output are logged, not raised.
+        """
+        start = time.perf_counter()
+        try:
+            outputs = job.run(self.results)
+        except Exception as e:
+            print(f"ERROR: {job.name} failed: {e}", file=sys.stderr)
+            return False
+        ok = True
+        for name, data in outputs.items():
+            self.results[name] = data
+            try:
+                self.write(data, self.data_dir / f"{name}.json")
+            except Exception as e:  # disk full, permissions, missing dir...
+                print(f"ERROR: {job.name}: writing {name}.json failed: {e}", file=sys.stderr)
+                ok = False
+        if not ok:
+            return False
+        log(f"{job.name}: {', '.join(outputs)} in {(time.perf_counter() - start) * 1000:.1f} ms"
+            f" (written {WRITE_STATS['bytes_written']} B, skipped {WRITE_STATS['bytes_skipped']} B so far)")
+        return True
+
+    def run_due(self) -> List[str]:
+        """Run every job whose time has come. Returns the names that ran."""
+        ran = []
+        for job in self.jobs:
+            now = self.clock()
+            if now >= job.next_run:
+                job.next_run = now + job.interval
+                self.run_job(job)
+                ran.append(job.name)
+        return ran
+
+    def seconds_until_due(self) -> float:
+        return max(0.0, min(job.next_run for job in self.jobs) - self.clock())
+
+    def serve(self, stop: threading.Event) -> None:
+        """Run due jobs, then sleep until the next one (or until stop is set)."""
+        while not stop.is_set():
+            self.run_due()
+            stop.wait(self.seconds_until_due())
+
+
+# -- Jobs ---------------------------------------------------------------------
+
+def default_jobs(intervals: Optional[Dict[str, float]] = None) -> List[Job]:
+    """Build the status/health/skills/nurture jobs (nurture last, so it sees the others)."""
+    from collectors import collect_health, collect_nurture, collect_skills, collect_status
+    from domain import history as domain_history
+
+    intervals = {**INTERVALS, **(intervals or {})}
+    # One source for the whole process: CPU usage is measured over the
+    # interval since the previous health run (state also survives restarts)
+    health_source = collect_health.default_source(collect_health.CPU_STATE_FILE)
+    history_conn = None
+    visit_conn = None
+
+    def status(results):
+        return {"status": collect_status.collect()}
+
+    def health(results):
+        nonlocal history_conn
+        data = collect_health.collect_all(health_source)
+        outputs = {"health": data}
+        try:
+            if history_conn is None:
+                history_conn = domain_history.init_db(collect_health.HISTORY_DB)
+            outputs["health_history"] = collect_health.record_history(data, history_conn)
+        except Exception as e:
+            print(f"WARN: history update failed: {e}", file=sys.stderr)
+        return outputs
+
+    def skills(results):
+        return {"skills": collect_skills.collect()}
+
+    def nurture(results):
+        nonlocal visit_conn
+        if visit_conn is None:
+            visit_conn = collect_nurture.open_visit_store(collect_nurture.VISIT_DB)
+        data, visit_log = collect_nurture.collect_events(
+            results.get("health"), results.get("status"), results.get("skills"), visit_conn,
+        )
+        return {"nurture": data, "visit_log": visit_log}
+
+    jobs = {"status": status, "health": health, "skills": skills, "nurture": nurture}
+    return [Job(name, intervals[name], run) for name, run in jobs.items()]
+
+
+# -- Main ---------------------------------------------------------------------
+
+def main() -> int:
+    from collectors import collect_status
+    collect_status.VERBOSE = VERBOSE  # the others read -v at import
+
+    scheduler = Scheduler(default_jobs())
+
+    if "--once" in sys.argv:
+        scheduler.run_due()
+        return 0
+
+    print("Starting collector scheduler...", flush=True)
+    stop = threading.Event()
+    try:
+        scheduler.serve(stop)
+    except KeyboardInterrupt:
+        stop.set()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+domain/activity.py — Indexed store of OpenClaw chat activity.
+
+Session messages (session id, byte offset, timestamp, role, truncated
+text) are ingested incrementally into SQLite, with per-session
+checkpoints so each line is read once. Queries for recent messages,
+full-text search (FTS5 when the SQLite build has it, LIKE otherwise),
+per-day counts and an hourly heatmap are index lookups.
+
+Uses Python 3 standard library only (sqlite3).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Optional
+
+# ─── Schema ──────────────────────────────────────────────────────────────────
+
+# Offset applied to UTC epoch seconds for day/hour grouping (JST)
+LOCAL_UTC_OFFSET = "+9 hours"
+
+_CREATE_TABLES_SQL = """\
+CREATE TABLE IF NOT EXISTS activity_messages (
+    id      INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    offset  INTEGER NOT NULL,
+    ts      REAL NOT NULL,
+    role    TEXT NOT NULL,
+    text    TEXT NOT NULL,
+    UNIQUE (session, offset)
+);
+
+CREATE INDEX IF NOT EXISTS idx_activity_ts ON activity_messages (ts);
+
+CREATE TABLE IF NOT EXISTS session_checkpoints (
+    session  TEXT PRIMARY KEY,
+    inode    INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    offset   INTEGER NOT NULL
+);
+"""
+
+_CREATE_FTS_SQL = """\
+CREATE VIRTUAL TABLE IF NOT EXISTS activity_fts USING fts5(
+    text, content='activity_messages', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS activity_fts_insert AFTER INSERT ON activity_messages BEGIN
+    INSERT INTO activity_fts (rowid, text) VALUES (new.id, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS activity_fts_delete AFTER DELETE ON activity_messages BEGIN
+    INSERT INTO activity_fts (activity_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+# ─── DB Initialization ───────────────────────────────────────────────────────
+
+
+def init_db(db_path: str | Path) -> sqlite3.Connection:
+    """Open (and create if needed) the activity database. Returns an open connection."""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_CREATE_TABLES_SQL)
+    try:
+        conn.executescript(_CREATE_FTS_SQL)
+    except sqlite3.OperationalError:
+        pass  # SQLite built without FTS5: search() falls back to LIKE
+    return conn
+
+
+def has_fts(conn: sqlite3.Connection) -> bool:
+    """Return True if the FTS5 index exists in this database."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activity_fts'"
+    ).fetchone()
+    return row is not None
+
+
+# ─── Checkpoints ─────────────────────────────────────────────────────────────
+
+
+def get_checkpoint(conn: sqlite3.Connection, session: str) -> Optional[dict]:
+    """Get the ingestion checkpoint of a session, or None."""
+    row = conn.execute(
+        "SELECT * FROM session_checkpoints WHERE session = ?", (session,)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def set_checkpoint(
+    conn: sqlite3.Connection,
+    session: str,
+    *,
+    inode: int,
+    size: int,
+    mtime_ns: int,
+    offset: int,
+) -> None:
+    """Record how far a session file has been ingested (caller commits)."""
+    conn.execute(
+        """INSERT OR REPLACE INTO session_checkpoints (session, inode, size, mtime_ns, offset)
+           VALUES (?, ?, ?, ?, ?)""",
+        (session, inode, size, mtime_ns, offset),
+    )
+
+
+def checkpointed_sessions(conn: sqlite3.Connection) -> set[str]:
+    """Names of all sessions with an ingestion checkpoint."""
+    return {row[0] for row in conn.execute("SELECT session FROM session_checkpoints")}
+
+
+def delete_session(conn: sqlite3.Connection, session: str) -> int:
+    """Delete a session's messages and checkpoint (caller commits). Returns rows deleted."""
+    cursor = conn.execute("DELETE FROM activity_messages WHERE session = ?", (session,))
+    conn.execute("DELETE FROM session_checkpoints WHERE session = ?", (session,))
+    return cursor.rowcount
+
+
+# ─── Messages ────────────────────────────────────────────────────────────────
+
+
+def insert_messages(conn: sqlite3.Connection, rows: Iterable[tuple]) -> int:
+    """Insert (session, offset, ts, role, text) rows, ignoring ones already stored.
+
+    The caller commits. Returns the number of rows inserted.
+    """
+    cursor = conn.executemany(
+        """INSERT OR IGNORE INTO activity_messages (session, offset, ts, role, text)
+           VALUES (?, ?, ?, ?, ?)""",
+        rows,
+    )
+    return max(cursor.rowcount, 0)
+
+
+def count_messages(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COUNT(*) FROM activity_messages").fetchone()[0]
+
+
+def recent(conn: sqlite3.Connection, limit: int = 15) -> list[dict]:
+    """Newest `limit` messages, newest first."""
+    rows = conn.execute(
+        "SELECT session, ts, role, text FROM activity_messages ORDER BY ts DESC, id DESC LIMIT ?",
+        (limit,),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _fts_query(text: str) -> str:
+    """Quote each word so user input is matched literally (no FTS syntax errors)."""
+    return " ".join('"' + w.replace('"', '""') + '"' for w in text.split())
+
+
+def search(conn: sqlite3.Connection, text: str, limit: int = 50) -> list[dict]:
+    """Messages containing every word of `text`, newest first."""
+    if not text.split():
+        return []
+    if has_fts(conn):
+        rows = conn.execute(
+            """SELECT m.session, m.ts, m.role, m.text
+               FROM activity_fts JOIN activity_messages m ON m.id = activity_fts.rowid
+               WHERE activity_fts MATCH ?
+               ORDER BY m.ts DESC LIMIT ?""",
+            (_fts_query(text), limit),
+        ).fetchall()
+    else:
+        words = text.split()
+        where = " AND ".join("text LIKE ?" for _ in words)
+        rows = conn.execute(
+            f"SELECT session, ts, role, text FROM activity_messages WHERE {where} "
+            "ORDER BY ts DESC LIMIT ?",
+            [f"%{w}%" for w in words] + [limit],
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def daily_counts(conn: sqlite3.Connection, since: Optional[float] = None) -> dict[str, int]:
+    """{YYYY-MM-DD (local): message count} for messages at or after `since` (epoch)."""
+    rows = conn.execute(
+        f"""SELECT date(ts, 'unixepoch', '{LOCAL_UTC_OFFSET}') AS day, COUNT(*) AS n
+            FROM activity_messages WHERE ts >= ? GROUP BY day ORDER BY day""",
+        (since if since is not None else float("-inf"),),
+    ).fetchall()
+    return {r["day"]: r["n"] for r in rows}
+
+
+def hourly_counts(conn: sqlite3.Connection, since: Optional[float] = None) -> list[int]:
+    """Message counts per local hour of day (24 ints) for messages at or after `since`."""
+    counts = [0] * 24
+    rows = conn.execute(
+        f"""SELECT CAST(strftime('%H', ts, 'unixepoch', '{LOCAL_UTC_OFFSET}') AS INTEGER) AS hour,
+                   COUNT(*) AS n
+            FROM activity_messages WHERE ts >= ? GROUP BY hour""",
+        (since if since is not None else float("-inf"),),
+    ).fetchall()
+    for r in rows:
+        counts[r["hour"]] = r["n"]
+    return counts
@@ -0,0 +1,113 @@
+"""
+domain/classifier.py - Compiled threshold classifiers.
+
+A (threshold, state) table from domain.constants is compiled once into
+sorted bounds for bisect plus one read-only record per state
+({state, label, message}), so classifying a value allocates nothing.
+
+Pure functions only — no I/O, no subprocess, no file access.
+"""
+
+import bisect
+
+
+class Record(dict):
+    """
+    Read-only dict shared between calls. Still a dict, so json.dumps and
+    {**record} work unchanged; mutating it raises TypeError.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("classifier records are shared and read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class ThresholdClassifier:
+    """
+    Classifies values with bisect over sorted bounds.
+
+    Build with upper_bounds() for tables read as "value < bound" (health)
+    or lower_bounds() for tables read as "value >= threshold" (nurture).
+    Calling the classifier (or its prebuilt .lookup, one call cheaper on
+    hot paths) returns the shared record for the state.
+    """
+
+    __slots__ = ("bounds", "states", "records", "lookup", "_nan_index")
+
+    def __init__(self, bounds, states, labels, nan_index):
+        self.bounds = tuple(bounds)
+        self.states = tuple(states)
+        self.records = tuple(
+            Record({"state": state, **labels[state]}) for state in self.states
+        )
+        self._nan_index = nan_index
+        self.lookup = self._build_lookup()
+
+    @classmethod
+    def upper_bounds(cls, thresholds, labels):
+        """
+        Compile [(upper_bound_exclusive, state), ..., (None, state)] with
+        bounds ascending: the first entry with value < bound wins.
+        """
+        bounds = [bound for bound, _ in thresholds[:-1]]
+        if any(bound is None for bound in bounds) or thresholds[-1][0] is not None:
+            raise ValueError("only the last entry may (and must) have a None bound")
+        if bounds != sorted(bounds):
+            raise ValueError(f"bounds must be ascending: {bounds}")
+        states = [state for _, state in thresholds]
+        # NaN compares false everywhere: the catch-all, as with a linear scan
+        return cls(bounds, states, labels, nan_index=len(states) - 1)
+
+    @classmethod
+    def lower_bounds(cls, thresholds, labels):
+        """
+        Compile [(min_inclusive, state), ..., (None, state)] with thresholds
+        descending: the first entry with value >= threshold wins.
+        """
+        bounds = [bound for bound, _ in thresholds[:-1]]
+        if any(bound is None for bound in bounds) or thresholds[-1][0] is not None:
+            raise ValueError("only the last entry may (and must) have a None threshold")
+        if bounds != sorted(bounds, reverse=True):
+            raise ValueError(f"thresholds must be descending: {bounds}")
+        states = [state for _, state in reversed(thresholds)]
+        return cls(reversed(bounds), states, labels, nan_index=0)
+
+    def _build_lookup(self):
+        """value -> record closure with bounds/records bound as locals."""
+        bounds, records = self.bounds, self.records
+        if self._nan_index == len(records) - 1:
+            # bisect_right already sends NaN past every bound
+            def lookup(value, _bounds=bounds, _records=records, _bisect=bisect.bisect_right):
+                return _records[_bisect(_bounds, value)]
+        else:
+            def lookup(value, _bounds=bounds, _records=records, _bisect=bisect.bisect_right,
+                       _nan=records[self._nan_index]):
+                if value != value:
+                    return _nan
+                return _records[_bisect(_bounds, value)]
+        return lookup
+
+    def index(self, value):
+        """Position of value's state in self.states."""
+        if value != value:
+            return self._nan_index
+        return bisect.bisect_right(self.bounds, value)
+
+    def state(self, value):
+        """State name for value."""
+        return self.states[self.index(value)]
+
+    def __call__(self, value):
+        """Read-only {state, label, message} record for value (shared, not copied)."""
+        return self.lookup(value)
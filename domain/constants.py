@@ -310,6 +310,15 @@ INTIMACY_MAX_FROM_HOURS = 75
 INTIMACY_TODAY_DIVISOR = 6      # today_minutes / 6 = bonus
 INTIMACY_TODAY_BONUS_MAX = 10
 
+# ============================================================================
+# Nurture — Visit event log
+# ============================================================================
+
+VISIT_MAX_GAP_SEC = 15 * 60      # online time credited per gap between observations at most
+VISIT_HEARTBEAT_SEC = 10 * 60    # store an unchanged status again after this long
+VISIT_SNAPSHOT_EVERY = 1000      # events replayed before a new snapshot is stored
+VISIT_DAY_OFFSET_SEC = 9 * 3600  # day boundaries of the visit log (JST)
+
 # ============================================================================
 # Nurture — EXP sources
 # ============================================================================
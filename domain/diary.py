@@ -11,9 +11,10 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Sequence
 
 # ─── Schema ──────────────────────────────────────────────────────────────────
 
@@ -39,7 +40,10 @@ CREATE TABLE IF NOT EXISTS diary_entries (
     preview_en      TEXT DEFAULT '',
     preview_ja      TEXT DEFAULT '',
     created_at      TEXT NOT NULL,
-    updated_at      TEXT NOT NULL
+    updated_at      TEXT NOT NULL,
+    article_html    TEXT,
+    card_html       TEXT,
+    render_version  TEXT
 );
 
 CREATE TABLE IF NOT EXISTS translation_cache (
@@ -71,8 +75,50 @@ CREATE TABLE IF NOT EXISTS entry_metadata (
     value TEXT NOT NULL,
     PRIMARY KEY (date, key)
 );
+
+CREATE TABLE IF NOT EXISTS source_fingerprints (
+    date       TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    mtime_ns   INTEGER NOT NULL,
+    sha256     TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (date, source)
+);
 """
 
+# Columns added to diary_entries after 3.0; init_db() adds them to older DBs
+_ADDED_ENTRY_COLUMNS = (
+    ("article_html", "TEXT"),
+    ("card_html", "TEXT"),
+    ("render_version", "TEXT"),
+)
+
+# Column projections for iter_entries()
+ENTRY_COLUMNS = (
+    "date", "memory_md", "obsidian_md", "integrated_md", "integrated_hash",
+    "html_en", "html_ja", "raw_md_ja",
+    "recap_en", "recap_ja", "preview_en", "preview_ja",
+    "created_at", "updated_at",
+    "article_html", "card_html", "render_version",
+)
+RENDER_COLUMNS = (
+    "date", "html_en", "html_ja", "recap_en", "recap_ja", "preview_en", "preview_ja",
+)
+_PROJECTIONS = {"full": ENTRY_COLUMNS, "render": RENDER_COLUMNS}
+
+# Columns article_html/card_html are rendered from; upsert_entry() clears
+# the cached fragments when any of them changes
+_FRAGMENT_SOURCE_COLUMNS = (
+    "integrated_md", "integrated_hash", "html_en", "html_ja", "raw_md_ja",
+    "recap_en", "recap_ja", "preview_en", "preview_ja",
+)
+_FRAGMENTS_CHANGED = "(" + " OR ".join(
+    f"{name} IS NOT excluded.{name}" for name in _FRAGMENT_SOURCE_COLUMNS
+) + ")"
+
+DEFAULT_BATCH_SIZE = 100
+
 # ─── DB Initialization ───────────────────────────────────────────────────────
 
 
@@ -81,20 +127,23 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def init_db(db_path: str | Path) -> sqlite3.Connection:
+def init_db(db_path: str | Path, *, check_same_thread: bool = True) -> sqlite3.Connection:
     """Initialize the diary database, creating tables if needed.
 
     Enables WAL mode for better concurrent read performance.
     Sets schema_version in schema_meta if not present.
+    Pass check_same_thread=False for a connection shared between threads
+    (the caller must serialise access).
 
     Returns an open connection.
     """
     db_path = str(db_path)
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread, factory=DiaryConnection)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
     conn.executescript(_CREATE_TABLES_SQL)
+    _add_missing_columns(conn)
 
     # Set schema version if not present
     row = conn.execute(
@@ -110,6 +159,87 @@ def init_db(db_path: str | Path) -> sqlite3.Connection:
     return conn
 
 
+def _add_missing_columns(conn: sqlite3.Connection) -> None:
+    """Add columns introduced after the initial schema to an existing DB."""
+    existing = {
+        r["name"] for r in conn.execute("PRAGMA table_info(diary_entries)").fetchall()
+    }
+    for name, decl in _ADDED_ENTRY_COLUMNS:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE diary_entries ADD COLUMN {name} {decl}")
+    conn.commit()
+
+
+# ─── Transactions ────────────────────────────────────────────────────────────
+
+
+class DiaryConnection(sqlite3.Connection):
+    """sqlite3 connection returned by init_db, carrying its transaction() depth."""
+
+    txn_depth = 0
+
+
+# transaction() depth of other connections (plain sqlite3.Connection takes
+# no attributes and no weak references). An entry exists only while a block
+# is open and holds the connection, so no other connection can reuse its id.
+_PLAIN_TXN_DEPTH: dict[int, tuple[sqlite3.Connection, int]] = {}
+
+
+def _txn_depth(conn: sqlite3.Connection) -> int:
+    if isinstance(conn, DiaryConnection):
+        return conn.txn_depth
+    entry = _PLAIN_TXN_DEPTH.get(id(conn))
+    return entry[1] if entry is not None else 0
+
+
+def _set_txn_depth(conn: sqlite3.Connection, depth: int) -> None:
+    if isinstance(conn, DiaryConnection):
+        conn.txn_depth = depth
+    elif depth:
+        _PLAIN_TXN_DEPTH[id(conn)] = (conn, depth)
+    else:
+        _PLAIN_TXN_DEPTH.pop(id(conn), None)
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Group writes into a single transaction (unit of work).
+
+    Write functions normally commit on every call. Inside this block they
+    leave the commit to the outermost ``transaction``, which commits on
+    success and rolls back if the block raises. Nested blocks join the
+    outer transaction.
+
+        with transaction(conn):
+            upsert_entry(conn, ...)
+            set_tags(conn, date, tags)
+    """
+    depth = _txn_depth(conn)
+    _set_txn_depth(conn, depth + 1)
+    try:
+        yield conn
+    except BaseException:
+        if depth == 0:
+            conn.rollback()
+        raise
+    else:
+        if depth == 0:
+            conn.commit()
+    finally:
+        _set_txn_depth(conn, depth)
+
+
+def in_transaction(conn: sqlite3.Connection) -> bool:
+    """Return True inside a ``transaction`` block for this connection."""
+    return _txn_depth(conn) > 0
+
+
+def _commit(conn: sqlite3.Connection) -> None:
+    """Commit now, unless an enclosing ``transaction`` will commit later."""
+    if not in_transaction(conn):
+        conn.commit()
+
+
 # ─── Schema Version ──────────────────────────────────────────────────────────
 
 
@@ -127,7 +257,7 @@ def set_schema_version(conn: sqlite3.Connection, version: str) -> None:
         "INSERT OR REPLACE INTO schema_meta (key, value) VALUES (?, ?)",
         ("schema_version", version),
     )
-    conn.commit()
+    _commit(conn)
 
 
 # ─── Entry CRUD ──────────────────────────────────────────────────────────────
@@ -149,23 +279,36 @@ def upsert_entry(
     preview_en: str = "",
     preview_ja: str = "",
 ) -> None:
-    """Insert or update a diary entry."""
-    now = _now_iso()
-
-    # Check if entry exists to preserve created_at
-    existing = conn.execute(
-        "SELECT created_at FROM diary_entries WHERE date = ?", (date,)
-    ).fetchone()
-    created_at = existing["created_at"] if existing else now
+    """Insert or update a diary entry.
 
+    Updating an entry keeps its created_at. Cached rendered fragments are
+    cleared only if a column they are rendered from changed.
+    """
+    now = _now_iso()
     conn.execute(
-        """\
-        INSERT OR REPLACE INTO diary_entries
+        f"""\
+        INSERT INTO diary_entries
             (date, memory_md, obsidian_md, integrated_md, integrated_hash,
              html_en, html_ja, raw_md_ja,
              recap_en, recap_ja, preview_en, preview_ja,
              created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(date) DO UPDATE SET
+            memory_md = excluded.memory_md,
+            obsidian_md = excluded.obsidian_md,
+            integrated_md = excluded.integrated_md,
+            integrated_hash = excluded.integrated_hash,
+            html_en = excluded.html_en,
+            html_ja = excluded.html_ja,
+            raw_md_ja = excluded.raw_md_ja,
+            recap_en = excluded.recap_en,
+            recap_ja = excluded.recap_ja,
+            preview_en = excluded.preview_en,
+            preview_ja = excluded.preview_ja,
+            updated_at = excluded.updated_at,
+            article_html = CASE WHEN {_FRAGMENTS_CHANGED} THEN NULL ELSE article_html END,
+            card_html = CASE WHEN {_FRAGMENTS_CHANGED} THEN NULL ELSE card_html END,
+            render_version = CASE WHEN {_FRAGMENTS_CHANGED} THEN NULL ELSE render_version END""",
         (
             date,
             memory_md,
@@ -179,11 +322,11 @@ def upsert_entry(
             recap_ja,
             preview_en,
             preview_ja,
-            created_at,
+            now,
             now,
         ),
     )
-    conn.commit()
+    _commit(conn)
 
 
 def get_entry(conn: sqlite3.Connection, date: str) -> Optional[dict]:
@@ -200,21 +343,70 @@ def get_all_entries(conn: sqlite3.Connection, *, order: str = "DESC") -> list[di
     Args:
         order: "DESC" (newest first, default) or "ASC" (oldest first).
     """
+    return list(iter_entries(conn, order=order))
+
+
+def iter_entries(
+    conn: sqlite3.Connection,
+    *,
+    order: str = "DESC",
+    columns: str | Sequence[str] = "full",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[dict]:
+    """Lazily iterate diary entries, ordered by date.
+
+    Rows are fetched in batches of `batch_size` using keyset pagination on
+    the date key, so only one batch is held in memory and no read
+    transaction stays open between batches.
+
+    Args:
+        order: "DESC" (newest first, default) or "ASC" (oldest first).
+        columns: "full" (all columns), "render" (HTML, recap and preview
+            only — no markdown) or an explicit sequence of column names.
+            "date" is always included.
+        batch_size: number of rows per query.
+    """
     if order.upper() not in ("ASC", "DESC"):
         raise ValueError(f"order must be 'ASC' or 'DESC', got '{order}'")
+    order = order.upper()
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+    if isinstance(columns, str):
+        if columns not in _PROJECTIONS:
+            raise ValueError(f"columns must be one of {sorted(_PROJECTIONS)}, got '{columns}'")
+        selected = _PROJECTIONS[columns]
+    else:
+        unknown = set(columns) - set(ENTRY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {sorted(unknown)}")
+        selected = ("date",) + tuple(c for c in columns if c != "date")
+
+    select = f"SELECT {', '.join(selected)} FROM diary_entries"
+    cmp = "<" if order == "DESC" else ">"
+
     rows = conn.execute(
-        f"SELECT * FROM diary_entries ORDER BY date {order.upper()}"
+        f"{select} ORDER BY date {order} LIMIT ?", (batch_size,)
     ).fetchall()
-    return [dict(r) for r in rows]
+    while rows:
+        for r in rows:
+            yield dict(r)
+        if len(rows) < batch_size:
+            return
+        rows = conn.execute(
+            f"{select} WHERE date {cmp} ? ORDER BY date {order} LIMIT ?",
+            (rows[-1]["date"], batch_size),
+        ).fetchall()
 
 
 def delete_entry(conn: sqlite3.Connection, date: str) -> bool:
     """Delete a diary entry by date. Returns True if a row was deleted."""
-    # Also clean up related tags and metadata
+    # Also clean up related tags, metadata and source fingerprints
     conn.execute("DELETE FROM entry_tags WHERE date = ?", (date,))
     conn.execute("DELETE FROM entry_metadata WHERE date = ?", (date,))
+    conn.execute("DELETE FROM source_fingerprints WHERE date = ?", (date,))
     cursor = conn.execute("DELETE FROM diary_entries WHERE date = ?", (date,))
-    conn.commit()
+    _commit(conn)
     return cursor.rowcount > 0
 
 
@@ -224,6 +416,40 @@ def count_entries(conn: sqlite3.Connection) -> int:
     return row["cnt"]
 
 
+# ─── Rendered Fragments ──────────────────────────────────────────────────────
+
+
+def get_stale_render_dates(conn: sqlite3.Connection, render_version: str) -> list[str]:
+    """Dates whose cached article/card HTML is missing or from another render version."""
+    rows = conn.execute(
+        """\
+        SELECT date FROM diary_entries
+        WHERE render_version IS NOT ? OR article_html IS NULL OR card_html IS NULL
+        ORDER BY date DESC""",
+        (render_version,),
+    ).fetchall()
+    return [r["date"] for r in rows]
+
+
+def set_rendered_fragments(
+    conn: sqlite3.Connection,
+    date: str,
+    *,
+    render_version: str,
+    article_html: str,
+    card_html: str,
+) -> None:
+    """Cache the rendered article and card HTML of an entry."""
+    conn.execute(
+        """\
+        UPDATE diary_entries
+        SET article_html = ?, card_html = ?, render_version = ?
+        WHERE date = ?""",
+        (article_html, card_html, render_version, date),
+    )
+    _commit(conn)
+
+
 # ─── Translation Cache ───────────────────────────────────────────────────────
 
 
@@ -260,7 +486,7 @@ def set_translation_cache(
         VALUES (?, ?, ?, ?, ?)""",
         (date, source, source_hash, translation, _now_iso()),
     )
-    conn.commit()
+    _commit(conn)
 
 
 # ─── Recap Cache ─────────────────────────────────────────────────────────────
@@ -299,7 +525,7 @@ def set_recap_cache(
         VALUES (?, ?, ?, ?, ?)""",
         (date, content_hash, recap_ja, recap_en, _now_iso()),
     )
-    conn.commit()
+    _commit(conn)
 
 
 # ─── Tags & Metadata ────────────────────────────────────────────────────────
@@ -308,11 +534,11 @@ def set_recap_cache(
 def set_tags(conn: sqlite3.Connection, date: str, tags: list[str]) -> None:
     """Set tags for a diary entry (replaces existing tags)."""
     conn.execute("DELETE FROM entry_tags WHERE date = ?", (date,))
-    for tag in tags:
-        conn.execute(
-            "INSERT INTO entry_tags (date, tag) VALUES (?, ?)", (date, tag)
-        )
-    conn.commit()
+    conn.executemany(
+        "INSERT INTO entry_tags (date, tag) VALUES (?, ?)",
+        [(date, tag) for tag in tags],
+    )
+    _commit(conn)
 
 
 def get_tags(conn: sqlite3.Connection, date: str) -> list[str]:
@@ -329,7 +555,7 @@ def set_metadata(conn: sqlite3.Connection, date: str, key: str, value: str) -> N
         "INSERT OR REPLACE INTO entry_metadata (date, key, value) VALUES (?, ?, ?)",
         (date, key, value),
     )
-    conn.commit()
+    _commit(conn)
 
 
 def get_metadata(conn: sqlite3.Connection, date: str) -> dict[str, str]:
@@ -341,6 +567,57 @@ def get_metadata(conn: sqlite3.Connection, date: str) -> dict[str, str]:
     return {r["key"]: r["value"] for r in rows}
 
 
+# ─── Source Fingerprints ─────────────────────────────────────────────────────
+
+
+def get_source_fingerprints(conn: sqlite3.Connection) -> dict[tuple[str, str], dict]:
+    """Get all recorded source fingerprints.
+
+    Returns a dict keyed by (date, source) with values
+    {"size": int, "mtime_ns": int, "sha256": str}.
+    """
+    rows = conn.execute(
+        "SELECT date, source, size, mtime_ns, sha256 FROM source_fingerprints"
+    ).fetchall()
+    return {
+        (r["date"], r["source"]): {
+            "size": r["size"],
+            "mtime_ns": r["mtime_ns"],
+            "sha256": r["sha256"],
+        }
+        for r in rows
+    }
+
+
+def set_source_fingerprint(
+    conn: sqlite3.Connection,
+    date: str,
+    source: str,
+    *,
+    size: int,
+    mtime_ns: int,
+    sha256: str,
+) -> None:
+    """Record the fingerprint of a source file (e.g. memory/<date>.md)."""
+    conn.execute(
+        """\
+        INSERT OR REPLACE INTO source_fingerprints
+            (date, source, size, mtime_ns, sha256, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)""",
+        (date, source, size, mtime_ns, sha256, _now_iso()),
+    )
+    _commit(conn)
+
+
+def delete_source_fingerprint(conn: sqlite3.Connection, date: str, source: str) -> None:
+    """Forget the fingerprint of a source file that no longer exists."""
+    conn.execute(
+        "DELETE FROM source_fingerprints WHERE date = ? AND source = ?",
+        (date, source),
+    )
+    _commit(conn)
+
+
 # ─── Cache Migration ────────────────────────────────────────────────────────
 
 
@@ -416,5 +693,5 @@ def migrate_file_caches(
             except (json.JSONDecodeError, OSError):
                 stats["skipped"] += 1
 
-    conn.commit()
+    _commit(conn)
     return stats
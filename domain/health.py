@@ -5,8 +5,10 @@ Pure functions only — no I/O, no subprocess, no file access.
 All thresholds and labels come from domain.constants.
 """
 
+import bisect
 import random
 
+from domain.classifier import ThresholdClassifier
 from domain.constants import (
     CPU_THRESHOLDS, CPU_LABELS,
     MEMORY_THRESHOLDS, MEMORY_LABELS,
@@ -24,6 +26,36 @@ from domain.constants import (
 )
 
 
+# Compiled once at import; classify_* return their shared read-only records
+_CPU_CLASSIFIER = ThresholdClassifier.upper_bounds(CPU_THRESHOLDS, CPU_LABELS)
+_MEMORY_CLASSIFIER = ThresholdClassifier.upper_bounds(MEMORY_THRESHOLDS, MEMORY_LABELS)
+_DISK_CLASSIFIER = ThresholdClassifier.upper_bounds(DISK_THRESHOLDS, DISK_LABELS)
+_TEMPERATURE_CLASSIFIER = ThresholdClassifier.upper_bounds(TEMPERATURE_THRESHOLDS, TEMPERATURE_LABELS)
+_UPTIME_CLASSIFIER = ThresholdClassifier.upper_bounds(UPTIME_THRESHOLDS_DAYS, UPTIME_LABELS)
+
+_CPU = _CPU_CLASSIFIER.lookup
+_MEMORY = _MEMORY_CLASSIFIER.lookup
+_DISK = _DISK_CLASSIFIER.lookup
+_TEMPERATURE = _TEMPERATURE_CLASSIFIER.lookup
+_UPTIME = _UPTIME_CLASSIFIER.lookup
+
+
+def _overall_by_score():
+    """(state, emoji, label, message) for every integer score 0-100."""
+    table = []
+    for score in range(101):
+        row = OVERALL_SCORE_TABLE[-1]
+        for entry in OVERALL_SCORE_TABLE:
+            if score >= entry[0]:
+                row = entry
+                break
+        table.append(row[1:])
+    return tuple(table)
+
+
+_OVERALL_BY_SCORE = _overall_by_score()
+
+
 def _classify(value, thresholds):
     """Generic threshold classifier. Returns the state string for the given value."""
     for upper_bound, state in thresholds:
@@ -34,36 +66,30 @@ def _classify(value, thresholds):
 
 
 def classify_cpu(usage_percent):
-    """Classify CPU usage into emotional state. Returns dict {state, label, message}."""
-    state = _classify(usage_percent, CPU_THRESHOLDS)
-    return {"state": state, **CPU_LABELS[state]}
+    """Classify CPU usage into emotional state. Returns read-only dict {state, label, message}."""
+    return _CPU(usage_percent)
 
 
 def classify_memory(usage_percent):
-    """Classify memory usage into emotional state. Returns dict {state, label, message}."""
-    state = _classify(usage_percent, MEMORY_THRESHOLDS)
-    return {"state": state, **MEMORY_LABELS[state]}
+    """Classify memory usage into emotional state. Returns read-only dict {state, label, message}."""
+    return _MEMORY(usage_percent)
 
 
 def classify_disk(usage_percent):
-    """Classify disk usage into emotional state. Returns dict {state, label, message}."""
-    state = _classify(usage_percent, DISK_THRESHOLDS)
-    return {"state": state, **DISK_LABELS[state]}
+    """Classify disk usage into emotional state. Returns read-only dict {state, label, message}."""
+    return _DISK(usage_percent)
 
 
 def classify_temperature(celsius):
-    """Classify temperature. Returns dict {state, label, message} or None if celsius is None."""
+    """Classify temperature. Returns read-only dict {state, label, message} or None if celsius is None."""
     if celsius is None:
         return None
-    state = _classify(celsius, TEMPERATURE_THRESHOLDS)
-    return {"state": state, **TEMPERATURE_LABELS[state]}
+    return _TEMPERATURE(celsius)
 
 
 def classify_uptime(seconds):
-    """Classify uptime into emotional state. Returns dict {state, label, message}."""
-    days = seconds / 86400.0
-    state = _classify(days, UPTIME_THRESHOLDS_DAYS)
-    return {"state": state, **UPTIME_LABELS[state]}
+    """Classify uptime into emotional state. Returns read-only dict {state, label, message}."""
+    return _UPTIME(seconds / 86400.0)
 
 
 def calculate_overall_score(cpu_pct, mem_pct, disk_pct, temp_c, uptime_sec):
@@ -82,19 +108,14 @@ def calculate_overall_score(cpu_pct, mem_pct, disk_pct, temp_c, uptime_sec):
     total_penalty = cpu_penalty + memory_penalty + disk_penalty + temp_penalty + uptime_penalty
     score = max(0, min(100, round(100 - total_penalty)))
 
-    for min_score, state, emoji, label, message in OVERALL_SCORE_TABLE:
-        if score >= min_score:
-            return {
-                "score": score,
-                "state": state,
-                "emoji": emoji,
-                "label": label,
-                "message": message,
-            }
-
-    # Fallback (should not reach here)
-    last = OVERALL_SCORE_TABLE[-1]
-    return {"score": score, "state": last[1], "emoji": last[2], "label": last[3], "message": last[4]}
+    state, emoji, label, message = _OVERALL_BY_SCORE[score]
+    return {
+        "score": score,
+        "state": state,
+        "emoji": emoji,
+        "label": label,
+        "message": message,
+    }
 
 
 def determine_alert_level(states, overall_score):
@@ -176,3 +197,104 @@ def evaluate(raw_metrics):
         "alert_level": alert_level,
         "alert_message": alert_message,
     }
+
+
+def _alert_weights(states):
+    """Per-state alert weight: 16 per critical state, 1 per heavy state."""
+    return tuple(
+        16 if state in ALERT_CRITICAL_STATES else 1 if state in ALERT_HEAVY_STATES else 0
+        for state in states
+    )
+
+
+# evaluate_many works on state indices; temperature gets one extra index
+# for "no sensor" (state None, never alerts)
+_NO_TEMPERATURE = len(_TEMPERATURE_CLASSIFIER.states)
+_STATE_NAMES = (
+    _CPU_CLASSIFIER.states,
+    _MEMORY_CLASSIFIER.states,
+    _DISK_CLASSIFIER.states,
+    _TEMPERATURE_CLASSIFIER.states + (None,),
+    _UPTIME_CLASSIFIER.states,
+)
+_ALERT_WEIGHTS = tuple(_alert_weights(states) for states in _STATE_NAMES)
+
+
+def evaluate_many(cpu, mem, disk, temperature, uptime, seed=None):
+    """
+    Columnar health evaluation for backfills and simulations.
+
+    Gives the same states, scores and alert levels as calling evaluate() on
+    each row, without building per-row dicts. Alert messages are drawn from
+    random.Random(seed), one draw per alerting row in row order, so a fixed
+    seed reproduces the same messages.
+
+    Args:
+        cpu, mem, disk: sequences of float (percent)
+        temperature: sequence of float (celsius); None or NaN = no sensor
+        uptime: sequence of int (seconds)
+        seed: optional seed for alert message selection
+
+    Returns:
+        dict of equal-length lists: score, overall, cpu, memory, disk,
+        temperature (None where missing), uptime, alert_level, alert_message
+    """
+    columns = (cpu, mem, disk, temperature, uptime)
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("evaluate_many columns must have equal length")
+
+    br = bisect.bisect_right
+    bounds = _CPU_CLASSIFIER.bounds
+    cpu_idx = [br(bounds, v) for v in cpu]
+    bounds = _MEMORY_CLASSIFIER.bounds
+    mem_idx = [br(bounds, v) for v in mem]
+    bounds = _DISK_CLASSIFIER.bounds
+    disk_idx = [br(bounds, v) for v in disk]
+    bounds, missing = _TEMPERATURE_CLASSIFIER.bounds, _NO_TEMPERATURE
+    temp_idx = [missing if t is None or t != t else br(bounds, t) for t in temperature]
+    days = [s / 86400.0 for s in uptime]
+    bounds = _UPTIME_CLASSIFIER.bounds
+    uptime_idx = [br(bounds, d) for d in days]
+
+    # Same operations and order as calculate_overall_score, so floats match
+    cpu_off, cpu_w = PENALTY_CPU_OFFSET, PENALTY_CPU_WEIGHT
+    mem_off, mem_w = PENALTY_MEMORY_OFFSET, PENALTY_MEMORY_WEIGHT
+    disk_off, disk_w = PENALTY_DISK_OFFSET, PENALTY_DISK_WEIGHT
+    temp_off, temp_w = PENALTY_TEMP_OFFSET, PENALTY_TEMP_WEIGHT
+    per_day, up_max = PENALTY_UPTIME_PER_DAY, PENALTY_UPTIME_MAX
+    cw, mw, dw, tw, uw = _ALERT_WEIGHTS
+    scores, levels = [], []
+    add_score, add_level = scores.append, levels.append
+    rows = zip(cpu, mem, disk, temperature, days, cpu_idx, mem_idx, disk_idx, temp_idx, uptime_idx)
+    for c, m, d, t, u, ci, mi, di, ti, ui in rows:
+        total = ((c - cpu_off if c > cpu_off else 0) * cpu_w
+                 + (m - mem_off if m > mem_off else 0) * mem_w
+                 + (d - disk_off if d > disk_off else 0) * disk_w
+                 + ((t - temp_off if t > temp_off else 0) * temp_w if ti != missing else 0)
+                 + (u * per_day if u * per_day < up_max else up_max))
+        score = round(100 - total)
+        score = 0 if score < 0 else 100 if score > 100 else score
+        add_score(score)
+        weight = cw[ci] + mw[mi] + dw[di] + tw[ti] + uw[ui]
+        add_level(3 if weight >= 32 or score < 20 else 2 if weight >= 16 else 1 if weight else 0)
+
+    draw = random.Random(seed).random
+    choices_by_level = [None] + [ALERT_MESSAGES.get(level) for level in (1, 2, 3)]
+    alert_messages = []
+    append = alert_messages.append
+    for level in levels:
+        choices = choices_by_level[level]
+        append(choices[int(draw() * len(choices))] if choices else None)
+
+    cs, ms, ds, ts, us = _STATE_NAMES
+    return {
+        "score": scores,
+        "overall": [_OVERALL_BY_SCORE[s][0] for s in scores],
+        "cpu": [cs[i] for i in cpu_idx],
+        "memory": [ms[i] for i in mem_idx],
+        "disk": [ds[i] for i in disk_idx],
+        "temperature": [ts[i] for i in temp_idx],
+        "uptime": [us[i] for i in uptime_idx],
+        "alert_level": levels,
+        "alert_message": alert_messages,
+    }
@@ -0,0 +1,199 @@
+"""
+domain/history.py — Health metric time-series store.
+
+Every health sample is folded into 1-minute, 1-hour and 1-day rollup
+buckets (count/sum/min/max per metric) in SQLite. Each resolution keeps
+a fixed window of buckets, so the database size is bounded no matter how
+long the collector runs.
+
+Uses Python 3 standard library only (sqlite3).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from domain.constants import VISIT_DAY_OFFSET_SEC
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+
+# Metrics stored per sample (None values are skipped, e.g. no temperature sensor)
+METRICS = ("cpu", "mem", "disk", "temp", "score")
+
+# Resolution -> (bucket width in seconds, number of buckets kept)
+RESOLUTIONS = {
+    "1m": (60, 2 * 24 * 60),   # 2 days
+    "1h": (3600, 60 * 24),     # 60 days
+    "1d": (86400, 2 * 365),    # 2 years
+}
+
+# Buckets start at local (JST) boundaries, the same days as the visit log
+# and the activity daily counts; only 1d buckets differ from UTC alignment
+LOCAL_OFFSET_SEC = VISIT_DAY_OFFSET_SEC
+
+# Window of each resolution included in export_recent(), in buckets
+EXPORT_WINDOWS = {
+    "1m": 60,   # last hour
+    "1h": 48,   # last 2 days
+    "1d": 30,   # last month
+}
+
+_METRIC_COLUMNS = ",\n    ".join(
+    f"{m}_n INTEGER NOT NULL DEFAULT 0, {m}_sum REAL NOT NULL DEFAULT 0, {m}_min REAL, {m}_max REAL"
+    for m in METRICS
+)
+
+_CREATE_TABLES_SQL = f"""\
+CREATE TABLE IF NOT EXISTS health_rollups (
+    resolution TEXT NOT NULL,
+    bucket     INTEGER NOT NULL,
+    {_METRIC_COLUMNS},
+    PRIMARY KEY (resolution, bucket)
+) WITHOUT ROWID;
+"""
+
+_INSERT_COLUMNS = ", ".join(
+    ["resolution", "bucket"]
+    + [f"{m}_{agg}" for m in METRICS for agg in ("n", "sum", "min", "max")]
+)
+_UPSERT_SQL = (
+    f"INSERT INTO health_rollups ({_INSERT_COLUMNS}) "
+    f"VALUES ({', '.join('?' * (2 + 4 * len(METRICS)))}) "
+    "ON CONFLICT (resolution, bucket) DO UPDATE SET "
+    + ", ".join(
+        f"{m}_n = {m}_n + excluded.{m}_n, "
+        f"{m}_sum = {m}_sum + excluded.{m}_sum, "
+        f"{m}_min = COALESCE(MIN({m}_min, excluded.{m}_min), {m}_min, excluded.{m}_min), "
+        f"{m}_max = COALESCE(MAX({m}_max, excluded.{m}_max), {m}_max, excluded.{m}_max)"
+        for m in METRICS
+    )
+)
+
+
+# ─── DB Initialization ───────────────────────────────────────────────────────
+
+
+def init_db(db_path: str | Path) -> sqlite3.Connection:
+    """Open (and create if needed) the history database. Returns an open connection."""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_CREATE_TABLES_SQL)
+    _realign_day_buckets(conn)
+    return conn
+
+
+def _realign_day_buckets(conn: sqlite3.Connection) -> None:
+    """Move 1d buckets written at UTC midnight to the local day they mostly cover."""
+    width = RESOLUTIONS["1d"][0]
+    with conn:
+        conn.execute(
+            "UPDATE health_rollups SET bucket = bucket - ? "
+            "WHERE resolution = '1d' AND (bucket + ?) % ? != 0",
+            (LOCAL_OFFSET_SEC, LOCAL_OFFSET_SEC, width),
+        )
+
+
+def bucket_start(ts: float, width: int) -> int:
+    """Start (epoch seconds) of the `width`-second bucket holding ts, in local time."""
+    return int((ts + LOCAL_OFFSET_SEC) // width) * width - LOCAL_OFFSET_SEC
+
+
+# ─── Samples ─────────────────────────────────────────────────────────────────
+
+
+def sample_from_health(data: dict) -> tuple[float, dict]:
+    """Extract (epoch seconds, {metric: value}) from a health.json payload."""
+    ts = datetime.fromisoformat(data["timestamp"]).timestamp()
+
+    def pick(section: str, key: str) -> Optional[float]:
+        value = (data.get(section) or {}).get(key)
+        return float(value) if value is not None else None
+
+    return ts, {
+        "cpu": pick("cpu", "usage_percent"),
+        "mem": pick("memory", "usage_percent"),
+        "disk": pick("disk", "usage_percent"),
+        "temp": pick("temperature", "celsius"),
+        "score": pick("overall", "score"),
+    }
+
+
+def record_sample(conn: sqlite3.Connection, ts: float, values: dict) -> None:
+    """Fold one sample into every resolution and drop buckets past retention."""
+    params = []
+    for m in METRICS:
+        v = values.get(m)
+        params.extend((0, 0.0, None, None) if v is None else (1, v, v, v))
+    with conn:
+        for resolution, (width, keep) in RESOLUTIONS.items():
+            bucket = bucket_start(ts, width)
+            conn.execute(_UPSERT_SQL, (resolution, bucket, *params))
+            conn.execute(
+                "DELETE FROM health_rollups WHERE resolution = ? AND bucket <= ?",
+                (resolution, bucket - keep * width),
+            )
+
+
+# ─── Queries ─────────────────────────────────────────────────────────────────
+
+
+def query(
+    conn: sqlite3.Connection,
+    resolution: str,
+    *,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> list[dict]:
+    """Return rollup buckets (oldest first) with avg/min/max per metric.
+
+    `since`/`until` are epoch seconds compared against bucket starts.
+    A metric with no samples in a bucket has None for all three values.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution: {resolution!r}")
+    sql = "SELECT * FROM health_rollups WHERE resolution = ?"
+    params: list = [resolution]
+    if since is not None:
+        sql += " AND bucket >= ?"
+        params.append(int(since))
+    if until is not None:
+        sql += " AND bucket <= ?"
+        params.append(int(until))
+    sql += " ORDER BY bucket"
+
+    rows = []
+    for r in conn.execute(sql, params):
+        row = {"t": r["bucket"]}
+        for m in METRICS:
+            n = r[f"{m}_n"]
+            row[m] = {
+                "avg": r[f"{m}_sum"] / n if n else None,
+                "min": r[f"{m}_min"],
+                "max": r[f"{m}_max"],
+            }
+        rows.append(row)
+    return rows
+
+
+def export_recent(conn: sqlite3.Connection, now: float, windows: Optional[dict] = None) -> dict:
+    """Recent windows as compact columnar JSON for the frontend.
+
+    {"1m": {"t": [...], "cpu": [...], ...}, "1h": {...}, "1d": {...}}
+    where each metric list holds bucket averages rounded to 0.1.
+    """
+    windows = EXPORT_WINDOWS if windows is None else windows
+    out = {}
+    for resolution, count in windows.items():
+        width = RESOLUTIONS[resolution][0]
+        rows = query(conn, resolution, since=bucket_start(now, width) - (count - 1) * width)
+        series: dict[str, list] = {"t": [r["t"] for r in rows]}
+        for m in METRICS:
+            series[m] = [
+                round(r[m]["avg"], 1) if r[m]["avg"] is not None else None for r in rows
+            ]
+        out[resolution] = series
+    return out
@@ -6,8 +6,12 @@ All thresholds and labels come from domain.constants.
 No I/O, no subprocess, no file access.
 """
 
+import bisect
 import math
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
 
+from domain.classifier import ThresholdClassifier
 from domain.constants import (
     NURTURE_FIRST_DAY,
     EXP_TABLE,
@@ -40,9 +44,146 @@ from domain.constants import (
     INTIMACY_MAX_FROM_HOURS,
     INTIMACY_TODAY_DIVISOR,
     INTIMACY_TODAY_BONUS_MAX,
+    VISIT_MAX_GAP_SEC,
+    VISIT_DAY_OFFSET_SEC,
 )
 
 
+# Formula constants by name. The *_formula functions below take them as
+# `p` so the what-if simulator (scripts/simulate_nurture.py) can run the
+# same formulas with overridden values.
+FORMULA_PARAMS = {
+    "ENERGY_BASE": ENERGY_BASE,
+    "ENERGY_UPTIME_THRESHOLD_HOURS": ENERGY_UPTIME_THRESHOLD_HOURS,
+    "ENERGY_UPTIME_PENALTY_PER_HOUR": ENERGY_UPTIME_PENALTY_PER_HOUR,
+    "ENERGY_UPTIME_PENALTY_MAX": ENERGY_UPTIME_PENALTY_MAX,
+    "ENERGY_TIME_WEIGHTS": ENERGY_TIME_WEIGHTS,
+    "MOOD_WEIGHTS": MOOD_WEIGHTS,
+    "MOOD_VISIT_NEUTRAL": MOOD_VISIT_NEUTRAL,
+    "MOOD_VISIT_TODAY": MOOD_VISIT_TODAY,
+    "MOOD_VISIT_STREAK_LONG": MOOD_VISIT_STREAK_LONG,
+    "MOOD_VISIT_STREAK_MID": MOOD_VISIT_STREAK_MID,
+    "MOOD_TIME_FACTORS": MOOD_TIME_FACTORS,
+    "TRUST_BASE": TRUST_BASE,
+    "TRUST_LOG_COEFFICIENT": TRUST_LOG_COEFFICIENT,
+    "TRUST_MAX_FROM_VISITS": TRUST_MAX_FROM_VISITS,
+    "TRUST_STREAK_BONUS_PER_DAY": TRUST_STREAK_BONUS_PER_DAY,
+    "TRUST_STREAK_BONUS_MAX": TRUST_STREAK_BONUS_MAX,
+    "INTIMACY_BASE": INTIMACY_BASE,
+    "INTIMACY_LOG_COEFFICIENT": INTIMACY_LOG_COEFFICIENT,
+    "INTIMACY_MAX_FROM_HOURS": INTIMACY_MAX_FROM_HOURS,
+    "INTIMACY_TODAY_DIVISOR": INTIMACY_TODAY_DIVISOR,
+    "INTIMACY_TODAY_BONUS_MAX": INTIMACY_TODAY_BONUS_MAX,
+    "EXP_SOURCES": EXP_SOURCES,
+    "HEALTH_EXP_THRESHOLD": HEALTH_EXP_THRESHOLD,
+    "STREAK_EXP_CAP": STREAK_EXP_CAP,
+    "EXP_TABLE": EXP_TABLE,
+    "EXP_EXTRAPOLATION_STEP": EXP_EXTRAPOLATION_STEP,
+}
+
+# Element-wise operations the formulas use, for plain numbers. A NumPy
+# namespace with the same names (np.minimum, np.where, ...) runs them
+# over whole columns instead.
+SCALAR_OPS = SimpleNamespace(
+    minimum=min,
+    maximum=max,
+    clip=lambda x, lo, hi: max(lo, min(hi, x)),
+    trunc=int,
+    log10=math.log10,
+    where=lambda cond, a, b: a if cond else b,
+    bisect_right=bisect.bisect_right,
+)
+
+
+def energy_time_mod(time_period, p=FORMULA_PARAMS):
+    """Energy modifier for a time period name (0 for None/unknown)."""
+    if time_period is None:
+        return 0
+    return p["ENERGY_TIME_WEIGHTS"].get(time_period, 0)
+
+
+def mood_time_factor(time_period, p=FORMULA_PARAMS):
+    """Mood time factor for a time period name (neutral for None/unknown)."""
+    if time_period is None:
+        return p["MOOD_VISIT_NEUTRAL"]
+    return p["MOOD_TIME_FACTORS"].get(time_period, p["MOOD_VISIT_NEUTRAL"])
+
+
+def health_formula(score, ops=SCALAR_OPS):
+    """Health value: score clamped to 0-100, truncated."""
+    return ops.trunc(ops.clip(score, 0, 100))
+
+
+def energy_formula(uptime_seconds, time_mod, p=FORMULA_PARAMS, ops=SCALAR_OPS):
+    """Energy from uptime (penalty past a threshold) and the time-of-day modifier."""
+    uptime_hours = uptime_seconds / 3600
+    threshold = p["ENERGY_UPTIME_THRESHOLD_HOURS"]
+    penalty = ops.where(
+        uptime_hours > threshold,
+        ops.minimum((uptime_hours - threshold) * p["ENERGY_UPTIME_PENALTY_PER_HOUR"],
+                    p["ENERGY_UPTIME_PENALTY_MAX"]),
+        0,
+    )
+    return ops.clip(ops.trunc(p["ENERGY_BASE"] - penalty + time_mod), 0, 100)
+
+
+def mood_formula(health_val, energy_val, today_visits, streak, time_factor,
+                 p=FORMULA_PARAMS, ops=SCALAR_OPS):
+    """Mood from health, energy, today's visits / streak and the time factor."""
+    visit_factor = ops.where(today_visits > 0, p["MOOD_VISIT_TODAY"], p["MOOD_VISIT_NEUTRAL"])
+    visit_factor = ops.where(
+        streak >= 7, p["MOOD_VISIT_STREAK_LONG"],
+        ops.where(streak >= 3, ops.maximum(visit_factor, p["MOOD_VISIT_STREAK_MID"]), visit_factor),
+    )
+    mood = (health_val * p["MOOD_WEIGHTS"]["health"] + energy_val * p["MOOD_WEIGHTS"]["energy"]
+            + visit_factor + time_factor)
+    return ops.clip(ops.trunc(mood), 0, 100)
+
+
+def trust_formula(total_visits, streak, p=FORMULA_PARAMS, ops=SCALAR_OPS):
+    """Trust: logarithmic in total visits plus a capped streak bonus."""
+    base = p["TRUST_BASE"] + ops.minimum(
+        p["TRUST_MAX_FROM_VISITS"],
+        p["TRUST_LOG_COEFFICIENT"] * ops.log10(ops.maximum(total_visits, 1)),
+    )
+    streak_bonus = ops.minimum(streak * p["TRUST_STREAK_BONUS_PER_DAY"], p["TRUST_STREAK_BONUS_MAX"])
+    return ops.trunc(ops.minimum(100, base + streak_bonus))
+
+
+def intimacy_formula(total_minutes, today_minutes, p=FORMULA_PARAMS, ops=SCALAR_OPS):
+    """Intimacy: logarithmic in total hours together plus a capped bonus for today."""
+    intimacy = p["INTIMACY_BASE"] + ops.minimum(
+        p["INTIMACY_MAX_FROM_HOURS"],
+        p["INTIMACY_LOG_COEFFICIENT"] * ops.log10(ops.maximum(total_minutes / 60, 0.1) + 1),
+    )
+    intimacy = intimacy + ops.minimum(today_minutes / p["INTIMACY_TODAY_DIVISOR"],
+                                      p["INTIMACY_TODAY_BONUS_MAX"])
+    return ops.trunc(ops.minimum(100, intimacy))
+
+
+def exp_formula(total_visits, total_minutes, streak, health_val, skill_count,
+                p=FORMULA_PARAMS, ops=SCALAR_OPS):
+    """Total EXP from visits, time together, streak, health and installed skills."""
+    src = p["EXP_SOURCES"]
+    visit_exp = total_visits * src["visit"]
+    time_exp = (total_minutes // 5) * src["time_per_5min"]
+    streak_exp = total_visits * ops.minimum(streak, p["STREAK_EXP_CAP"]) * src["streak_bonus"]
+    health_exp = ops.maximum(0, health_val - p["HEALTH_EXP_THRESHOLD"]) * src["health_bonus"]
+    skill_exp = skill_count * src["skill_bonus"]
+    return visit_exp + time_exp + streak_exp + health_exp + skill_exp
+
+
+def level_formula(total_exp, p=FORMULA_PARAMS, ops=SCALAR_OPS):
+    """Level for total EXP: the table, then one level per EXP_EXTRAPOLATION_STEP."""
+    table = p["EXP_TABLE"]
+    last = table[-1]
+    return ops.where(
+        total_exp >= last,
+        len(table) + (total_exp - last) // p["EXP_EXTRAPOLATION_STEP"],
+        ops.maximum(ops.bisect_right(table, total_exp), 1),
+    )
+
+
 def calc_health(overall_score):
     """
     Extract health score for nurture calculation.
@@ -55,7 +196,7 @@ def calc_health(overall_score):
     """
     if overall_score is None:
         return 50
-    return int(max(0, min(100, overall_score)))
+    return health_formula(overall_score)
 
 
 def calc_energy(uptime_seconds, time_period, hour=None):
@@ -63,31 +204,18 @@ def calc_energy(uptime_seconds, time_period, hour=None):
     Calculate energy based on uptime and time of day.
 
     Args:
-        uptime_seconds: int or None - system uptime in seconds
+        uptime_seconds: int or None - system uptime in seconds (None: no penalty)
         time_period: str or None - current time period name
         hour: int or None - unused, kept for API compatibility
 
     Returns:
         int - energy value (0-100)
     """
-    energy = ENERGY_BASE
-
-    # Uptime penalty
-    if uptime_seconds is not None:
-        uptime_hours = uptime_seconds / 3600
-        if uptime_hours > ENERGY_UPTIME_THRESHOLD_HOURS:
-            penalty = min(
-                (uptime_hours - ENERGY_UPTIME_THRESHOLD_HOURS) * ENERGY_UPTIME_PENALTY_PER_HOUR,
-                ENERGY_UPTIME_PENALTY_MAX,
-            )
-            energy -= penalty
+    return energy_formula(0 if uptime_seconds is None else uptime_seconds, energy_time_mod(time_period))
 
-    # Time-of-day modifier
-    if time_period is not None:
-        mod = ENERGY_TIME_WEIGHTS.get(time_period, 0)
-        energy += mod
 
-    return max(0, min(100, int(energy)))
+_ENERGY = ThresholdClassifier.lower_bounds(ENERGY_THRESHOLDS, ENERGY_LABELS).lookup
+_MOOD = ThresholdClassifier.lower_bounds(MOOD_THRESHOLDS, MOOD_LABELS).lookup
 
 
 def classify_energy(value):
@@ -98,13 +226,9 @@ def classify_energy(value):
         value: int - energy value (0-100)
 
     Returns:
-        dict - {state, label, message}
+        dict - read-only {state, label, message} (shared, compiled at import)
     """
-    for threshold, state in ENERGY_THRESHOLDS:
-        if threshold is None or value >= threshold:
-            return {"state": state, **ENERGY_LABELS[state]}
-    # Fallback
-    return {"state": "exhausted", **ENERGY_LABELS["exhausted"]}
+    return _ENERGY(value)
 
 
 def calc_mood(health_val, energy_val, visit_data, time_period):
@@ -120,30 +244,9 @@ def calc_mood(health_val, energy_val, visit_data, time_period):
     Returns:
         int - mood value (0-100)
     """
-    # Health factor
-    health_factor = health_val * MOOD_WEIGHTS["health"]
-
-    # Energy factor
-    energy_factor = energy_val * MOOD_WEIGHTS["energy"]
-
-    # Visit factor
-    visit_factor = MOOD_VISIT_NEUTRAL
     streak = visit_data.get("streak", 0) if visit_data else 0
     today_visits = visit_data.get("today_visits", 0) if visit_data else 0
-    if today_visits > 0:
-        visit_factor = MOOD_VISIT_TODAY
-    if streak >= 7:
-        visit_factor = MOOD_VISIT_STREAK_LONG
-    elif streak >= 3:
-        visit_factor = max(visit_factor, MOOD_VISIT_STREAK_MID)
-
-    # Time factor
-    time_factor = MOOD_VISIT_NEUTRAL  # neutral default
-    if time_period is not None:
-        time_factor = MOOD_TIME_FACTORS.get(time_period, MOOD_VISIT_NEUTRAL)
-
-    mood = int(health_factor + energy_factor + visit_factor + time_factor)
-    return max(0, min(100, mood))
+    return mood_formula(health_val, energy_val, today_visits, streak, mood_time_factor(time_period))
 
 
 def classify_mood(value):
@@ -154,13 +257,9 @@ def classify_mood(value):
         value: int - mood value (0-100)
 
     Returns:
-        dict - {state, label, message}
+        dict - read-only {state, label, message} (shared, compiled at import)
     """
-    for threshold, state in MOOD_THRESHOLDS:
-        if threshold is None or value >= threshold:
-            return {"state": state, **MOOD_LABELS[state]}
-    # Fallback
-    return {"state": "bad", **MOOD_LABELS["bad"]}
+    return _MOOD(value)
 
 
 def calc_trust(total_visits, streak, max_streak=None):
@@ -175,12 +274,7 @@ def calc_trust(total_visits, streak, max_streak=None):
     Returns:
         int - trust value (0-100)
     """
-    base = TRUST_BASE + min(
-        TRUST_MAX_FROM_VISITS,
-        TRUST_LOG_COEFFICIENT * math.log10(max(total_visits, 1)),
-    )
-    streak_bonus = min(streak * TRUST_STREAK_BONUS_PER_DAY, TRUST_STREAK_BONUS_MAX)
-    return int(min(100, base + streak_bonus))
+    return trust_formula(total_visits, streak)
 
 
 def calc_intimacy(total_minutes, today_minutes):
@@ -194,14 +288,7 @@ def calc_intimacy(total_minutes, today_minutes):
     Returns:
         int - intimacy value (0-100)
     """
-    total_hours = total_minutes / 60
-    intimacy = INTIMACY_BASE + min(
-        INTIMACY_MAX_FROM_HOURS,
-        INTIMACY_LOG_COEFFICIENT * math.log10(max(total_hours, 0.1) + 1),
-    )
-    today_bonus = min(today_minutes / INTIMACY_TODAY_DIVISOR, INTIMACY_TODAY_BONUS_MAX)
-    intimacy += today_bonus
-    return int(min(100, intimacy))
+    return intimacy_formula(total_minutes, today_minutes)
 
 
 def calc_exp(visit_data, health_val, skill_count):
@@ -220,13 +307,61 @@ def calc_exp(visit_data, health_val, skill_count):
     total_minutes = visit_data.get("total_time_minutes", 0) if visit_data else 0
     streak = visit_data.get("streak", 0) if visit_data else 0
 
-    visit_exp = total_visits * EXP_SOURCES["visit"]
-    time_exp = (total_minutes // 5) * EXP_SOURCES["time_per_5min"]
-    streak_exp = total_visits * min(streak, STREAK_EXP_CAP) * EXP_SOURCES["streak_bonus"]
-    health_exp = max(0, health_val - HEALTH_EXP_THRESHOLD) * EXP_SOURCES["health_bonus"]
-    skill_exp = skill_count * EXP_SOURCES["skill_bonus"]
+    return exp_formula(total_visits, total_minutes, streak, health_val, skill_count)
 
-    return visit_exp + time_exp + streak_exp + health_exp + skill_exp
+
+def build_level_index(table=EXP_TABLE, step=EXP_EXTRAPOLATION_STEP):
+    """
+    Precompute level lookups for an ascending cumulative EXP table.
+
+    Args:
+        table: list - total EXP at which each level starts (Lv.1 first)
+        step: int - EXP per level beyond the table
+
+    Returns:
+        tuple - (thresholds, level_starts, next_level_exps, step) where
+        index i of the last three describes level i + 1
+    """
+    thresholds = tuple(table)
+    n = len(thresholds)
+    starts = tuple(0 if level == 1 else thresholds[level - 1] for level in range(1, n + 1))
+    nexts = tuple(
+        thresholds[level] if level < n else thresholds[-1] + step for level in range(1, n + 1)
+    )
+    return thresholds, starts, nexts, step
+
+
+_LEVEL_INDEX = build_level_index()
+
+
+def level_progress(total_exp, index=_LEVEL_INDEX):
+    """
+    Level, level-start EXP and next-level EXP for total_exp in one lookup.
+
+    Same results as calc_level / get_current_level_exp / get_next_level_exp,
+    in O(log n) over the table and O(1) beyond it.
+
+    Args:
+        total_exp: int - total EXP
+        index: tuple - from build_level_index() (default: EXP_TABLE)
+
+    Returns:
+        tuple - (level, current_level_exp, next_level_exp)
+    """
+    thresholds, starts, nexts, step = index
+    n = len(thresholds)
+    last = thresholds[-1]
+    if total_exp < last:
+        level = bisect.bisect_right(thresholds, total_exp) or 1
+        return level, starts[level - 1], nexts[level - 1]
+
+    # Extrapolate beyond table
+    level = n + int((total_exp - last) // step)
+    if level == n:
+        return level, starts[-1], nexts[-1]
+    # Matches get_current_level_exp: past the table a level's start is
+    # reported one step below the EXP at which calc_level reaches it
+    return level, last + (level - 1 - n) * step, last + (level - n + 1) * step
 
 
 def calc_level(total_exp):
@@ -239,18 +374,7 @@ def calc_level(total_exp):
     Returns:
         int - current level (1+)
     """
-    level = 1
-    for i, threshold in enumerate(EXP_TABLE):
-        if total_exp >= threshold:
-            level = i + 1
-        else:
-            break
-    # Extrapolate beyond table
-    if total_exp >= EXP_TABLE[-1]:
-        extra = total_exp - EXP_TABLE[-1]
-        extra_levels = extra // EXP_EXTRAPOLATION_STEP
-        level = len(EXP_TABLE) + int(extra_levels)
-    return level
+    return level_progress(total_exp)[0]
 
 
 def get_next_level_exp(level):
@@ -311,8 +435,6 @@ def update_visits(visit_log, current_status, now_dt):
     Returns:
         dict - updated visit_log
     """
-    from datetime import datetime
-
     today_str = now_dt.strftime("%Y-%m-%d")
     prev_status = visit_log.get("previous_status", "offline")
     last_visit_date = visit_log.get("last_visit_date")
@@ -351,6 +473,207 @@ def update_visits(visit_log, current_status, now_dt):
     return visit_log
 
 
+def new_visit_state():
+    """Visit state before any event (all counters zero, offline)."""
+    return {
+        "total_visits": 0,
+        "online_seconds": 0.0,
+        "streak": 0,
+        "last_visit_ts": None,
+        "last_visit_day": None,
+        "day": None,
+        "today_visits": 0,
+        "today_online_seconds": 0.0,
+        "status": "offline",
+        "last_ts": None,
+    }
+
+
+def _day_number(ts):
+    """Local day index (days since 1970-01-01 at VISIT_DAY_OFFSET_SEC) of epoch seconds."""
+    return visit_day(ts)
+
+
+def visit_day(ts, day_offset=VISIT_DAY_OFFSET_SEC, ops=SCALAR_OPS):
+    """Local day index of epoch seconds `ts` (days start at UTC midnight - day_offset)."""
+    return ops.trunc((ts + day_offset) // 86400)
+
+
+def online_credit(gap, ts, day, max_gap=VISIT_MAX_GAP_SEC, day_offset=VISIT_DAY_OFFSET_SEC,
+                  ops=SCALAR_OPS):
+    """
+    Online seconds credited for `gap` seconds online that end at `ts` on
+    local `day`: (total credit capped at max_gap, part of it since midnight).
+    """
+    gap = ops.minimum(gap, max_gap)
+    return gap, ops.minimum(gap, ts + day_offset - day * 86400)
+
+
+def streak_on_new_day(streak, last_visit_day, day):
+    """Streak carried into `day`: reset to 0 if a day without a visit was skipped."""
+    if last_visit_day is not None and day - last_visit_day > 1:
+        return 0
+    return streak
+
+
+def replay_visits(events, state=None, max_gap=VISIT_MAX_GAP_SEC,
+                  day_offset=VISIT_DAY_OFFSET_SEC, observe=None):
+    """
+    Fold status observations into a visit state. Mutates and returns state.
+
+    Online time is the real time between an "online" observation and the
+    next one, capped at `max_gap` so collector downtime is not counted.
+    A visit is a transition to "online"; the streak counts consecutive days
+    with at least one visit.
+
+    Args:
+        events: iterable of (epoch seconds, status), oldest first
+        state: dict or None - state to continue from (new_visit_state())
+        max_gap: float - most seconds credited between two observations
+        day_offset: int - seconds added to UTC for local day boundaries
+        observe: callable or None - called after each event with
+            (total_visits, online_seconds, streak, today_visits,
+            today_online_seconds), e.g. list.append to keep every step
+
+    Returns:
+        dict - visit state
+    """
+    if state is None:
+        state = new_visit_state()
+    total_visits = state["total_visits"]
+    online = state["online_seconds"]
+    streak = state["streak"]
+    last_visit_ts = state["last_visit_ts"]
+    last_visit_day = state["last_visit_day"]
+    cur_day = state["day"]
+    today_visits = state["today_visits"]
+    today_online = state["today_online_seconds"]
+    prev = state["status"]
+    last_ts = state["last_ts"]
+
+    # One tight loop over locals: a year of 1-minute samples is ~0.5M events.
+    # visit_day() runs only when ts leaves the [day_start, day_end) it returned last.
+    day = cur_day
+    day_start = day_end = 0
+    for ts, status in events:
+        if not day_start <= ts < day_end:
+            day = visit_day(ts, day_offset)
+            day_start = day * 86400 - day_offset
+            day_end = day_start + 86400
+        if day != cur_day:
+            today_visits = 0
+            today_online = 0.0
+            streak = streak_on_new_day(streak, last_visit_day, day)
+            cur_day = day
+
+        if prev == "online" and last_ts is not None and ts > last_ts:
+            gap, today_gap = online_credit(ts - last_ts, ts, day, max_gap, day_offset)
+            online += gap
+            today_online += today_gap
+
+        if status == "online" and prev != "online":
+            total_visits += 1
+            today_visits += 1
+            last_visit_ts = ts
+            if last_visit_day != day:
+                streak += 1
+                last_visit_day = day
+
+        prev = status
+        last_ts = ts
+        if observe is not None:
+            observe((total_visits, online, streak, today_visits, today_online))
+
+    state.update(
+        total_visits=total_visits,
+        online_seconds=online,
+        streak=streak,
+        last_visit_ts=last_visit_ts,
+        last_visit_day=last_visit_day,
+        day=cur_day,
+        today_visits=today_visits,
+        today_online_seconds=today_online,
+        status=prev,
+        last_ts=last_ts,
+    )
+    return state
+
+
+def visit_log_from_state(state, now_dt):
+    """
+    The visit_log.json view of a visit state as of now_dt.
+
+    Daily counters and the streak are reported as 0 once their day has
+    passed, even if no event was recorded since.
+    """
+    today = _day_number(now_dt.timestamp())
+    is_today = state["day"] == today
+    streak = state["streak"]
+    if state["last_visit_day"] is not None and today - state["last_visit_day"] > 1:
+        streak = 0
+
+    last_visit = None
+    if state["last_visit_ts"] is not None:
+        last_visit = datetime.fromtimestamp(
+            state["last_visit_ts"], tz=now_dt.tzinfo
+        ).isoformat(timespec="seconds")
+    last_visit_date = None
+    if state["last_visit_day"] is not None:
+        last_visit_date = (date(1970, 1, 1) + timedelta(days=state["last_visit_day"])).isoformat()
+
+    return {
+        "total_visits": state["total_visits"],
+        "total_time_minutes": int(state["online_seconds"] // 60),
+        "streak": streak,
+        "last_visit": last_visit,
+        "last_visit_date": last_visit_date,
+        "today_visits": state["today_visits"] if is_today else 0,
+        "today_time_minutes": int(state["today_online_seconds"] // 60) if is_today else 0,
+        "previous_status": state["status"],
+    }
+
+
+def state_from_visit_log(visit_log):
+    """
+    Visit state equivalent to a legacy visit_log.json (for migration).
+
+    The legacy log has no observation time, so time is credited again from
+    the first event after the migration.
+    """
+    state = new_visit_state()
+    last_visit_day = None
+    try:
+        last_visit_day = (
+            date.fromisoformat(visit_log["last_visit_date"]) - date(1970, 1, 1)
+        ).days
+    except (KeyError, TypeError, ValueError):
+        pass
+    last_visit_ts = None
+    try:
+        last_visit_ts = datetime.fromisoformat(visit_log["last_visit"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        pass
+
+    state.update(
+        total_visits=visit_log.get("total_visits", 0),
+        online_seconds=float(visit_log.get("total_time_minutes", 0) * 60),
+        streak=visit_log.get("streak", 0),
+        last_visit_ts=last_visit_ts,
+        last_visit_day=last_visit_day,
+        day=last_visit_day,
+        today_visits=visit_log.get("today_visits", 0),
+        today_online_seconds=float(visit_log.get("today_time_minutes", 0) * 60),
+        status=visit_log.get("previous_status", "offline"),
+    )
+    return state
+
+
+def _current_status(status_data):
+    if status_data:
+        return status_data.get("status", "offline")
+    return "offline"
+
+
 def evaluate(health_data, status_data, skills_data, visit_log, now_dt):
     """
     Full nurture evaluation. Produces nurture dict and updated visit log.
@@ -365,14 +688,30 @@ def evaluate(health_data, status_data, skills_data, visit_log, now_dt):
     Returns:
         tuple - (nurture_dict, updated_visit_log)
     """
-    # Get current status for visit detection
-    current_status = "offline"
-    if status_data:
-        current_status = status_data.get("status", "offline")
-
     # Update visit log
-    visit_log = update_visits(visit_log, current_status, now_dt)
+    visit_log = update_visits(visit_log, _current_status(status_data), now_dt)
+    return _build_nurture(health_data, status_data, skills_data, visit_log, now_dt), visit_log
+
+
+def evaluate_visits(health_data, status_data, skills_data, visit_state, now_dt):
+    """
+    Nurture evaluation from a replayed visit state (see replay_visits).
+
+    Args:
+        health_data, status_data, skills_data: as for evaluate()
+        visit_state: dict - visit state including the observation at now_dt
+        now_dt: datetime (timezone-aware, JST)
+
+    Returns:
+        tuple - (nurture_dict, visit_log) where visit_log is the
+        visit_log.json view of visit_state
+    """
+    visit_log = visit_log_from_state(visit_state, now_dt)
+    return _build_nurture(health_data, status_data, skills_data, visit_log, now_dt), visit_log
+
 
+def _build_nurture(health_data, status_data, skills_data, visit_log, now_dt):
+    """Compute the nurture dict from inputs and an up-to-date visit log."""
     # Extract inputs
     overall_score = None
     if health_data:
@@ -415,15 +754,13 @@ def evaluate(health_data, status_data, skills_data, visit_log, now_dt):
         visit_log.get("today_time_minutes", 0),
     )
     total_exp = calc_exp(visit_log, health_val, skill_count)
-    level = calc_level(total_exp)
+    level, current_level_exp, next_level_exp = level_progress(total_exp)
     day = calc_day(now_dt)
 
     mood_class = classify_mood(mood_val)
     energy_class = classify_energy(energy_val)
 
     # EXP progress within current level
-    current_level_exp = get_current_level_exp(level)
-    next_level_exp = get_next_level_exp(level)
     exp_in_level = total_exp - current_level_exp
 
     nurture = {
@@ -449,4 +786,4 @@ def evaluate(health_data, status_data, skills_data, visit_log, now_dt):
         "day": day,
     }
 
-    return nurture, visit_log
+    return nurture
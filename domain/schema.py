@@ -4,8 +4,11 @@ domain/schema.py - Schema versioning, staleness, validation, and atomic write.
 Shared utilities for JSON output across all collectors.
 """
 
+import hashlib
 import json
 import os
+import time
+from collections import namedtuple
 from datetime import datetime
 
 from domain import __version__ as SCHEMA_VERSION
@@ -62,24 +65,105 @@ def validate_status(data):
     return [f for f in required if f not in data]
 
 
-def write_json_atomic(data, output_path):
+# Top-level fields that change on every run without the data changing
+VOLATILE_FIELDS = ("timestamp", "staleness")
+
+# An unchanged file is still rewritten once it is this old, so its
+# timestamp/staleness never claim "fresh" for a collector that has stopped
+UNCHANGED_MAX_AGE_SEC = STALENESS_FRESH_MAX_MIN * 60 // 2
+
+# written: bool, bytes: size of the serialized payload (written or skipped)
+WriteResult = namedtuple("WriteResult", ["written", "bytes"])
+
+# Cumulative counters for instrumentation (per process)
+WRITE_STATS = {"written": 0, "skipped": 0, "bytes_written": 0, "bytes_skipped": 0}
+
+# path -> (st_mtime_ns, st_size, content digest) of files written or read here
+_digest_cache = {}
+
+
+def content_digest(data, ignore=VOLATILE_FIELDS):
+    """
+    SHA-256 of data without the `ignore` top-level fields, independent of
+    key order and formatting.
+    """
+    if isinstance(data, dict) and ignore:
+        data = {k: v for k, v in data.items() if k not in ignore}
+    canonical = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _existing_digest(output_path, ignore, max_age):
+    """Digest of the file at output_path, or None if missing, unreadable or too old."""
+    try:
+        st = os.stat(output_path)
+    except OSError:
+        return None
+    if max_age is not None and time.time() - st.st_mtime >= max_age:
+        return None
+    cached = _digest_cache.get(output_path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    try:
+        with open(output_path, encoding="utf-8") as f:
+            digest = content_digest(json.load(f), ignore)
+    except (OSError, ValueError):
+        return None
+    _digest_cache[output_path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def write_json_atomic(
+    data,
+    output_path,
+    *,
+    skip_unchanged=False,
+    ignore=VOLATILE_FIELDS,
+    max_age=UNCHANGED_MAX_AGE_SEC,
+    compact=False,
+    fsync=False,
+):
     """
     Write JSON data atomically: write to .tmp, then os.rename().
 
     Args:
         data: dict to serialize
         output_path: str or Path - final output path
+        skip_unchanged: bool - leave the file alone when it already holds the
+            same content apart from the `ignore` fields, unless it is older
+            than `max_age` seconds (None: never refresh)
+        compact: bool - no indentation or spaces (smaller, for state files)
+        fsync: bool - flush file and directory to disk before returning
+
+    Returns:
+        WriteResult(written, bytes)
     """
     output_path = str(output_path)
     output_dir = os.path.dirname(output_path)
     tmp_path = output_path + ".tmp"
 
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2) + "\n"
+    payload = text.encode("utf-8")
+
+    digest = None
+    if skip_unchanged:
+        digest = content_digest(data, ignore)
+        if _existing_digest(output_path, ignore, max_age) == digest:
+            WRITE_STATS["skipped"] += 1
+            WRITE_STATS["bytes_skipped"] += len(payload)
+            return WriteResult(False, len(payload))
+
     os.makedirs(output_dir, exist_ok=True)
 
     try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.write("\n")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
         os.rename(tmp_path, output_path)
     except Exception:
         try:
@@ -87,3 +171,27 @@ def write_json_atomic(data, output_path):
         except OSError:
             pass
         raise
+
+    if fsync:
+        _fsync_dir(output_dir)
+    if digest is not None:
+        st = os.stat(output_path)
+        _digest_cache[output_path] = (st.st_mtime_ns, st.st_size, digest)
+
+    WRITE_STATS["written"] += 1
+    WRITE_STATS["bytes_written"] += len(payload)
+    return WriteResult(True, len(payload))
+
+
+def _fsync_dir(path):
+    """Persist a rename (no-op where directories cannot be opened, e.g. Windows)."""
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,177 @@
+"""
+domain/visits.py — Event-sourced visit log.
+
+Presence observations are stored as an append-only event log (status
+transitions, plus a heartbeat event while the status stays the same).
+The visit state is the fold of that log (domain.nurture.replay_visits);
+snapshots of the fold are stored every VISIT_SNAPSHOT_EVERY events, so
+the current state is the latest snapshot plus a short tail. Snapshots
+hold raw counters only: trust, intimacy and EXP are derived from them at
+evaluation time, and rebuild() replays the whole log when the fold rules
+themselves change.
+
+Uses Python 3 standard library only (sqlite3).
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterator, Optional
+
+from domain.constants import VISIT_HEARTBEAT_SEC, VISIT_MAX_GAP_SEC, VISIT_SNAPSHOT_EVERY
+from domain.nurture import new_visit_state, replay_visits
+
+# ─── Schema ──────────────────────────────────────────────────────────────────
+
+_CREATE_TABLES_SQL = """\
+CREATE TABLE IF NOT EXISTS visit_events (
+    id     INTEGER PRIMARY KEY,
+    ts     REAL NOT NULL,
+    status TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS visit_snapshots (
+    event_id INTEGER PRIMARY KEY,
+    state    TEXT NOT NULL
+);
+"""
+
+# Snapshot at event_id 0 is the base state (e.g. migrated from visit_log.json);
+# rebuild() replays from it and never deletes it.
+BASE_EVENT_ID = 0
+
+# ─── DB Initialization ───────────────────────────────────────────────────────
+
+
+def init_db(db_path: str | Path) -> sqlite3.Connection:
+    """Open (and create if needed) the visit database. Returns an open connection."""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_CREATE_TABLES_SQL)
+    return conn
+
+
+def is_empty(conn: sqlite3.Connection) -> bool:
+    """True if the store has neither events nor snapshots."""
+    return (
+        conn.execute("SELECT 1 FROM visit_events LIMIT 1").fetchone() is None
+        and conn.execute("SELECT 1 FROM visit_snapshots LIMIT 1").fetchone() is None
+    )
+
+
+def seed(conn: sqlite3.Connection, state: dict) -> None:
+    """Store `state` as the base snapshot of an empty store."""
+    if not is_empty(conn):
+        raise ValueError("visit store already has data")
+    with conn:
+        save_snapshot(conn, BASE_EVENT_ID, state)
+
+
+# ─── Events ──────────────────────────────────────────────────────────────────
+
+
+def append_event(conn: sqlite3.Connection, ts: float, status: str) -> int:
+    """Append one observation (caller commits). Returns its event id."""
+    cursor = conn.execute("INSERT INTO visit_events (ts, status) VALUES (?, ?)", (ts, status))
+    return cursor.lastrowid
+
+
+def iter_events(conn: sqlite3.Connection, after_id: int = BASE_EVENT_ID) -> Iterator[tuple]:
+    """Yield (id, ts, status) of events after `after_id`, oldest first."""
+    yield from conn.execute(
+        "SELECT id, ts, status FROM visit_events WHERE id > ? ORDER BY id", (after_id,)
+    )
+
+
+def count_events(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COUNT(*) FROM visit_events").fetchone()[0]
+
+
+# ─── Snapshots ───────────────────────────────────────────────────────────────
+
+
+def latest_snapshot(conn: sqlite3.Connection) -> tuple[int, Optional[dict]]:
+    """(event id, state) of the newest snapshot, or (BASE_EVENT_ID, None)."""
+    row = conn.execute(
+        "SELECT event_id, state FROM visit_snapshots ORDER BY event_id DESC LIMIT 1"
+    ).fetchone()
+    if row is None:
+        return BASE_EVENT_ID, None
+    return row["event_id"], json.loads(row["state"])
+
+
+def save_snapshot(conn: sqlite3.Connection, event_id: int, state: dict) -> None:
+    """Store the state after event `event_id` (caller commits)."""
+    conn.execute(
+        "INSERT OR REPLACE INTO visit_snapshots (event_id, state) VALUES (?, ?)",
+        (event_id, json.dumps(state)),
+    )
+
+
+# ─── State ───────────────────────────────────────────────────────────────────
+
+
+def _replay(conn, after_id, state, max_gap):
+    """Fold events after `after_id` into state. Returns (last event id, events, state)."""
+    ids = []
+
+    def events():
+        for event_id, ts, status in iter_events(conn, after_id):
+            ids.append(event_id)
+            yield ts, status
+
+    state = replay_visits(events(), state, max_gap)
+    return (ids[-1] if ids else after_id), len(ids), state
+
+
+def current_state(conn: sqlite3.Connection) -> tuple[int, dict]:
+    """
+    (last event id, state) from the latest snapshot plus the events after it.
+    Stores a new snapshot once the tail reaches VISIT_SNAPSHOT_EVERY events.
+    """
+    snapshot_id, state = latest_snapshot(conn)
+    last_id, replayed, state = _replay(conn, snapshot_id, state, VISIT_MAX_GAP_SEC)
+    if replayed >= VISIT_SNAPSHOT_EVERY:
+        with conn:
+            save_snapshot(conn, last_id, state)
+    return last_id, state
+
+
+def record(conn: sqlite3.Connection, ts: float, status: str) -> dict:
+    """
+    Record an observation and return the visit state including it.
+
+    The event is stored when the status changed or the last stored event is
+    VISIT_HEARTBEAT_SEC old; otherwise it is only folded into the returned
+    state (the next stored event credits the same time, since
+    VISIT_HEARTBEAT_SEC < VISIT_MAX_GAP_SEC).
+    """
+    _, state = current_state(conn)
+    last_ts = state["last_ts"]
+    if last_ts is None or status != state["status"] or ts - last_ts >= VISIT_HEARTBEAT_SEC:
+        with conn:
+            append_event(conn, ts, status)
+    return replay_visits([(ts, status)], state)
+
+
+def replay_all(conn: sqlite3.Connection, max_gap: float = VISIT_MAX_GAP_SEC) -> dict:
+    """Replay the whole log from the base snapshot, without touching snapshots."""
+    row = conn.execute(
+        "SELECT state FROM visit_snapshots WHERE event_id = ?", (BASE_EVENT_ID,)
+    ).fetchone()
+    state = json.loads(row["state"]) if row else new_visit_state()
+    return _replay(conn, BASE_EVENT_ID, state, max_gap)[2]
+
+
+def rebuild(conn: sqlite3.Connection) -> dict:
+    """Drop derived snapshots and replay the whole log. Returns the current state."""
+    state = replay_all(conn)
+    with conn:
+        conn.execute("DELETE FROM visit_snapshots WHERE event_id > ?", (BASE_EVENT_ID,))
+        last = conn.execute("SELECT MAX(id) FROM visit_events").fetchone()[0]
+        if last is not None:
+            save_snapshot(conn, last, state)
+    return state
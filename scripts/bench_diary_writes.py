@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+bench_diary_writes.py — Diary DB rebuild write benchmark.
+
+Creates N synthetic daily notes in a temp directory and times a full
+`--rebuild` (translation skipped) with per-call commits versus batched
+transactions.
+
+Usage:
+    python scripts/bench_diary_writes.py [--dates N] [--batch B]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from domain.diary import init_db  # noqa: E402
+from scripts.update_diary import DEFAULT_WRITE_BATCH, generate_site_with_db  # noqa: E402
+
+TEMPLATE = "<html><body>\n<!-- DIARY_CARDS_PLACEHOLDER -->\n<!-- DIARY_ENTRIES_PLACEHOLDER -->\n</body></html>\n"
+
+
+def _make_sources(root: Path, count: int) -> dict:
+    memory_dir = root / "memory"
+    obsidian_dir = root / "obsidian"
+    memory_dir.mkdir()
+    obsidian_dir.mkdir()
+    start = date(2020, 1, 1)
+    for n in range(count):
+        d = (start + timedelta(days=n)).isoformat()
+        (memory_dir / f"{d}.md").write_text(
+            f"# {d}\n\n## Log\n- worked on **task {n}**\n- reviewed `module_{n % 7}`\n",
+            encoding="utf-8",
+        )
+    template = root / "template.html"
+    template.write_text(TEMPLATE, encoding="utf-8")
+    return {
+        "memory_dir": memory_dir,
+        "obsidian_dir": obsidian_dir,
+        "template_html": template,
+        "index_html": root / "diary.html",
+    }
+
+
+def time_rebuild(count: int, write_batch: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        config = _make_sources(root, count)
+        conn = init_db(root / "diary.db")
+        try:
+            start = time.perf_counter()
+            generate_site_with_db(
+                config, conn, rebuild=True, skip_translation=True, write_batch=write_batch,
+            )
+            return time.perf_counter() - start
+        finally:
+            conn.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark diary rebuild DB writes.")
+    parser.add_argument("--dates", type=int, default=3000, help="Synthetic dates (default: 3000)")
+    parser.add_argument(
+        "--batch", type=int, default=DEFAULT_WRITE_BATCH,
+        help=f"Dates per transaction for the batched run (default: {DEFAULT_WRITE_BATCH})",
+    )
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    serial = time_rebuild(args.dates, write_batch=1)
+    batched = time_rebuild(args.dates, write_batch=args.batch)
+    print(f"rebuild of {args.dates} dates")
+    print(f"  1 date per transaction:    {serial:.2f} s")
+    print(f"  {args.batch} dates per transaction: {batched:.2f} s  ({serial / batched:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+bench_health_eval.py — domain.health.evaluate throughput benchmark.
+
+Scores N random metric samples with the compiled classifiers
+(domain/classifier.py) and with the previous implementation, which
+scanned each (threshold, state) list and merged a new label dict per
+call. The previous classify_* functions are swapped into domain.health
+for the "before" run, so both runs go through the same evaluate().
+Also times evaluate_many() on the same samples as columns.
+
+Usage:
+    python scripts/bench_health_eval.py [--samples N] [--seed S] [--repeat R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from domain import constants, health  # noqa: E402
+
+
+def _scan(value, thresholds):
+    for upper_bound, state in thresholds:
+        if upper_bound is None or value < upper_bound:
+            return state
+    return thresholds[-1][1]
+
+
+def _legacy(thresholds, labels, scale=1.0):
+    def classify(value):
+        if value is None:
+            return None
+        state = _scan(value / scale, thresholds)
+        return {"state": state, **labels[state]}
+    return classify
+
+
+def _legacy_overall(cpu_pct, mem_pct, disk_pct, temp_c, uptime_sec):
+    cpu_penalty = max(0, cpu_pct - constants.PENALTY_CPU_OFFSET) * constants.PENALTY_CPU_WEIGHT
+    memory_penalty = max(0, mem_pct - constants.PENALTY_MEMORY_OFFSET) * constants.PENALTY_MEMORY_WEIGHT
+    disk_penalty = max(0, disk_pct - constants.PENALTY_DISK_OFFSET) * constants.PENALTY_DISK_WEIGHT
+    temp_penalty = (max(0, temp_c - constants.PENALTY_TEMP_OFFSET) * constants.PENALTY_TEMP_WEIGHT
+                    if temp_c is not None else 0)
+    uptime_penalty = min(uptime_sec / 86400.0 * constants.PENALTY_UPTIME_PER_DAY,
+                         constants.PENALTY_UPTIME_MAX)
+    total_penalty = cpu_penalty + memory_penalty + disk_penalty + temp_penalty + uptime_penalty
+    score = max(0, min(100, round(100 - total_penalty)))
+
+    for min_score, state, emoji, label, message in constants.OVERALL_SCORE_TABLE:
+        if score >= min_score:
+            return {"score": score, "state": state, "emoji": emoji, "label": label, "message": message}
+    last = constants.OVERALL_SCORE_TABLE[-1]
+    return {"score": score, "state": last[1], "emoji": last[2], "label": last[3], "message": last[4]}
+
+
+@contextmanager
+def legacy_classifiers():
+    """Swap the pre-compiled classify_* implementations into domain.health."""
+    with mock.patch.multiple(
+        health,
+        classify_cpu=_legacy(constants.CPU_THRESHOLDS, constants.CPU_LABELS),
+        classify_memory=_legacy(constants.MEMORY_THRESHOLDS, constants.MEMORY_LABELS),
+        classify_disk=_legacy(constants.DISK_THRESHOLDS, constants.DISK_LABELS),
+        classify_temperature=_legacy(constants.TEMPERATURE_THRESHOLDS, constants.TEMPERATURE_LABELS),
+        classify_uptime=_legacy(constants.UPTIME_THRESHOLDS_DAYS, constants.UPTIME_LABELS, 86400.0),
+        calculate_overall_score=_legacy_overall,
+    ):
+        yield
+
+
+def make_samples(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "cpu_usage": rng.uniform(0, 100),
+            "mem_usage": rng.uniform(20, 100),
+            "disk_usage": rng.uniform(10, 100),
+            "temperature": rng.uniform(30, 90) if rng.random() < 0.8 else None,
+            "uptime_seconds": rng.randint(0, 20 * 86400),
+        }
+        for _ in range(count)
+    ]
+
+
+def _time(samples: list[dict]) -> float:
+    start = time.perf_counter()
+    for raw in samples:
+        health.evaluate(raw)
+    return time.perf_counter() - start
+
+
+def _time_columns(samples: list[dict]) -> float:
+    keys = ("cpu_usage", "mem_usage", "disk_usage", "temperature", "uptime_seconds")
+    columns = [[raw[key] for raw in samples] for key in keys]
+    start = time.perf_counter()
+    health.evaluate_many(*columns, seed=0)
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark domain.health.evaluate throughput.")
+    parser.add_argument("--samples", type=int, default=200000, help="Metric samples (default: 200000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant, best kept (default: 3)")
+    args = parser.parse_args(argv)
+
+    samples = make_samples(args.samples, args.seed)
+    before = after = float("inf")
+    for _ in range(args.repeat):  # interleaved, best of N
+        with legacy_classifiers():
+            before = min(before, _time(samples))
+        after = min(after, _time(samples))
+    columnar = min(_time_columns(samples) for _ in range(args.repeat))
+
+    print(f"domain.health.evaluate over {args.samples} samples")
+    for name, seconds in (("linear scan + dict merge", before), ("compiled classifiers", after),
+                          ("evaluate_many (columnar)", columnar)):
+        print(f"  {name:<26} {seconds:6.2f} s  {args.samples / seconds:>10,.0f} evals/s"
+              f"  ({before / seconds:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
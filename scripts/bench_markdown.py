@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+bench_markdown.py — MarkdownConverter throughput benchmark.
+
+Builds a large synthetic diary (headings, lists, tables, inline markup
+and plain prose in roughly the proportions of real daily notes) and
+reports conversion throughput in MB/s.
+
+Usage:
+    python scripts/bench_markdown.py [--entries N] [--repeat R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from scripts.update_diary import MarkdownConverter  # noqa: E402
+
+_WORDS = (
+    "gateway memory session heartbeat obsidian cron deploy review "
+    "レベッカ 日記 今日 作業 確認 完了"
+).split()
+
+
+def _sentence(rng: random.Random, *, markup: bool) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(6, 16))]
+    if markup:
+        k = rng.randrange(len(words))
+        words[k] = rng.choice(
+            [f"**{words[k]}**", f"*{words[k]}*", f"`{words[k]}`", f"[{words[k]}](https://example.com/{k})"]
+        )
+    return " ".join(words)
+
+
+def synthetic_diary(entries: int, *, seed: int = 0) -> str:
+    """Return a Markdown document made of *entries* daily sections."""
+    rng = random.Random(seed)
+    lines: list[str] = ["# Diary"]
+    for n in range(entries):
+        lines.append(f"## Day {n}")
+        lines.append("")
+        for _ in range(rng.randint(2, 5)):
+            lines.append(_sentence(rng, markup=rng.random() < 0.3))
+        lines.append("")
+        lines.append("### Tasks")
+        for _ in range(rng.randint(3, 8)):
+            lines.append("- " + _sentence(rng, markup=rng.random() < 0.3))
+        for k in range(rng.randint(0, 3)):
+            lines.append(f"{k + 1}. " + _sentence(rng, markup=False))
+        if rng.random() < 0.3:
+            lines.append("| item | status |")
+            lines.append("|------|--------|")
+            for _ in range(rng.randint(1, 4)):
+                lines.append(f"| {rng.choice(_WORDS)} | **{rng.choice(_WORDS)}** |")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def run(entries: int, repeat: int) -> float:
+    text = synthetic_diary(entries)
+    size_mb = len(text.encode("utf-8")) / 1e6
+    converter = MarkdownConverter()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.convert(text)
+        best = min(best, time.perf_counter() - start)
+    throughput = size_mb / best
+    print(f"input: {size_mb:.2f} MB ({entries} entries)")
+    print(f"best of {repeat}: {best * 1000:.1f} ms  ->  {throughput:.1f} MB/s")
+    return throughput
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MarkdownConverter throughput.")
+    parser.add_argument("--entries", type=int, default=2000, help="Synthetic daily sections (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs; best is reported (default: 5)")
+    args = parser.parse_args(argv)
+    run(args.entries, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
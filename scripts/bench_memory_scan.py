@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+bench_memory_scan.py — Memory-directory last-activity scan benchmark.
+
+Creates N synthetic daily notes in a temp directory and times finding the
+most recently modified one three ways: the old glob + stat-in-max scan, a
+single os.scandir pass, and the cached get_last_activity() path used while
+the directory is unchanged.
+
+Usage:
+    python scripts/bench_memory_scan.py [--files N] [--repeat R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from collectors.collect_status import get_last_activity, scan_memory_dir  # noqa: E402
+
+
+def _make_notes(directory: Path, count: int) -> None:
+    for n in range(count):
+        path = directory / f"note-{n:06d}.md"
+        path.write_text(f"- entry {n}\n", encoding="utf-8")
+        os.utime(path, (1_600_000_000 + n, 1_600_000_000 + n))
+
+
+def glob_scan(directory: Path) -> Path:
+    """The previous implementation: glob, stat inside max(), stat the winner again."""
+    md_files = list(directory.glob("*.md"))
+    latest = max(md_files, key=lambda f: f.stat().st_mtime)
+    latest.stat()
+    return latest
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the memory-directory scan.")
+    parser.add_argument("--files", type=int, default=10000, help="Synthetic notes (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per method (default: 20)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        notes = root / "memory"
+        notes.mkdir()
+        _make_notes(notes, args.files)
+        state = root / "scan-state.json"
+        get_last_activity(notes, state)  # prime the cache
+
+        results = [
+            ("glob + stat in max()", _time(lambda: glob_scan(notes), args.repeat)),
+            ("os.scandir pass", _time(lambda: scan_memory_dir(notes), args.repeat)),
+            ("cached (dir unchanged)", _time(lambda: get_last_activity(notes, state), args.repeat)),
+        ]
+
+    baseline = results[0][1]
+    print(f"last-activity scan over {args.files} notes")
+    for name, seconds in results:
+        print(f"  {name:<24} {seconds * 1000:8.2f} ms  ({baseline / seconds:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+simulate_nurture.py — What-if simulator for nurture parameter tuning.
+
+Computes mood, energy, trust, intimacy, EXP and level for every step of a
+health/presence input series in one batch, with any of the nurture
+constants in domain/constants.py overridden. Each step is evaluated as
+collect_nurture would evaluate it if it ran at that moment (visit state
+replayed through the step, see domain.nurture.replay_visits).
+
+Uses NumPy arrays when NumPy is installed; otherwise the same model runs
+as a single pure-Python pass. Inputs are either a synthetic scenario
+(daily evening visits, noisy health score, weekly reboots) or your own
+columns passed to simulate().
+
+Usage:
+    python scripts/simulate_nurture.py                       # 1 year, 1-minute steps
+    python scripts/simulate_nurture.py --days 90 --step 300 --seed 7
+    python scripts/simulate_nurture.py --set TRUST_LOG_COEFFICIENT=30 \\
+        --set 'MOOD_WEIGHTS={"health": 0.5}' --csv /tmp/nurture.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import csv
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from domain import constants  # noqa: E402
+from domain import nurture  # noqa: E402
+from domain.classifier import ThresholdClassifier  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback
+    np = None
+
+# Element-wise operations for the domain.nurture *_formula functions over
+# NumPy columns (the scalar set is domain.nurture.SCALAR_OPS)
+if np is not None:
+    NUMPY_OPS = SimpleNamespace(
+        minimum=np.minimum,
+        maximum=np.maximum,
+        clip=np.clip,
+        trunc=lambda a: np.trunc(a).astype(np.int64),
+        log10=np.log10,
+        where=np.where,
+        bisect_right=lambda table, x: np.searchsorted(table, x, side="right"),
+    )
+else:
+    NUMPY_OPS = None
+
+# Constants the model reads; any of them can be overridden per run
+PARAM_NAMES = (
+    "ENERGY_BASE",
+    "ENERGY_UPTIME_THRESHOLD_HOURS",
+    "ENERGY_UPTIME_PENALTY_PER_HOUR",
+    "ENERGY_UPTIME_PENALTY_MAX",
+    "ENERGY_TIME_WEIGHTS",
+    "ENERGY_THRESHOLDS",
+    "MOOD_WEIGHTS",
+    "MOOD_VISIT_NEUTRAL",
+    "MOOD_VISIT_TODAY",
+    "MOOD_VISIT_STREAK_LONG",
+    "MOOD_VISIT_STREAK_MID",
+    "MOOD_TIME_FACTORS",
+    "MOOD_THRESHOLDS",
+    "TRUST_BASE",
+    "TRUST_LOG_COEFFICIENT",
+    "TRUST_MAX_FROM_VISITS",
+    "TRUST_STREAK_BONUS_PER_DAY",
+    "TRUST_STREAK_BONUS_MAX",
+    "INTIMACY_BASE",
+    "INTIMACY_LOG_COEFFICIENT",
+    "INTIMACY_MAX_FROM_HOURS",
+    "INTIMACY_TODAY_DIVISOR",
+    "INTIMACY_TODAY_BONUS_MAX",
+    "EXP_SOURCES",
+    "HEALTH_EXP_THRESHOLD",
+    "STREAK_EXP_CAP",
+    "EXP_TABLE",
+    "EXP_EXTRAPOLATION_STEP",
+    "TIME_PERIODS",
+    "VISIT_MAX_GAP_SEC",
+    "VISIT_DAY_OFFSET_SEC",
+)
+
+# Output columns, in CSV order
+COLUMNS = (
+    "ts", "online", "health", "energy", "mood", "trust", "intimacy",
+    "exp", "level", "total_visits", "streak",
+)
+
+MILESTONE_DAYS = (7, 30, 90, 180, 365)
+
+
+# ─── Parameters ──────────────────────────────────────────────────────────────
+
+
+def load_params(overrides: Optional[dict] = None) -> dict:
+    """
+    Current values of PARAM_NAMES with `overrides` applied. A dict override
+    of a dict constant (e.g. MOOD_WEIGHTS) only replaces the keys it has.
+    """
+    params = {name: getattr(constants, name) for name in PARAM_NAMES}
+    for name, value in (overrides or {}).items():
+        if name not in params:
+            raise ValueError(f"Unknown parameter: {name}")
+        if isinstance(params[name], dict) and isinstance(value, dict):
+            value = {**params[name], **value}
+        params[name] = value
+    return params
+
+
+def parse_override(text: str) -> tuple[str, object]:
+    """NAME=VALUE with VALUE as JSON (bare strings allowed)."""
+    name, sep, raw = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    return name.strip(), value
+
+
+def _period_table(params: dict) -> list[str]:
+    """Time period name for each local hour 0-23."""
+    table = ["night"] * 24
+    for start, end, name in params["TIME_PERIODS"]:
+        for hour in range(start, end):
+            table[hour] = name
+    return table
+
+
+def _hourly_time_mods(params: dict) -> tuple[list, list]:
+    """Energy time modifier and mood time factor for each local hour 0-23."""
+    periods = _period_table(params)
+    return ([nurture.energy_time_mod(name, params) for name in periods],
+            [nurture.mood_time_factor(name, params) for name in periods])
+
+
+# ─── Inputs ──────────────────────────────────────────────────────────────────
+
+
+def synthetic_inputs(
+    days: int = 365,
+    step: int = 60,
+    seed: int = 0,
+    *,
+    start: Optional[float] = None,
+    visit_prob: float = 0.8,
+    lunch_prob: float = 0.3,
+    health_mean: float = 85.0,
+    reboot_days: int = 7,
+    skill_count: int = 30,
+) -> dict:
+    """
+    A reproducible scenario: an evening visit (30-180 min, 19:00-23:00)
+    on `visit_prob` of the days, a lunch visit on `lunch_prob`, an hourly
+    health score around `health_mean` and a reboot every `reboot_days`.
+    """
+    rng = random.Random(seed)
+    start = constants.NURTURE_FIRST_DAY.timestamp() if start is None else start
+    n = days * 86400 // step
+    ts = [start + i * step for i in range(n)]
+
+    online = [False] * n
+    for day in range(days):
+        sessions = []
+        if rng.random() < visit_prob:
+            sessions.append((rng.uniform(19, 23) * 3600, rng.uniform(30, 180) * 60))
+        if rng.random() < lunch_prob:
+            sessions.append((rng.uniform(12, 13) * 3600, rng.uniform(10, 40) * 60))
+        for begin, length in sessions:
+            first = int((day * 86400 + begin) // step)
+            last = min(n, int((day * 86400 + begin + length) // step))
+            online[first:last] = [True] * (last - first)
+
+    hourly = [
+        max(0, min(100, int(rng.gauss(health_mean, 6))))
+        for _ in range(days * 24 + 1)
+    ]
+    health_score = [hourly[int((t - start) // 3600)] for t in ts]
+    reboot_every = reboot_days * 86400
+    uptime = [int((t - start) % reboot_every) + 600 for t in ts]
+
+    return {
+        "ts": ts,
+        "online": online,
+        "health_score": health_score,
+        "uptime_seconds": uptime,
+        "skill_count": skill_count,
+    }
+
+
+# ─── Pure-Python engine ──────────────────────────────────────────────────────
+
+
+def _simulate_python(inputs: dict, p: dict) -> dict:
+    """domain.nurture.replay_visits over the steps, then the nurture formulas per step."""
+    energy_mods, time_factors = _hourly_time_mods(p)
+    offset = p["VISIT_DAY_OFFSET_SEC"]
+    skill_count = inputs["skill_count"]
+
+    steps = []
+    nurture.replay_visits(
+        ((ts, "online" if on else "offline") for ts, on in zip(inputs["ts"], inputs["online"])),
+        max_gap=p["VISIT_MAX_GAP_SEC"], day_offset=offset, observe=steps.append,
+    )
+
+    out = {name: [] for name in COLUMNS}
+    appends = [out[name].append for name in COLUMNS]
+    for ts, on, score, uptime, (total_visits, online_sec, streak, today_visits, today_online) in zip(
+        inputs["ts"], inputs["online"], inputs["health_score"], inputs["uptime_seconds"], steps
+    ):
+        hour = int((ts + offset) % 86400) // 3600
+        total_minutes = int(online_sec // 60)
+        health = nurture.health_formula(score)
+        energy = nurture.energy_formula(uptime, energy_mods[hour], p)
+        mood = nurture.mood_formula(health, energy, today_visits, streak, time_factors[hour], p)
+        trust = nurture.trust_formula(total_visits, streak, p)
+        intimacy = nurture.intimacy_formula(total_minutes, int(today_online // 60), p)
+        exp = nurture.exp_formula(total_visits, total_minutes, streak, health, skill_count, p)
+        level = nurture.level_formula(exp, p)
+
+        for append, value in zip(appends, (
+            ts, on, health, energy, mood, trust, intimacy, exp, level, total_visits, streak,
+        )):
+            append(value)
+    return out
+
+
+# ─── NumPy engine ────────────────────────────────────────────────────────────
+
+
+def _visit_columns_numpy(ts, on, p):
+    """
+    domain.nurture.replay_visits as whole-column operations: the same
+    visit_day / online_credit / streak_on_new_day steps, with per-step
+    cumulative visit counters.
+    """
+    ops = NUMPY_OPS
+    n = len(ts)
+    offset = p["VISIT_DAY_OFFSET_SEC"]
+    prev_on = np.zeros(n, dtype=bool)
+    prev_on[1:] = on[:-1]
+
+    day = nurture.visit_day(ts, offset, ops)
+    elapsed = np.zeros(n)
+    elapsed[1:] = np.diff(ts)
+    elapsed = np.where(prev_on & (elapsed > 0), elapsed, 0.0)
+    credit, today_credit = nurture.online_credit(elapsed, ts, day, p["VISIT_MAX_GAP_SEC"], offset, ops)
+    online_sec = np.cumsum(credit)
+
+    new_day = np.ones(n, dtype=bool)
+    new_day[1:] = day[1:] != day[:-1]
+    starts = np.flatnonzero(new_day)
+    seg = np.cumsum(new_day) - 1
+
+    visit = on & ~prev_on
+    total_visits = np.cumsum(visit)
+    today_visits = total_visits - (total_visits - visit)[starts][seg]
+    tc = np.cumsum(today_credit)
+    today_online = tc - (tc - today_credit)[starts][seg]
+
+    # Streak: one sequential step per day (reset on a missed day, +1 on the first visit)
+    seg_days = day[starts]
+    visit_idx = np.flatnonzero(visit)
+    first_visit = np.full(len(starts), n)
+    if len(visit_idx):
+        vseg = seg[visit_idx]
+        firsts = np.ones(len(visit_idx), dtype=bool)
+        firsts[1:] = vseg[1:] != vseg[:-1]
+        first_visit[vseg[firsts]] = visit_idx[firsts]
+    before = np.zeros(len(starts), dtype=np.int64)
+    after = np.zeros(len(starts), dtype=np.int64)
+    streak, last_visit_day = 0, None
+    for k, d in enumerate(seg_days.tolist()):
+        streak = nurture.streak_on_new_day(streak, last_visit_day, d)
+        before[k] = streak
+        if first_visit[k] < n:
+            streak += 1
+            last_visit_day = d
+        after[k] = streak
+    idx = np.arange(n)
+    streak_col = np.where(idx >= first_visit[seg], after[seg], before[seg])
+
+    return total_visits, online_sec, today_visits, today_online, streak_col
+
+
+def _simulate_numpy(inputs: dict, p: dict) -> dict:
+    """Whole-column visit fold + domain.nurture formulas over NUMPY_OPS."""
+    ops = NUMPY_OPS
+    ts = np.asarray(inputs["ts"], dtype=float)
+    on = np.asarray(inputs["online"], dtype=bool)
+    score = np.asarray(inputs["health_score"], dtype=float)
+    uptime = np.asarray(inputs["uptime_seconds"], dtype=float)
+    offset = p["VISIT_DAY_OFFSET_SEC"]
+
+    total_visits, online_sec, today_visits, today_online, streak = _visit_columns_numpy(ts, on, p)
+
+    hour = (np.mod(ts + offset, 86400) // 3600).astype(np.int64)
+    energy_mods, time_factors = _hourly_time_mods(p)
+    total_minutes = (online_sec // 60).astype(np.int64)
+    today_minutes = (today_online // 60).astype(np.int64)
+
+    health = nurture.health_formula(score, ops)
+    energy = nurture.energy_formula(uptime, np.asarray(energy_mods)[hour], p, ops)
+    mood = nurture.mood_formula(health, energy, today_visits, streak,
+                                np.asarray(time_factors)[hour], p, ops)
+    trust = nurture.trust_formula(total_visits, streak, p, ops)
+    intimacy = nurture.intimacy_formula(total_minutes, today_minutes, p, ops)
+    exp = nurture.exp_formula(total_visits, total_minutes, streak, health,
+                              inputs["skill_count"], p, ops)
+    level = nurture.level_formula(exp, p, ops)
+
+    return {
+        "ts": ts, "online": on, "health": health, "energy": energy, "mood": mood,
+        "trust": trust, "intimacy": intimacy, "exp": exp, "level": level,
+        "total_visits": total_visits, "streak": streak,
+    }
+
+
+# ─── Simulation ──────────────────────────────────────────────────────────────
+
+
+def simulate(inputs: dict, params: Optional[dict] = None, use_numpy: Optional[bool] = None) -> dict:
+    """
+    Evaluate every step of `inputs` ({ts, online, health_score,
+    uptime_seconds} columns, oldest first, plus a scalar skill_count).
+
+    Returns {column: values} for COLUMNS (NumPy arrays or lists).
+    `use_numpy` defaults to whether NumPy is installed.
+    """
+    params = load_params() if params is None else params
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed")
+    return _simulate_numpy(inputs, params) if use_numpy else _simulate_python(inputs, params)
+
+
+def summarize(result: dict, params: Optional[dict] = None) -> dict:
+    """Per-metric min/mean/max/final, state shares and level milestones."""
+    params = load_params() if params is None else params
+    ts = [float(t) for t in result["ts"]]
+    out = {"steps": len(ts), "days": round((ts[-1] - ts[0]) / 86400, 1) if ts else 0}
+    for name in ("health", "energy", "mood", "trust", "intimacy", "exp", "level"):
+        values = [int(v) for v in result[name]]
+        out[name] = {
+            "min": min(values),
+            "mean": round(sum(values) / len(values), 1),
+            "max": max(values),
+            "final": values[-1],
+        }
+
+    for name, thresholds in (("mood", params["MOOD_THRESHOLDS"]),
+                             ("energy", params["ENERGY_THRESHOLDS"])):
+        classifier = ThresholdClassifier.lower_bounds(thresholds, {s: {} for _, s in thresholds})
+        counts: dict[str, int] = {}
+        for value in result[name]:
+            state = classifier.state(int(value))
+            counts[state] = counts.get(state, 0) + 1
+        out[f"{name}_states"] = {k: round(v / len(ts), 3) for k, v in counts.items()}
+
+    # Level at the end of each milestone day the series covers
+    levels = [int(v) for v in result["level"]]
+    step = ts[1] - ts[0] if len(ts) > 1 else 0
+    out["level_at_day"] = {}
+    for day in MILESTONE_DAYS:
+        end = ts[0] + day * 86400
+        if end <= ts[-1] + step:
+            out["level_at_day"][day] = levels[bisect.bisect_left(ts, end) - 1]
+    out["total_visits"] = int(result["total_visits"][-1])
+    return out
+
+
+def write_csv(result: dict, path, every: int = 1) -> int:
+    """Write every `every`-th step (and the last one) as CSV. Returns rows written."""
+    n = len(result["ts"])
+    rows = list(range(0, n, every))
+    if n and rows[-1] != n - 1:
+        rows.append(n - 1)
+    columns = [result[name] for name in COLUMNS]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in rows:
+            writer.writerow([
+                int(col[i]) if name != "ts" else float(col[i])
+                for name, col in zip(COLUMNS, columns)
+            ])
+    return len(rows)
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate nurture parameters over time.")
+    parser.add_argument("--days", type=int, default=365, help="Simulated days (default: 365)")
+    parser.add_argument("--step", type=int, default=60, help="Seconds per step (default: 60)")
+    parser.add_argument("--seed", type=int, default=0, help="Scenario seed (default: 0)")
+    parser.add_argument("--visit-prob", type=float, default=0.8,
+                        help="Share of days with an evening visit (default: 0.8)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[],
+                        type=parse_override, metavar="NAME=JSON",
+                        help="Override a constant from domain/constants.py (repeatable)")
+    parser.add_argument("--csv", type=Path, help="Write the per-step series to this CSV file")
+    parser.add_argument("--csv-every", type=int, default=60,
+                        help="Keep every Nth step in the CSV (default: 60)")
+    parser.add_argument("--pure-python", action="store_true", help="Do not use NumPy")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        params = load_params(dict(args.overrides))
+    except ValueError as e:
+        parser.error(str(e))
+
+    inputs = synthetic_inputs(args.days, args.step, args.seed, visit_prob=args.visit_prob)
+    start = time.perf_counter()
+    result = simulate(inputs, params, use_numpy=False if args.pure_python else None)
+    elapsed = time.perf_counter() - start
+    summary = summarize(result, params)
+
+    if args.csv:
+        rows = write_csv(result, args.csv, args.csv_every)
+        print(f"Wrote {rows} rows to {args.csv}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return 0
+
+    engine = "numpy" if np is not None and not args.pure_python else "pure python"
+    print(f"{summary['steps']} steps over {summary['days']} days in {elapsed:.2f} s ({engine})")
+    print(f"  {'':<10}{'min':>8}{'mean':>10}{'max':>8}{'final':>8}")
+    for name in ("health", "energy", "mood", "trust", "intimacy", "exp", "level"):
+        s = summary[name]
+        print(f"  {name:<10}{s['min']:>8}{s['mean']:>10}{s['max']:>8}{s['final']:>8}")
+    for name in ("mood_states", "energy_states"):
+        shares = ", ".join(f"{k} {v:.0%}" for k, v in sorted(summary[name].items(), key=lambda kv: -kv[1]))
+        print(f"  {name}: {shares}")
+    milestones = ", ".join(f"day {d}: Lv.{lv}" for d, lv in summary["level_at_day"].items())
+    print(f"  level: {milestones}")
+    print(f"  visits: {summary['total_visits']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
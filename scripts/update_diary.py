@@ -8,7 +8,11 @@ generates a full timeline HTML, and updates the website.
 Phase 3: SQLite-backed diary database for persistent storage.
 Default: process today only → save to DB → read all from DB → diary.html
 --rebuild: process all dates → save to DB → read all from DB → diary.html
+--incremental: process only dates whose source files changed → DB → diary.html
+DATE [DATE ...]: process the given dates only → DB → diary.html
 --migrate-cache: migrate file-based caches to DB
+
+DiaryDaemon: in-process refresh(dates) API for watch_diary.py
 """
 
 from __future__ import annotations
@@ -17,16 +21,20 @@ import argparse
 import hashlib
 import json
 import logging
+import os
 import re
 import sqlite3
 import sys
+import threading
+import time
 import urllib.error
 import urllib.request
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
 from string import Template
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, TextIO
 
 # ─── Configuration ───────────────────────────────────────────────────────────
 
@@ -45,12 +53,31 @@ DEFAULT_CONFIG = {
 
 CARDS_PLACEHOLDER = "<!-- DIARY_CARDS_PLACEHOLDER -->"
 ENTRIES_PLACEHOLDER = "<!-- DIARY_ENTRIES_PLACEHOLDER -->"
+PAGINATION_PLACEHOLDER = "<!-- DIARY_PAGINATION_PLACEHOLDER -->"  # optional
+
+# Sharded output: number of newest cards on the index page
+DEFAULT_INDEX_SIZE = 30
 
 TRANSLATION_CACHE_DIR = BASE_DIR / ".translation-cache"
 RECAP_CACHE_DIR = BASE_DIR / ".recap-cache"
 DB_PATH = BASE_DIR / "diary.db"
 OPENCLAW_CONFIG = Path.home() / ".openclaw" / "openclaw.json"
 TRANSLATION_MODEL = "anthropic/claude-sonnet-4-5"
+TRANSLATION_TIMEOUT_SEC = 180
+RECAP_TIMEOUT_SEC = 120
+
+# Translation/recap prefetch pool
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_SEC = 2.0
+
+# Dates whose DB writes are committed together during a multi-date run
+DEFAULT_WRITE_BATCH = 200
+
+# Source kinds, in the order they are merged into an entry
+SOURCE_KINDS = ("memory", "obsidian")
+
+_DATE_FILE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.md$")
 
 
 def _gateway_url_and_token() -> tuple[str, str]:
@@ -112,13 +139,16 @@ $sections
         </article>""")
 
 CARD_TEMPLATE = Template("""\
-            <a href="#diary-$date" class="diary-card">
+            <a href="$href" class="diary-card">
                 <div class="card-date">$emoji $date</div>
                 <div class="card-preview lang-content" data-lang="ja">$preview_ja</div>
                 <div class="card-preview lang-content" data-lang="en">$preview_en</div>
                 <div class="card-sources">$sources</div>
             </a>""")
 
+PAGE_LINK_TEMPLATE = Template("""\
+            <a href="$href" class="entry-nav-btn $css_class"><span class="entry-nav-label">$label</span></a>""")
+
 SECTION_TEMPLATE = Template("""\
         <div class="section-$css_class">
             <h3>$icon $title</h3>
@@ -150,6 +180,8 @@ class DiaryEntry:
     sections: list[DiarySection] = field(default_factory=list)
     recap_ja: str = ""
     recap_en: str = ""
+    preview_en: str = ""  # Precomputed card previews (from DB); extracted from markdown if empty
+    preview_ja: str = ""
 
     @property
     def has_content(self) -> bool:
@@ -185,10 +217,10 @@ class DiaryEntry:
             sections="\n".join(rendered),
         )
 
-    def to_card_html(self) -> str:
+    def to_card_html(self, href: Optional[str] = None) -> str:
         # Build preview: EN = original, JA = translated
-        preview_en = ""
-        preview_ja = ""
+        preview_en = self.preview_en
+        preview_ja = self.preview_ja
         for section in self.sections:
             if not preview_en:
                 preview_en = extract_preview(section.raw_md)
@@ -208,6 +240,7 @@ class DiaryEntry:
         sources = " ".join(source_icons)
 
         return CARD_TEMPLATE.substitute(
+            href=href or f"#diary-{self.date}",
             date=self.date,
             emoji="\U0001f4c5",
             preview_ja=preview_ja,
@@ -216,6 +249,42 @@ class DiaryEntry:
         )
 
 
+@dataclass
+class RenderedEntry:
+    """An entry whose article and card HTML were rendered earlier and cached in the DB."""
+    date: str
+    article_html: str
+    card_html: str
+
+    @property
+    def has_content(self) -> bool:
+        return bool(self.article_html)
+
+    def to_html(self) -> str:
+        return self.article_html
+
+    def to_card_html(self, href: Optional[str] = None) -> str:
+        # Cached cards link to the in-page anchor; retarget for sharded pages
+        if href is None:
+            return self.card_html
+        return self.card_html.replace(f'href="#diary-{self.date}"', f'href="{href}"', 1)
+
+
+# Bump when DiaryEntry.to_html()/to_card_html() change in ways the templates don't show
+_RENDER_REVISION = 1
+
+
+def _render_version() -> str:
+    """Hash of everything that shapes cached fragments; a change re-renders all entries."""
+    h = hashlib.sha256(str(_RENDER_REVISION).encode("utf-8"))
+    for template in (ENTRY_TEMPLATE, CARD_TEMPLATE, SECTION_TEMPLATE):
+        h.update(template.template.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+RENDER_VERSION = _render_version()
+
+
 def extract_preview(md_text: str, max_length: int = 120) -> str:
     """Extract the first meaningful line of text from markdown for card preview."""
     for line in md_text.split("\n"):
@@ -244,68 +313,86 @@ def extract_preview(md_text: str, max_length: int = 120) -> str:
 
 # ─── Markdown → HTML Converter ──────────────────────────────────────────────
 
+_HEADING_RE = re.compile(r"^(#{2,4})\s+(.+)$")
+_ORDERED_ITEM_RE = re.compile(r"^\d+\.\s+(.+)$")
+_TABLE_SEPARATOR_RE = re.compile(r"^\|[\s\-:|]+\|$")
+
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC_RE = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")
+_CODE_RE = re.compile(r"`(.+?)`")
+_LINK_RE = re.compile(r"\[(.+?)\]\((.+?)\)")
+
+
 class MarkdownConverter:
     """Converts a subset of Markdown to HTML suitable for diary entries.
 
     Handles: headings (##–####), unordered lists, ordered lists,
     bold/italic inline formatting, inline code, links, and tables.
+
+    Block types are dispatched on the first character of each line, and
+    inline passes are skipped when their marker characters are absent,
+    so plain prose never reaches the regex engine.
     """
 
     def convert(self, text: str) -> str:
         lines = text.split("\n")
         output: list[str] = []
+        append = output.append
+        inline = self._inline
+        n = len(lines)
         i = 0
 
-        while i < len(lines):
+        while i < n:
             line = lines[i]
 
-            # Skip top-level heading (title)
-            if line.startswith("# ") and not line.startswith("## "):
-                i += 1
-                continue
-
             # Blank lines
-            if not line.strip():
+            if not line or line.isspace():
                 i += 1
                 continue
 
-            # Headings ##..####
-            heading_match = re.match(r"^(#{2,4})\s+(.+)$", line)
-            if heading_match:
-                level = len(heading_match.group(1))
-                tag = f"h{min(level + 1, 6)}"  # ## → h3, ### → h4, #### → h5
-                content = self._inline(heading_match.group(2))
-                output.append(f"<{tag}>{content}</{tag}>")
-                i += 1
-                continue
+            first = line[0]
+
+            if first == "#":
+                # Skip top-level heading (title)
+                if line.startswith("# "):
+                    i += 1
+                    continue
+                # Headings ##..####
+                heading_match = _HEADING_RE.match(line)
+                if heading_match:
+                    level = len(heading_match.group(1))
+                    tag = f"h{min(level + 1, 6)}"  # ## → h3, ### → h4, #### → h5
+                    append(f"<{tag}>{inline(heading_match.group(2))}</{tag}>")
+                    i += 1
+                    continue
 
             # Unordered list block
-            if line.startswith("- "):
-                items, i = self._collect_list(lines, i, prefix="- ")
-                output.append("<ul>")
-                for item in items:
-                    output.append(f"  <li>{self._inline(item)}</li>")
-                output.append("</ul>")
+            elif first == "-":
+                if line.startswith("- "):
+                    items, i = self._collect_list(lines, i, prefix="- ")
+                    append("<ul>")
+                    for item in items:
+                        append(f"  <li>{inline(item)}</li>")
+                    append("</ul>")
+                    continue
+
+            # Table block
+            elif first == "|":
+                table_html, i = self._convert_table(lines, i)
+                append(table_html)
                 continue
 
             # Ordered list block
-            ol_match = re.match(r"^\d+\.\s+(.+)$", line)
-            if ol_match:
+            elif _ORDERED_ITEM_RE.match(line):
                 items, i = self._collect_ordered_list(lines, i)
-                output.append("<ol>")
+                append("<ol>")
                 for item in items:
-                    output.append(f"  <li>{self._inline(item)}</li>")
-                output.append("</ol>")
-                continue
-
-            # Table block
-            if line.startswith("|"):
-                table_html, i = self._convert_table(lines, i)
-                output.append(table_html)
+                    append(f"  <li>{inline(item)}</li>")
+                append("</ol>")
                 continue
 
             # Regular paragraph
-            output.append(f"<p>{self._inline(line)}</p>")
+            append(f"<p>{inline(line)}</p>")
             i += 1
 
         return "\n".join(output)
@@ -317,11 +404,12 @@ class MarkdownConverter:
         lines: list[str], start: int, *, prefix: str
     ) -> tuple[list[str], int]:
         items: list[str] = []
+        skip = len(prefix)
         i = start
         while i < len(lines):
             line = lines[i]
             if line.startswith(prefix):
-                items.append(line[len(prefix):])
+                items.append(line[skip:])
             elif line.startswith("  ") and items:
                 # Continuation line (indented under previous item)
                 items[-1] += " " + line.strip()
@@ -338,7 +426,7 @@ class MarkdownConverter:
         i = start
         while i < len(lines):
             line = lines[i]
-            m = re.match(r"^\d+\.\s+(.+)$", line)
+            m = _ORDERED_ITEM_RE.match(line)
             if m:
                 items.append(m.group(1))
             elif line.startswith("  ") and items:
@@ -356,7 +444,7 @@ class MarkdownConverter:
         while i < len(lines) and lines[i].startswith("|"):
             line = lines[i]
             # Skip separator rows (|---|---|)
-            if re.match(r"^\|[\s\-:|]+\|$", line):
+            if _TABLE_SEPARATOR_RE.match(line):
                 i += 1
                 continue
             cells = [c.strip() for c in line.split("|") if c.strip()]
@@ -366,12 +454,13 @@ class MarkdownConverter:
         if not rows:
             return ("", i)
 
+        inline = self._inline
         parts = ['<table class="diary-table">']
 
         # First row as header
         parts.append("  <thead><tr>")
         for cell in rows[0]:
-            parts.append(f"    <th>{self._inline(cell)}</th>")
+            parts.append(f"    <th>{inline(cell)}</th>")
         parts.append("  </tr></thead>")
 
         # Remaining rows as body
@@ -380,7 +469,7 @@ class MarkdownConverter:
             for row in rows[1:]:
                 parts.append("  <tr>")
                 for cell in row:
-                    parts.append(f"    <td>{self._inline(cell)}</td>")
+                    parts.append(f"    <td>{inline(cell)}</td>")
                 parts.append("  </tr>")
             parts.append("  </tbody>")
 
@@ -391,14 +480,22 @@ class MarkdownConverter:
 
     @staticmethod
     def _inline(text: str) -> str:
-        # Bold: **text**
-        text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
-        # Italic: *text* (but not inside bold markers)
-        text = re.sub(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)", r"<em>\1</em>", text)
+        # Passes run in order (bold → italic → code → link) because later
+        # passes see the markup produced by earlier ones, e.g. code spans
+        # inside bold. Each pass is skipped when its marker is absent.
+        if "*" in text:
+            # Bold: **text**
+            if "**" in text:
+                text = _BOLD_RE.sub(r"<strong>\1</strong>", text)
+            # Italic: *text* (but not inside bold markers)
+            if "*" in text:
+                text = _ITALIC_RE.sub(r"<em>\1</em>", text)
         # Inline code: `text`
-        text = re.sub(r"`(.+?)`", r"<code>\1</code>", text)
+        if "`" in text:
+            text = _CODE_RE.sub(r"<code>\1</code>", text)
         # Links: [text](url)
-        text = re.sub(r"\[(.+?)\]\((.+?)\)", r'<a href="\2">\1</a>', text)
+        if "](" in text:
+            text = _LINK_RE.sub(r'<a href="\2">\1</a>', text)
         return text
 
 
@@ -464,9 +561,27 @@ def _save_cached_translation(
     log.debug("Saved translation to file for %s_%s", date_str, source)
 
 
-def translate_markdown(md_text: str) -> Optional[str]:
-    """Translate markdown text to Japanese via OpenClaw Gateway."""
-    payload = json.dumps({
+def _chat_completion(payload: dict, *, timeout: float) -> str:
+    """POST a chat completion to the OpenClaw Gateway and return the message content.
+
+    Raises on network, HTTP and response-shape errors.
+    """
+    url, token = _gateway_url_and_token()
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    data = json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        result = json.loads(resp.read().decode("utf-8"))
+        return result["choices"][0]["message"]["content"]
+
+
+def _request_translation(md_text: str) -> str:
+    """Translate markdown text to Japanese. Raises on failure."""
+    return _chat_completion({
         "model": TRANSLATION_MODEL,
         "messages": [
             {
@@ -491,19 +606,40 @@ def translate_markdown(md_text: str) -> Optional[str]:
             {"role": "user", "content": md_text},
         ],
         "temperature": 0.3,
-    }).encode("utf-8")
+    }, timeout=TRANSLATION_TIMEOUT_SEC)
 
-    url, token = _gateway_url_and_token()
-    headers = {"Content-Type": "application/json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
 
-    req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
+def _request_recap(content: str) -> tuple[str, str]:
+    """Generate a (ja, en) recap for the day. Raises on failure or empty recap."""
+    res_content = _chat_completion({
+        "model": TRANSLATION_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": (
+                    "You are Rebecca from Cyberpunk: Edgerunners. "
+                    "Write a very short (max 2 sentences) commentary on the following day's activity. "
+                    "Be sassy, sharp-tongued, but loyal to Takeru. Use oversized emotions. "
+                    "Output format: JSON with keys 'ja' and 'en'. "
+                    "Example: {'ja': '今日は散々だったけど、次はぶちかましてやろうぜ！', 'en': 'Rough day, but let's blast them next time!'}"
+                ),
+            },
+            {"role": "user", "content": content},
+        ],
+        "temperature": 0.8,
+        "response_format": {"type": "json_object"}
+    }, timeout=RECAP_TIMEOUT_SEC)
+    res_json = json.loads(res_content)
+    ja, en = res_json.get("ja", ""), res_json.get("en", "")
+    if not (ja and en):
+        raise ValueError("Recap response is missing 'ja' or 'en'")
+    return ja, en
 
+
+def translate_markdown(md_text: str) -> Optional[str]:
+    """Translate markdown text to Japanese via OpenClaw Gateway."""
     try:
-        with urllib.request.urlopen(req, timeout=180) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-            return result["choices"][0]["message"]["content"]
+        return _request_translation(md_text)
     except (urllib.error.URLError, urllib.error.HTTPError, KeyError, json.JSONDecodeError, OSError) as e:
         log.warning("Translation failed: %s", e)
         return None
@@ -512,13 +648,18 @@ def translate_markdown(md_text: str) -> Optional[str]:
 def get_translation(
     date_str: str, source: str, md_text: str,
     db_conn: Optional[sqlite3.Connection] = None,
+    *,
+    fetch: bool = True,
 ) -> Optional[str]:
-    """Get Japanese translation of markdown, using cache when possible."""
+    """Get Japanese translation of markdown, using cache when possible.
+
+    With fetch=False only the cache is consulted (None on a miss).
+    """
     md_hash = hashlib.sha256(md_text.encode("utf-8")).hexdigest()
 
     # Check cache (DB first, then file)
     cached = _load_cached_translation(date_str, source, md_hash, db_conn=db_conn)
-    if cached is not None:
+    if cached is not None or not fetch:
         return cached
 
     # Translate
@@ -529,13 +670,11 @@ def get_translation(
     return translated
 
 
-def get_recap(
-    date_str: str, content: str,
+def _load_cached_recap(
+    date_str: str, md_hash: str,
     db_conn: Optional[sqlite3.Connection] = None,
-) -> tuple[str, str]:
-    """Generate or load a cached recap for the day."""
-    md_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
-
+) -> Optional[tuple[str, str]]:
+    """Load a cached recap if the content hash matches (DB first, then file)."""
     # Check DB cache first
     if db_conn is not None:
         from domain.diary import get_recap_cache
@@ -545,9 +684,7 @@ def get_recap(
             return cached
 
     # Check file cache (fallback)
-    RECAP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
     cache_path = RECAP_CACHE_DIR / f"{date_str}.json"
-
     if cache_path.is_file():
         try:
             data = json.loads(cache_path.read_text(encoding="utf-8"))
@@ -560,53 +697,144 @@ def get_recap(
                 return ja, en
         except Exception:
             pass
+    return None
 
-    log.info("Generating Rebecca Recap for %s ...", date_str)
 
-    payload = json.dumps({
-        "model": TRANSLATION_MODEL,
-        "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "You are Rebecca from Cyberpunk: Edgerunners. "
-                    "Write a very short (max 2 sentences) commentary on the following day's activity. "
-                    "Be sassy, sharp-tongued, but loyal to Takeru. Use oversized emotions. "
-                    "Output format: JSON with keys 'ja' and 'en'. "
-                    "Example: {'ja': '今日は散々だったけど、次はぶちかましてやろうぜ！', 'en': 'Rough day, but let's blast them next time!'}"
-                ),
-            },
-            {"role": "user", "content": content},
-        ],
-        "temperature": 0.8,
-        "response_format": {"type": "json_object"}
-    }).encode("utf-8")
+def _save_cached_recap(
+    date_str: str, md_hash: str, ja: str, en: str,
+    db_conn: Optional[sqlite3.Connection] = None,
+) -> None:
+    """Save a recap to cache (file and DB)."""
+    # Save to file (backward compat)
+    RECAP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_path = RECAP_CACHE_DIR / f"{date_str}.json"
+    cache_path.write_text(json.dumps({"hash": md_hash, "ja": ja, "en": en}, ensure_ascii=False), encoding="utf-8")
+    # Save to DB
+    if db_conn is not None:
+        from domain.diary import set_recap_cache
+        set_recap_cache(db_conn, date_str, md_hash, ja, en)
 
-    url, token = _gateway_url_and_token()
-    headers = {"Content-Type": "application/json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
 
-    req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
+def get_recap(
+    date_str: str, content: str,
+    db_conn: Optional[sqlite3.Connection] = None,
+    *,
+    fetch: bool = True,
+) -> tuple[str, str]:
+    """Generate or load a cached recap for the day.
+
+    With fetch=False only the cache is consulted (("", "") on a miss).
+    """
+    md_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    cached = _load_cached_recap(date_str, md_hash, db_conn=db_conn)
+    if cached is not None:
+        return cached
+    if not fetch:
+        return "", ""
+
+    log.info("Generating Rebecca Recap for %s ...", date_str)
 
     try:
-        with urllib.request.urlopen(req, timeout=120) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-            res_content = result["choices"][0]["message"]["content"]
-            res_json = json.loads(res_content)
-            ja, en = res_json.get("ja", ""), res_json.get("en", "")
-            if ja and en:
-                # Save to file (backward compat)
-                cache_path.write_text(json.dumps({"hash": md_hash, "ja": ja, "en": en}, ensure_ascii=False), encoding="utf-8")
-                # Save to DB
-                if db_conn is not None:
-                    from domain.diary import set_recap_cache
-                    set_recap_cache(db_conn, date_str, md_hash, ja, en)
-                return ja, en
+        ja, en = _request_recap(content)
     except Exception as e:
         log.warning("Recap generation failed: %s", e)
+        return "", ""
+
+    _save_cached_recap(date_str, md_hash, ja, en, db_conn=db_conn)
+    return ja, en
+
+
+# ─── Generation Pool ─────────────────────────────────────────────────────────
 
-    return "", ""
+
+def _is_transient(e: BaseException) -> bool:
+    """Whether a Gateway request error is worth retrying (network, timeout, 5xx/429)."""
+    if isinstance(e, urllib.error.HTTPError):
+        return e.code == 429 or e.code >= 500
+    return isinstance(e, (urllib.error.URLError, TimeoutError, ConnectionError))
+
+
+def _with_retry(fn, arg, *, retries: int, backoff: float):
+    """Call fn(arg), retrying transient errors with exponential backoff.
+
+    Deterministic failures (HTTP 4xx, malformed responses) and the last
+    transient error are re-raised immediately.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fn(arg)
+        except Exception as e:
+            if attempt >= retries or not _is_transient(e):
+                raise
+            delay = backoff * (2 ** attempt)
+            log.debug("Request failed (%s), retrying in %.1fs", e, delay)
+            time.sleep(delay)
+
+
+def prefetch_generations(
+    dates: list[str],
+    memory_dir: Path,
+    obsidian_dir: Path,
+    *,
+    db_conn: Optional[sqlite3.Connection] = None,
+    workers: int = DEFAULT_WORKERS,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF_SEC,
+) -> dict[str, int]:
+    """Fetch missing translations and recaps for many dates concurrently.
+
+    Cache misses are sent to the Gateway from a bounded thread pool, each
+    request retried with exponential backoff. Results are written back to
+    translation_cache / recap_cache from the calling thread in date order,
+    so build_entry() afterwards only sees cache hits.
+
+    Returns a dict with counts: {"translations": N, "recaps": M, "failed": K}
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    # (date, kind, md_hash, text) for every cache miss
+    jobs: list[tuple[str, str, str, str]] = []
+    for d in dates:
+        memory_md = read_source(memory_dir / f"{d}.md")
+        obsidian_md = read_source(obsidian_dir / f"{d}.md")
+        if not memory_md and not obsidian_md:
+            continue
+        integrated_md = merge_markdown_sources(memory_md, obsidian_md)
+        md_hash = hashlib.sha256(integrated_md.encode("utf-8")).hexdigest()
+        if _load_cached_translation(d, "integrated", md_hash, db_conn=db_conn) is None:
+            jobs.append((d, "translation", md_hash, integrated_md))
+        if _load_cached_recap(d, md_hash, db_conn=db_conn) is None:
+            jobs.append((d, "recap", md_hash, integrated_md))
+
+    stats = {"translations": 0, "recaps": 0, "failed": 0}
+    if not jobs:
+        return stats
+
+    log.info("Prefetching %d translations/recaps with %d workers.", len(jobs), workers)
+    requests = {"translation": _request_translation, "recap": _request_recap}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(_with_retry, requests[kind], text, retries=retries, backoff=backoff)
+            for _, kind, _, text in jobs
+        ]
+        # Consume in submission order: write-back stays ordered and on this thread
+        for (d, kind, md_hash, _), future in zip(jobs, futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                log.warning("Prefetch of %s for %s failed: %s", kind, d, e)
+                stats["failed"] += 1
+                continue
+            if kind == "translation":
+                _save_cached_translation(d, "integrated", md_hash, result, db_conn=db_conn)
+                stats["translations"] += 1
+            else:
+                _save_cached_recap(d, md_hash, *result, db_conn=db_conn)
+                stats["recaps"] += 1
+
+    return stats
 
 
 # ─── Core Logic ──────────────────────────────────────────────────────────────
@@ -614,14 +842,13 @@ def get_recap(
 def scan_dates(memory_dir: Path, obsidian_dir: Path) -> list[str]:
     """Find all unique YYYY-MM-DD dates from filenames in both directories."""
     dates = set()
-    pattern = re.compile(r"^(\d{4}-\d{2}-\d{2})\.md$")
 
     for d in [memory_dir, obsidian_dir]:
         if not d.is_dir():
             log.warning("Directory not found: %s", d)
             continue
         for f in d.glob("*.md"):
-            m = pattern.match(f.name)
+            m = _DATE_FILE_RE.match(f.name)
             if m:
                 dates.add(m.group(1))
 
@@ -635,6 +862,130 @@ def read_source(path: Path) -> Optional[str]:
     return path.read_text(encoding="utf-8")
 
 
+# ─── Source Fingerprints ─────────────────────────────────────────────────────
+
+
+def stat_sources(
+    memory_dir: Path, obsidian_dir: Path
+) -> tuple[dict[tuple[str, str], tuple[int, int]], set[str]]:
+    """Stat every daily note in one scandir sweep per directory.
+
+    Returns ({(date, source): (size, mtime_ns)}, {sources whose directory
+    could be scanned}). A missing directory is reported so callers do not
+    mistake an unmounted vault for deleted notes.
+    """
+    found: dict[tuple[str, str], tuple[int, int]] = {}
+    scanned: set[str] = set()
+
+    for source, d in zip(SOURCE_KINDS, (memory_dir, obsidian_dir)):
+        try:
+            it = os.scandir(d)
+        except OSError:
+            log.warning("Directory not found: %s", d)
+            continue
+        scanned.add(source)
+        with it:
+            for dirent in it:
+                m = _DATE_FILE_RE.match(dirent.name)
+                if not m:
+                    continue
+                try:
+                    if not dirent.is_file():
+                        continue
+                    st = dirent.stat()
+                except OSError:
+                    continue
+                found[(m.group(1), source)] = (st.st_size, st.st_mtime_ns)
+
+    return found, scanned
+
+
+def fingerprint_source(path: Path) -> Optional[dict]:
+    """Return {"size", "mtime_ns", "sha256"} for a source file, or None if missing."""
+    try:
+        st = path.stat()
+        data = path.read_bytes()
+    except OSError:
+        return None
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def _source_path(source: str, date_str: str, memory_dir: Path, obsidian_dir: Path) -> Path:
+    base = memory_dir if source == "memory" else obsidian_dir
+    return base / f"{date_str}.md"
+
+
+def plan_incremental(
+    db_conn: sqlite3.Connection,
+    memory_dir: Path,
+    obsidian_dir: Path,
+) -> tuple[list[str], dict[tuple[str, str], Optional[dict]]]:
+    """Compare source files against the fingerprints recorded in the DB.
+
+    Files whose size and mtime_ns match are skipped without being read.
+    Otherwise the content hash decides: a touched-but-identical file only
+    refreshes its fingerprint, a modified/new/deleted file marks its date
+    for rebuild.
+
+    Returns (dates to rebuild, newest first; fingerprint updates where a
+    None value means the source was deleted).
+    """
+    from domain.diary import get_source_fingerprints
+
+    stored = get_source_fingerprints(db_conn)
+    current, scanned = stat_sources(memory_dir, obsidian_dir)
+
+    changed: set[str] = set()
+    updates: dict[tuple[str, str], Optional[dict]] = {}
+
+    for key, (size, mtime_ns) in current.items():
+        old = stored.get(key)
+        if old is not None and old["size"] == size and old["mtime_ns"] == mtime_ns:
+            continue
+        date_str, source = key
+        fp = fingerprint_source(_source_path(source, date_str, memory_dir, obsidian_dir))
+        if fp is None:
+            continue  # Vanished between scandir and read; next run will see it
+        updates[key] = fp
+        if old is None or old["sha256"] != fp["sha256"]:
+            changed.add(date_str)
+
+    for key in stored.keys() - current.keys():
+        date_str, source = key
+        if source not in scanned:
+            continue
+        updates[key] = None
+        changed.add(date_str)
+
+    return sorted(changed, reverse=True), updates
+
+
+def _record_fingerprints(
+    db_conn: sqlite3.Connection,
+    date_str: str,
+    memory_dir: Path,
+    obsidian_dir: Path,
+    known: Optional[dict[tuple[str, str], Optional[dict]]] = None,
+) -> None:
+    """Store the fingerprints of both sources of a date after it was built."""
+    from domain.diary import delete_source_fingerprint, set_source_fingerprint
+
+    for source in SOURCE_KINDS:
+        key = (date_str, source)
+        if known is not None and key in known:
+            fp = known[key]
+        else:
+            fp = fingerprint_source(_source_path(source, date_str, memory_dir, obsidian_dir))
+        if fp is None:
+            delete_source_fingerprint(db_conn, date_str, source)
+        else:
+            set_source_fingerprint(db_conn, date_str, source, **fp)
+
+
 def build_entry(
     date_str: str,
     memory_dir: Path,
@@ -642,9 +993,16 @@ def build_entry(
     *,
     skip_translation: bool = False,
     db_conn: Optional[sqlite3.Connection] = None,
+    converter: Optional[MarkdownConverter] = None,
+    fetch: bool = True,
 ) -> Optional[DiaryEntry]:
-    """Build a DiaryEntry for a specific date by integrating memory and obsidian."""
-    converter = MarkdownConverter()
+    """Build a DiaryEntry for a specific date by integrating memory and obsidian.
+
+    With fetch=False translations and recaps come from the cache only, so
+    no Gateway request is made (e.g. inside a DB transaction).
+    """
+    if converter is None:
+        converter = MarkdownConverter()
     entry = DiaryEntry(date=date_str)
 
     memory_md = read_source(memory_dir / f"{date_str}.md")
@@ -665,7 +1023,9 @@ def build_entry(
     raw_md_ja = ""
     if not skip_translation:
         # Use 'integrated' as the cache source key
-        translated_md = get_translation(date_str, "integrated", integrated_md, db_conn=db_conn)
+        translated_md = get_translation(
+            date_str, "integrated", integrated_md, db_conn=db_conn, fetch=fetch,
+        )
         if translated_md:
             raw_md_ja = translated_md
             html_ja = converter.convert(translated_md)
@@ -685,7 +1045,7 @@ def build_entry(
 
     # Generate recap
     if not skip_translation:
-        recap_ja, recap_en = get_recap(date_str, integrated_md, db_conn=db_conn)
+        recap_ja, recap_en = get_recap(date_str, integrated_md, db_conn=db_conn, fetch=fetch)
         entry.recap_ja = recap_ja
         entry.recap_en = recap_en
 
@@ -748,17 +1108,23 @@ def _save_entry_to_db(
 
 
 def _entry_from_db_row(row: dict) -> DiaryEntry:
-    """Reconstruct a DiaryEntry from a database row."""
+    """Reconstruct a DiaryEntry from a database row.
+
+    Works with the "render" projection of iter_entries(): card previews come
+    from the stored preview columns, so the markdown columns are optional.
+    """
     entry = DiaryEntry(date=row["date"])
     entry.recap_ja = row.get("recap_ja") or ""
     entry.recap_en = row.get("recap_en") or ""
+    entry.preview_en = row.get("preview_en") or ""
+    entry.preview_ja = row.get("preview_ja") or ""
     entry.sections.append(
         DiarySection(
             title="Rebecca's Integrated Log",
             icon="\U0001f5d2",
             css_class="integrated",
             body_html=row["html_en"],
-            raw_md=row["integrated_md"],
+            raw_md=row.get("integrated_md") or "",
             body_html_ja=row.get("html_ja") or "",
             raw_md_ja=row.get("raw_md_ja") or "",
         )
@@ -766,52 +1132,327 @@ def _entry_from_db_row(row: dict) -> DiaryEntry:
     return entry
 
 
+def refresh_rendered_fragments(
+    db_conn: sqlite3.Connection, render_version: str = RENDER_VERSION,
+) -> int:
+    """Render and cache article/card HTML for entries that changed.
+
+    Only rows whose content changed (upsert clears the cache then) or whose
+    fragments came from another render version are rendered.
+    Returns the number of entries rendered.
+    """
+    from domain.diary import (
+        get_entry, get_stale_render_dates, set_rendered_fragments, transaction,
+    )
+
+    stale = get_stale_render_dates(db_conn, render_version)
+    with transaction(db_conn):
+        for d in stale:
+            row = get_entry(db_conn, d)
+            if row is None:
+                continue
+            entry = _entry_from_db_row(row)
+            set_rendered_fragments(
+                db_conn, d,
+                render_version=render_version,
+                article_html=entry.to_html(),
+                card_html=entry.to_card_html(),
+            )
+    return len(stale)
+
+
 # ─── Site Generation ─────────────────────────────────────────────────────────
 
 
+_PLACEHOLDER_RE = re.compile(
+    "(" + "|".join(
+        re.escape(p) for p in (CARDS_PLACEHOLDER, ENTRIES_PLACEHOLDER, PAGINATION_PLACEHOLDER)
+    ) + ")"
+)
+
+# An entry source is called once per pass (cards, then entries) and must
+# return a fresh iterable each time, e.g. a generator over the DB.
+EntrySource = Callable[[], Iterable["DiaryEntry | RenderedEntry"]]
+
+
+def _split_template(template_content: str) -> list[str]:
+    """Split the template once into [literal, placeholder, literal, ...] in document order."""
+    return _PLACEHOLDER_RE.split(template_content)
+
+
+def _write_joined(out: TextIO, chunks: Iterable[str], sep: str = "\n\n") -> int:
+    """Write chunks separated by sep (like sep.join, without building the string)."""
+    count = 0
+    for chunk in chunks:
+        if count:
+            out.write(sep)
+        out.write(chunk)
+        count += 1
+    return count
+
+
+def _write_page(
+    out: TextIO,
+    template_parts: list[str],
+    fill: dict[str, Callable[[], Iterable[str]]],
+) -> None:
+    """Stream a page: template literals, with each placeholder filled from its chunk source."""
+    for i, part in enumerate(template_parts):
+        if i % 2 == 0:
+            out.write(part)
+        elif part in fill:
+            _write_joined(out, fill[part]())
+
+
+@contextmanager
+def _atomic_output(path: Path) -> Iterator[TextIO]:
+    """Open path.tmp for writing and rename it over path on success."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _pagination_html(links: list[tuple[str, str, str]], css_class: str = "") -> str:
+    """Render (href, label, css_class) links into a pagination nav."""
+    if not links:
+        return ""
+    rendered = "\n".join(
+        PAGE_LINK_TEMPLATE.substitute(href=href, label=label, css_class=cls)
+        for href, label, cls in links
+    )
+    classes = f"diary-pagination {css_class}".strip()
+    return f'        <nav class="{classes}">\n{rendered}\n        </nav>'
+
+
+def _shard_name(output_path: Path, key: str) -> str:
+    """File name of a month (YYYY-MM) or entry (YYYY-MM-DD) shard next to the index."""
+    return f"{output_path.stem}-{key}{output_path.suffix}"
+
+
+def _render_sharded(
+    template_parts: list[str],
+    output_path: Path,
+    source: EntrySource,
+    *,
+    index_size: int = DEFAULT_INDEX_SIZE,
+    dry_run: bool = False,
+) -> bool:
+    """Render an index page, one page per month and one page per entry.
+
+    - <output>: newest `index_size` cards linking to entry pages + month archive
+    - <stem>-YYYY-MM<suffix>: that month's cards and entries
+    - <stem>-YYYY-MM-DD<suffix>: a single entry with newer/older links
+
+    Each page's weight is bounded by a month (or `index_size` cards),
+    regardless of how long the diary gets. Only one month of entries is
+    held in memory at a time. Stale shard files are removed.
+    """
+    # Pass 1: dates only, to know each page's neighbours
+    dates = [e.date for e in source() if e.has_content]
+    month_keys = list(dict.fromkeys(d[:7] for d in dates))  # newest first
+    index_name = output_path.name
+    out_dir = output_path.parent
+    written: set[str] = {index_name}
+
+    def entry_href(d: str) -> str:
+        return f"{_shard_name(output_path, d)}#diary-{d}"
+
+    def write(name: str, cards: list[str], articles: list[str], pagination: str) -> None:
+        fill = {
+            CARDS_PLACEHOLDER: lambda: cards,
+            ENTRIES_PLACEHOLDER: lambda: articles,
+            PAGINATION_PLACEHOLDER: lambda: [pagination],
+        }
+        written.add(name)
+        if dry_run:
+            return
+        with _atomic_output(out_dir / name) as out:
+            _write_page(out, template_parts, fill)
+
+    def flush_month(month: str, month_entries: list[DiaryEntry | RenderedEntry]) -> None:
+        i = month_keys.index(month)
+        links = []
+        if i > 0:
+            links.append((_shard_name(output_path, month_keys[i - 1]), f"&#9664; {month_keys[i - 1]}", "entry-nav-prev"))
+        links.append((index_name, "INDEX", "entry-nav-list"))
+        if i < len(month_keys) - 1:
+            links.append((_shard_name(output_path, month_keys[i + 1]), f"{month_keys[i + 1]} &#9654;", "entry-nav-next"))
+        cards = [e.to_card_html() for e in month_entries]
+        articles = [e.to_html() for e in month_entries]
+        write(_shard_name(output_path, month), cards, articles, _pagination_html(links))
+
+        # Entry pages
+        for entry, card, article in zip(month_entries, cards, articles):
+            pos = positions[entry.date]
+            links = []
+            if pos > 0:
+                newer = dates[pos - 1]
+                links.append((entry_href(newer), f"&#9664; {newer}", "entry-nav-prev"))
+            links.append((_shard_name(output_path, month), month, "entry-nav-list"))
+            if pos < len(dates) - 1:
+                older = dates[pos + 1]
+                links.append((entry_href(older), f"{older} &#9654;", "entry-nav-next"))
+            write(_shard_name(output_path, entry.date), [card], [article], _pagination_html(links))
+
+    # Pass 2: stream entries, one month at a time
+    positions = {d: i for i, d in enumerate(dates)}
+    index_cards: list[str] = []
+    current_month: Optional[str] = None
+    month_entries: list[DiaryEntry | RenderedEntry] = []
+    for entry in source():
+        if not entry.has_content:
+            continue
+        if len(index_cards) < index_size:
+            index_cards.append(entry.to_card_html(href=entry_href(entry.date)))
+        month = entry.date[:7]
+        if month != current_month and month_entries:
+            flush_month(current_month, month_entries)
+            month_entries = []
+        current_month = month
+        month_entries.append(entry)
+    if month_entries:
+        flush_month(current_month, month_entries)
+
+    # Index: cards only, linking to per-entry pages, plus month archive
+    archive = _pagination_html(
+        [(_shard_name(output_path, m), m, "entry-nav-list") for m in month_keys],
+        css_class="diary-archive",
+    )
+    index_fill = {
+        CARDS_PLACEHOLDER: lambda: index_cards,
+        PAGINATION_PLACEHOLDER: lambda: [archive],
+    }
+
+    if dry_run:
+        _write_page(sys.stdout, template_parts, index_fill)
+        sys.stdout.write("\n")
+        log.info("Dry run: %d sharded pages rendered (index printed).", len(written))
+        return True
+
+    with _atomic_output(output_path) as out:
+        _write_page(out, template_parts, index_fill)
+
+    # Remove shards of months/entries that no longer exist
+    shard_re = re.compile(
+        rf"^{re.escape(output_path.stem)}-\d{{4}}-\d{{2}}(-\d{{2}})?{re.escape(output_path.suffix)}$"
+    )
+    for f in out_dir.iterdir():
+        if shard_re.match(f.name) and f.name not in written:
+            f.unlink()
+            log.debug("Removed stale shard %s", f.name)
+
+    log.info(
+        "Generated sharded site at %s: %d entries, %d months.",
+        output_path, len(dates), len(month_keys),
+    )
+    return True
+
+
 def _render_html(
     template_path: Path,
     output_path: Path,
-    entries: list[DiaryEntry],
+    entries: Iterable[DiaryEntry | RenderedEntry] | EntrySource,
     dry_run: bool = False,
+    *,
+    shard: bool = False,
+    index_size: int = DEFAULT_INDEX_SIZE,
 ) -> bool:
-    """Render diary entries into the HTML template."""
-    if not template_path.is_file():
-        log.error("Template not found: %s", template_path)
+    """Render diary entries into the HTML template (one page, or sharded).
+
+    The template is split once at its placeholders and the page is streamed
+    to a temp file that is atomically renamed over the output, so peak memory
+    is bounded by the largest entry rather than the whole diary. `entries`
+    may be a list or an EntrySource callable (iterated twice: cards, entries).
+    """
+    template_parts = _load_template(template_path)
+    if template_parts is None:
         return False
+    return _render_parts(
+        template_parts, output_path, entries,
+        dry_run=dry_run, shard=shard, index_size=index_size,
+    )
 
-    entries_html = []
-    cards_html = []
-    for entry in entries:
-        if entry.has_content:
-            entries_html.append(entry.to_html())
-            cards_html.append(entry.to_card_html())
 
-    if not entries_html:
-        log.warning("No diary entries found to generate.")
+def _load_template(template_path: Path) -> Optional[list[str]]:
+    """Read and split the template, or log why it is unusable and return None."""
+    if not template_path.is_file():
+        log.error("Template not found: %s", template_path)
+        return None
 
     template_content = template_path.read_text(encoding="utf-8")
 
     if CARDS_PLACEHOLDER not in template_content:
         log.error("Placeholder '%s' not found in template.", CARDS_PLACEHOLDER)
-        return False
+        return None
     if ENTRIES_PLACEHOLDER not in template_content:
         log.error("Placeholder '%s' not found in template.", ENTRIES_PLACEHOLDER)
-        return False
+        return None
+
+    return _split_template(template_content)
 
-    final_html = template_content.replace(CARDS_PLACEHOLDER, "\n\n".join(cards_html))
-    final_html = final_html.replace(ENTRIES_PLACEHOLDER, "\n\n".join(entries_html))
+
+def _render_parts(
+    template_parts: list[str],
+    output_path: Path,
+    entries: Iterable[DiaryEntry | RenderedEntry] | EntrySource,
+    dry_run: bool = False,
+    *,
+    shard: bool = False,
+    index_size: int = DEFAULT_INDEX_SIZE,
+) -> bool:
+    """Render entries into an already split template (see _render_html)."""
+    source: EntrySource = entries if callable(entries) else (lambda: entries)
+
+    if shard:
+        return _render_sharded(
+            template_parts, output_path, source,
+            index_size=index_size, dry_run=dry_run,
+        )
+
+    written = 0
+
+    def entry_chunks() -> Iterator[str]:
+        nonlocal written
+        for entry in source():
+            if entry.has_content:
+                written += 1
+                yield entry.to_html()
+
+    fill = {
+        CARDS_PLACEHOLDER: lambda: (e.to_card_html() for e in source() if e.has_content),
+        ENTRIES_PLACEHOLDER: entry_chunks,
+    }
 
     if dry_run:
-        print(final_html)
+        _write_page(sys.stdout, template_parts, fill)
+        sys.stdout.write("\n")
         return True
 
-    output_path.write_text(final_html, encoding="utf-8")
-    log.info("Generated site at %s with %d entries.", output_path, len(entries_html))
+    with _atomic_output(output_path) as out:
+        _write_page(out, template_parts, fill)
+
+    if not written:
+        log.warning("No diary entries found to generate.")
+    log.info("Generated site at %s with %d entries.", output_path, written)
     return True
 
 
-def generate_site(config: dict, dry_run: bool = False, skip_translation: bool = False) -> bool:
+def generate_site(
+    config: dict,
+    dry_run: bool = False,
+    skip_translation: bool = False,
+    *,
+    shard: bool = False,
+    index_size: int = DEFAULT_INDEX_SIZE,
+) -> bool:
     """Generate the full website by scanning all dates (legacy mode, no DB)."""
     memory_dir = config["memory_dir"]
     obsidian_dir = config["obsidian_dir"]
@@ -831,7 +1472,10 @@ def generate_site(config: dict, dry_run: bool = False, skip_translation: bool =
         if entry:
             entries.append(entry)
 
-    return _render_html(template_path, output_path, entries, dry_run=dry_run)
+    return _render_html(
+        template_path, output_path, entries,
+        dry_run=dry_run, shard=shard, index_size=index_size,
+    )
 
 
 def generate_site_with_db(
@@ -839,27 +1483,65 @@ def generate_site_with_db(
     db_conn: sqlite3.Connection,
     *,
     rebuild: bool = False,
+    incremental: bool = False,
     dry_run: bool = False,
     skip_translation: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    shard: bool = False,
+    index_size: int = DEFAULT_INDEX_SIZE,
+    write_batch: int = DEFAULT_WRITE_BATCH,
+    dates: Optional[Iterable[str]] = None,
+    template_parts: Optional[list[str]] = None,
+    converter: Optional[MarkdownConverter] = None,
 ) -> bool:
     """Generate the website using the diary database.
 
     Default: process today only → save to DB → read all from DB → render HTML
     --rebuild: process all dates → save to DB → read all from DB → render HTML
+    --incremental: process changed dates only → save to DB → read all from DB → render HTML
+    dates: process the given dates only (entries whose sources are gone are
+        removed, but only while both source directories exist)
+
+    Translations and recaps are fetched first, each cache row committed on
+    its own; DB writes of `write_batch` consecutive dates then share one
+    short transaction that makes no Gateway requests.
+    `template_parts` (an already split template) and `converter` let a
+    long-running caller such as DiaryDaemon skip re-reading the template.
     """
-    from domain.diary import get_all_entries, count_entries
+    from domain.diary import (
+        count_entries, delete_entry, iter_entries, set_source_fingerprint, transaction,
+    )
 
     memory_dir = config["memory_dir"]
     obsidian_dir = config["obsidian_dir"]
     template_path = config["template_html"]
     output_path = config["index_html"]
 
-    if not template_path.is_file():
-        log.error("Template not found: %s", template_path)
-        return False
+    if template_parts is None:
+        template_parts = _load_template(template_path)
+        if template_parts is None:
+            return False
+    if converter is None:
+        converter = MarkdownConverter()
 
     # Step 1: Determine which dates to process
-    if rebuild:
+    fingerprints: Optional[dict[tuple[str, str], Optional[dict]]] = None
+    prune = incremental
+    if dates:
+        dates_to_process = sorted(set(dates), reverse=True)
+        prune = True
+        log.info("Processing %d requested dates.", len(dates_to_process))
+    elif incremental:
+        dates_to_process, fingerprints = plan_incremental(db_conn, memory_dir, obsidian_dir)
+        log.info("Incremental mode: %d changed dates to process.", len(dates_to_process))
+
+        # Sources that were only touched need a fresh fingerprint, not a rebuild
+        changed = set(dates_to_process)
+        with transaction(db_conn):
+            for (d, source), fp in fingerprints.items():
+                if d not in changed and fp is not None:
+                    set_source_fingerprint(db_conn, d, source, **fp)
+    elif rebuild:
         dates_to_process = scan_dates(memory_dir, obsidian_dir)
         log.info("Rebuild mode: processing %d dates.", len(dates_to_process))
     else:
@@ -867,34 +1549,170 @@ def generate_site_with_db(
         dates_to_process = [today_str]
         log.info("Default mode: processing today (%s) only.", today_str)
 
-    # Step 2: Build and save entries for target dates
-    processed = 0
-    for d in dates_to_process:
-        entry = build_entry(
-            d, memory_dir, obsidian_dir,
-            skip_translation=skip_translation,
-            db_conn=db_conn,
+    # An unmounted/missing source directory must not read as "sources deleted"
+    if prune:
+        missing = [str(p) for p in (memory_dir, obsidian_dir) if not Path(p).is_dir()]
+        if missing:
+            log.warning("Not pruning entries: source directory missing: %s", ", ".join(missing))
+            prune = False
+
+    # Step 2: Fetch missing translations/recaps (outside any transaction)
+    if not skip_translation and dates_to_process:
+        stats = prefetch_generations(
+            dates_to_process, memory_dir, obsidian_dir,
+            db_conn=db_conn, workers=max(1, workers),
         )
-        if entry:
-            processed += 1
+        log.info(
+            "Prefetch complete: %d translations, %d recaps, %d failed.",
+            stats["translations"], stats["recaps"], stats["failed"],
+        )
+
+    # Step 3: Build and save entries for target dates
+    processed = 0
+    batch = max(1, write_batch)
+    for start in range(0, len(dates_to_process), batch):
+        with transaction(db_conn):
+            for d in dates_to_process[start:start + batch]:
+                entry = build_entry(
+                    d, memory_dir, obsidian_dir,
+                    skip_translation=skip_translation,
+                    db_conn=db_conn,
+                    converter=converter,
+                    fetch=False,
+                )
+                if entry:
+                    processed += 1
+                elif prune and delete_entry(db_conn, d):
+                    log.info("Removed entry %s (sources deleted or empty).", d)
+                _record_fingerprints(db_conn, d, memory_dir, obsidian_dir, known=fingerprints)
 
     log.info("Processed %d entries (saved to DB).", processed)
 
-    # Step 3: Read ALL entries from DB and generate HTML
-    db_rows = get_all_entries(db_conn, order="DESC")
-    log.info("Reading %d entries from DB for HTML generation.", len(db_rows))
+    # Step 4: Render fragments of changed entries only
+    rendered = refresh_rendered_fragments(db_conn)
+    log.info(
+        "Rendered %d of %d entries (render version %s).",
+        rendered, count_entries(db_conn), RENDER_VERSION,
+    )
+
+    # Step 5: Stream ALL cached fragments from DB into the HTML
+    def entries_from_db() -> Iterator[RenderedEntry]:
+        for row in iter_entries(db_conn, order="DESC", columns=["article_html", "card_html"]):
+            yield RenderedEntry(row["date"], row["article_html"] or "", row["card_html"] or "")
+
+    return _render_parts(
+        template_parts, output_path, entries_from_db,
+        dry_run=dry_run, shard=shard, index_size=index_size,
+    )
+
 
-    entries = [_entry_from_db_row(row) for row in db_rows]
+# ─── Daemon ──────────────────────────────────────────────────────────────────
 
-    return _render_html(template_path, output_path, entries, dry_run=dry_run)
+class DiaryDaemon:
+    """Long-running, in-process diary updater (used by watch_diary.py).
+
+    Keeps the DB connection, the split template and the Markdown converter
+    warm between updates, so refresh(dates) only pays for building the
+    changed dates and streaming the cached fragments. The template is
+    re-read when its mtime changes. Calls are serialised by a lock, so the
+    daemon may be shared between threads.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        db_path: Path = DB_PATH,
+        *,
+        skip_translation: bool = False,
+        shard: bool = False,
+        index_size: int = DEFAULT_INDEX_SIZE,
+    ):
+        self.config = config
+        self.db_path = db_path
+        self.skip_translation = skip_translation
+        self.shard = shard
+        self.index_size = index_size
+        self.converter = MarkdownConverter()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._template_parts: Optional[list[str]] = None
+        self._template_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            from domain.diary import init_db
+            self._conn = init_db(self.db_path, check_same_thread=False)
+            log.info("Database initialized at %s", self.db_path)
+        return self._conn
+
+    def _template(self) -> Optional[list[str]]:
+        template_path = self.config["template_html"]
+        try:
+            mtime = template_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._template_parts is None or mtime != self._template_mtime:
+            self._template_parts = _load_template(template_path)
+            self._template_mtime = mtime
+        return self._template_parts
+
+    def refresh(self, dates: Iterable[str], *, dry_run: bool = False) -> bool:
+        """Rebuild the given dates and re-render the site. Returns success."""
+        dates = list(dates)
+        if not dates:
+            return True
+        with self._lock:
+            template_parts = self._template()
+            if template_parts is None:
+                return False
+            return generate_site_with_db(
+                self.config,
+                self._connection(),
+                dry_run=dry_run,
+                skip_translation=self.skip_translation,
+                shard=self.shard,
+                index_size=self.index_size,
+                dates=dates,
+                template_parts=template_parts,
+                converter=self.converter,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "DiaryDaemon":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 # ─── CLI ─────────────────────────────────────────────────────────────────────
 
+def _date_arg(value: str) -> str:
+    try:
+        if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
+            raise ValueError(value)
+        date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a YYYY-MM-DD date: {value!r}")
+    return value
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Rebecca's Diary SSG - SQLite-backed diary generator.",
     )
+    parser.add_argument(
+        "dates",
+        nargs="*",
+        type=_date_arg,
+        metavar="DATE",
+        help="Process only these YYYY-MM-DD dates (e.g. from watch_diary.py).",
+    )
     parser.add_argument(
         "--memory-dir",
         type=Path,
@@ -930,6 +1748,11 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Rebuild: process all dates from source files into DB.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Rebuild only dates whose memory/Obsidian source files changed since the last run.",
+    )
     parser.add_argument(
         "--migrate-cache",
         action="store_true",
@@ -940,11 +1763,28 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Print generated HTML to stdout instead of writing file.",
     )
+    parser.add_argument(
+        "--shard",
+        action="store_true",
+        help="Write an index page plus per-month and per-entry pages instead of one diary.html.",
+    )
+    parser.add_argument(
+        "--index-size",
+        type=int,
+        default=DEFAULT_INDEX_SIZE,
+        help="Number of newest cards on the sharded index page.",
+    )
     parser.add_argument(
         "--skip-translation",
         action="store_true",
         help="Skip AI translation (dev/test mode).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent translation/recap requests when processing several dates (1 = serial).",
+    )
     parser.add_argument(
         "--no-db",
         action="store_true",
@@ -972,7 +1812,10 @@ def main(argv: list[str] | None = None) -> int:
     # Legacy mode (no DB)
     if args.no_db:
         log.info("Running in legacy mode (no DB).")
-        success = generate_site(config, dry_run=args.dry_run, skip_translation=args.skip_translation)
+        success = generate_site(
+            config, dry_run=args.dry_run, skip_translation=args.skip_translation,
+            shard=args.shard, index_size=args.index_size,
+        )
         return 0 if success else 1
 
     # Phase 3: DB mode
@@ -996,8 +1839,13 @@ def main(argv: list[str] | None = None) -> int:
             config,
             db_conn,
             rebuild=args.rebuild,
+            incremental=args.incremental,
             dry_run=args.dry_run,
             skip_translation=args.skip_translation,
+            workers=args.workers,
+            shard=args.shard,
+            index_size=args.index_size,
+            dates=args.dates,
         )
     finally:
         db_conn.close()
@@ -3,14 +3,27 @@
 watch_diary.py — Real-time Diary Updater.
 
 Watches Obsidian Vault & Memory directory.
-Triggers update_diary.py on change.
+Updates the diary on change through an in-process update_diary.DiaryDaemon
+(or by running update_diary.py in a subprocess with --subprocess).
+
+Events are queued per date and coalesced: a date is updated once it has
+been quiet for DEBOUNCE_SEC, dates that settle together share one run,
+and at most one update runs at a time (events keep queuing meanwhile).
 """
+import re
 import sys
+import threading
 import time
 import subprocess
 from pathlib import Path
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from typing import Callable, Iterable, Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # watchdog is only needed by main(); the queue works without it
+    Observer = None
+    FileSystemEventHandler = object
 
 # --- Config ---
 WATCH_DIRS = [
@@ -19,35 +32,171 @@ WATCH_DIRS = [
 ]
 UPDATE_SCRIPT = Path(__file__).resolve().parent / "update_diary.py"
 
-class DiaryHandler(FileSystemEventHandler):
-    def on_modified(self, event):
-        if event.is_directory:
-            return
-        if not event.src_path.endswith(".md"):
-            return
-        
-        print(f"Detect change: {event.src_path}")
-        self.trigger_update()
+# Seconds a date must stay quiet before it is rebuilt (Obsidian autosaves in bursts)
+DEBOUNCE_SEC = 2.0
+
+_DATE_FILE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\.md$")
+
+
+def date_from_path(path: str) -> Optional[str]:
+    """Return the YYYY-MM-DD of a daily note path, or None for other files."""
+    m = _DATE_FILE_RE.match(Path(path).name)
+    return m.group(1) if m else None
 
-    def on_created(self, event):
-        if not event.src_path.endswith(".md"):
-            return
-        print(f"Detect new file: {event.src_path}")
-        self.trigger_update()
 
-    def trigger_update(self):
-        print("Triggering diary update...", flush=True)
+def run_update(dates: list[str]) -> None:
+    """Run update_diary.py for the given dates in a subprocess."""
+    print(f"Triggering diary update: {', '.join(dates)}", flush=True)
+    try:
+        subprocess.run([sys.executable, str(UPDATE_SCRIPT), *dates], check=True)
+        print("Update complete.", flush=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Update failed: {e}", flush=True)
+    except Exception as e:
+        print(f"Unexpected error during update: {e}", flush=True)
+
+
+def daemon_runner(daemon) -> Callable[[list[str]], None]:
+    """Return an UpdateQueue runner that refreshes dates through a DiaryDaemon."""
+    def run(dates: list[str]) -> None:
+        print(f"Updating diary: {', '.join(dates)}", flush=True)
+        start = time.perf_counter()
         try:
-            subprocess.run([sys.executable, str(UPDATE_SCRIPT)], check=True)
-            print("Update complete.", flush=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Update failed: {e}", flush=True)
+            ok = daemon.refresh(dates)
         except Exception as e:
             print(f"Unexpected error during update: {e}", flush=True)
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if ok:
+            print(f"Update complete ({elapsed_ms:.0f} ms).", flush=True)
+        else:
+            print("Update failed.", flush=True)
+    return run
+
+
+class UpdateQueue:
+    """Debounced, per-date coalescing queue with a single update worker."""
+
+    def __init__(
+        self,
+        runner: Callable[[list[str]], None] = run_update,
+        *,
+        quiet: float = DEBOUNCE_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.runner = runner
+        self.quiet = quiet
+        self.clock = clock
+        self._pending: dict[str, float] = {}  # date -> time of its last event
+        self._cond = threading.Condition()
+
+    def add(self, date: str) -> None:
+        """Record a change to `date`, restarting its quiet window."""
+        with self._cond:
+            self._pending[date] = self.clock()
+            self._cond.notify()
+
+    def wake(self) -> None:
+        """Wake the worker, e.g. after setting its stop event."""
+        with self._cond:
+            self._cond.notify()
+
+    def pending(self) -> list[str]:
+        with self._cond:
+            return sorted(self._pending)
+
+    def take_due(self) -> list[str]:
+        """Remove and return the dates whose quiet window has elapsed."""
+        with self._cond:
+            now = self.clock()
+            due = sorted(d for d, t in self._pending.items() if now - t >= self.quiet)
+            for d in due:
+                del self._pending[d]
+            return due
+
+    def _next_deadline(self) -> Optional[float]:
+        if not self._pending:
+            return None
+        return min(self._pending.values()) + self.quiet
+
+    def run_pending(self) -> list[str]:
+        """Run one update for all due dates. Returns the dates updated."""
+        due = self.take_due()
+        if due:
+            self.runner(due)
+        return due
+
+    def serve(self, stop: threading.Event) -> None:
+        """Worker loop: sleep until the earliest date settles, then update."""
+        while True:
+            with self._cond:
+                # Checked under the lock, so a stop + wake() can't slip past the wait
+                if stop.is_set():
+                    return
+                deadline = self._next_deadline()
+                timeout = None if deadline is None else deadline - self.clock()
+                if timeout is None or timeout > 0:
+                    # Idle until add() or wake(); no polling while nothing is pending
+                    self._cond.wait(timeout)
+                    continue
+            self.run_pending()
+
+    def start(self) -> tuple[threading.Thread, threading.Event]:
+        """Start serve() in a daemon thread; to stop it, set the returned event, then wake()."""
+        stop = threading.Event()
+        thread = threading.Thread(target=self.serve, args=(stop,), name="diary-update", daemon=True)
+        thread.start()
+        return thread, stop
+
+
+class DiaryHandler(FileSystemEventHandler):
+    """Feeds daily-note changes into an UpdateQueue (never blocks on updates)."""
+
+    def __init__(self, queue: UpdateQueue):
+        super().__init__()
+        self.queue = queue
+
+    def _enqueue(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            date = date_from_path(path)
+            if date:
+                print(f"Detect change: {path}", flush=True)
+                self.queue.add(date)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._enqueue([event.src_path])
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._enqueue([event.src_path])
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self._enqueue([event.src_path])
+
+    def on_moved(self, event):
+        # Editors save atomically: write a temp file, then rename over the note
+        if not event.is_directory:
+            self._enqueue([event.src_path, event.dest_path])
+
+
+def main(argv: Optional[list[str]] = None):
+    if Observer is None:
+        print("watchdog is not installed (pip install watchdog).", flush=True)
+        return 1
 
-def main():
+    argv = sys.argv[1:] if argv is None else argv
+    daemon = None
+    if "--subprocess" in argv:
+        queue = UpdateQueue()
+    else:
+        import update_diary  # sibling script; keeps DB, template and converter warm
+        update_diary.setup_logging()
+        daemon = update_diary.DiaryDaemon(update_diary.DEFAULT_CONFIG)
+        queue = UpdateQueue(daemon_runner(daemon))
     observer = Observer()
-    handler = DiaryHandler()
+    handler = DiaryHandler(queue)
 
     print("Starting Diary Watchdog...", flush=True)
     for d in WATCH_DIRS:
@@ -57,6 +206,7 @@ def main():
         else:
             print(f"Warning: Directory not found: {d}", flush=True)
 
+    worker, stop = queue.start()
     observer.start()
     try:
         while True:
@@ -64,6 +214,12 @@ def main():
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
+    stop.set()
+    queue.wake()
+    worker.join()
+    if daemon is not None:
+        daemon.close()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Tests for domain/activity.py — indexed chat activity store."""
+
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from domain.activity import (
+    count_messages,
+    daily_counts,
+    delete_session,
+    get_checkpoint,
+    has_fts,
+    hourly_counts,
+    init_db,
+    insert_messages,
+    recent,
+    search,
+    set_checkpoint,
+)
+
+# 2026-02-16T00:00:00+09:00
+DAY0 = 1771167600
+
+
+class ActivityDBTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.conn = init_db(self.tmpdir / "activity.db")
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _insert(self, rows):
+        with self.conn:
+            return insert_messages(self.conn, rows)
+
+
+class TestMessages(ActivityDBTestCase):
+    def test_insert_is_idempotent(self):
+        rows = [("s1", 0, DAY0, "user", "hello there"), ("s1", 50, DAY0 + 1, "assistant", "hi back")]
+        self.assertEqual(self._insert(rows), 2)
+        self.assertEqual(self._insert(rows), 0)
+        self.assertEqual(count_messages(self.conn), 2)
+
+    def test_recent_newest_first(self):
+        self._insert([("s1", i, DAY0 + i, "user", f"message {i}") for i in range(10)])
+        self.assertEqual([r["text"] for r in recent(self.conn, 2)], ["message 9", "message 8"])
+
+    def test_delete_session(self):
+        self._insert([("s1", 0, DAY0, "user", "alpha words"), ("s2", 0, DAY0, "user", "alpha more")])
+        with self.conn:
+            set_checkpoint(self.conn, "s1", inode=1, size=10, mtime_ns=1, offset=10)
+            self.assertEqual(delete_session(self.conn, "s1"), 1)
+        self.assertIsNone(get_checkpoint(self.conn, "s1"))
+        self.assertEqual([r["session"] for r in search(self.conn, "alpha")], ["s2"])
+
+
+class TestSearch(ActivityDBTestCase):
+    def setUp(self):
+        super().setUp()
+        self._insert([
+            ("s1", 0, DAY0, "user", "Deploy the diary site tonight"),
+            ("s1", 1, DAY0 + 60, "assistant", "The diary build finished"),
+            ("s2", 0, DAY0 + 120, "user", "Check the health dashboard"),
+        ])
+
+    def test_fts_available(self):
+        self.assertTrue(has_fts(self.conn))
+
+    def test_all_words_must_match(self):
+        self.assertEqual([r["text"] for r in search(self.conn, "diary")],
+                         ["The diary build finished", "Deploy the diary site tonight"])
+        self.assertEqual(len(search(self.conn, "diary site")), 1)
+
+    def test_fts_syntax_is_literal(self):
+        self.assertEqual(search(self.conn, 'diary" OR (health'), [])
+        self.assertEqual(search(self.conn, "   "), [])
+
+    def test_like_fallback(self):
+        self.conn.execute("DROP TABLE activity_fts")
+        self.assertEqual(len(search(self.conn, "diary site")), 1)
+
+
+class TestAggregates(ActivityDBTestCase):
+    def test_daily_and_hourly_counts_use_local_time(self):
+        self._insert([
+            ("s1", 0, DAY0 + 30, "user", "just after midnight"),
+            ("s1", 1, DAY0 + 9 * 3600, "user", "morning"),
+            ("s1", 2, DAY0 - 60, "user", "late last night"),
+        ])
+        self.assertEqual(daily_counts(self.conn), {"2026-02-15": 1, "2026-02-16": 2})
+        self.assertEqual(daily_counts(self.conn, since=DAY0), {"2026-02-16": 2})
+        hours = hourly_counts(self.conn)
+        self.assertEqual((hours[0], hours[9], hours[23], sum(hours)), (1, 1, 1, 3))
+
+    def test_year_of_messages_queries_fast(self):
+        # ~200 messages a day for a year
+        self._insert(
+            ("s%d" % (i // 500), i, DAY0 + i * 432, "user" if i % 2 else "assistant",
+             f"message {i} about topic{i % 97}")
+            for i in range(73000)
+        )
+        start = time.perf_counter()
+        recent(self.conn, 15)
+        search(self.conn, "topic42", limit=20)
+        daily_counts(self.conn, since=DAY0 + 300 * 86400)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Tests for domain/classifier.py — compiled threshold classifiers."""
+
+import json
+import math
+import random
+import unittest
+
+from domain import constants, health, nurture
+from domain.classifier import ThresholdClassifier
+
+UPPER_TABLES = [
+    (constants.CPU_THRESHOLDS, constants.CPU_LABELS),
+    (constants.MEMORY_THRESHOLDS, constants.MEMORY_LABELS),
+    (constants.DISK_THRESHOLDS, constants.DISK_LABELS),
+    (constants.TEMPERATURE_THRESHOLDS, constants.TEMPERATURE_LABELS),
+    (constants.UPTIME_THRESHOLDS_DAYS, constants.UPTIME_LABELS),
+]
+LOWER_TABLES = [
+    (constants.ENERGY_THRESHOLDS, constants.ENERGY_LABELS),
+    (constants.MOOD_THRESHOLDS, constants.MOOD_LABELS),
+]
+
+
+def scan_upper(value, thresholds):
+    for bound, state in thresholds:
+        if bound is None or value < bound:
+            return state
+    return thresholds[-1][1]
+
+
+def scan_lower(value, thresholds):
+    for threshold, state in thresholds:
+        if threshold is None or value >= threshold:
+            return state
+    return thresholds[-1][1]
+
+
+def _values(thresholds):
+    """Every bound, its neighbours, a random spread and the extremes."""
+    rng = random.Random(42)
+    values = [-1e9, -1, 0, 1e9, float("inf"), -float("inf"), float("nan")]
+    for bound, _ in thresholds[:-1]:
+        values += [bound, bound - 1, bound + 1, bound - 1e-9, bound + 1e-9]
+    values += [rng.uniform(-50, 200) for _ in range(2000)]
+    values += list(range(-5, 120))
+    return values
+
+
+class TestEquivalence(unittest.TestCase):
+    def test_upper_bounds_match_linear_scan(self):
+        for thresholds, labels in UPPER_TABLES:
+            classifier = ThresholdClassifier.upper_bounds(thresholds, labels)
+            for value in _values(thresholds):
+                self.assertEqual(classifier.state(value), scan_upper(value, thresholds), value)
+                self.assertEqual(classifier.lookup(value)["state"], scan_upper(value, thresholds), value)
+
+    def test_lower_bounds_match_linear_scan(self):
+        for thresholds, labels in LOWER_TABLES:
+            classifier = ThresholdClassifier.lower_bounds(thresholds, labels)
+            for value in _values(thresholds):
+                self.assertEqual(classifier.state(value), scan_lower(value, thresholds), value)
+                self.assertEqual(classifier.lookup(value)["state"], scan_lower(value, thresholds), value)
+
+    def test_records_match_label_merge(self):
+        for thresholds, labels in UPPER_TABLES:
+            classifier = ThresholdClassifier.upper_bounds(thresholds, labels)
+            for value in _values(thresholds)[:50]:
+                state = scan_upper(value, thresholds)
+                self.assertEqual(classifier(value), {"state": state, **labels[state]})
+
+    def test_domain_classifiers(self):
+        for pct in range(0, 101):
+            self.assertEqual(health.classify_cpu(pct)["state"], scan_upper(pct, constants.CPU_THRESHOLDS))
+            self.assertEqual(nurture.classify_mood(pct)["state"], scan_lower(pct, constants.MOOD_THRESHOLDS))
+        self.assertEqual(health.classify_uptime(5 * 86400)["state"], "tired")
+
+    def test_overall_score_table(self):
+        for score in range(101):
+            result = health.calculate_overall_score(100 - score, 0, 0, None, 0)
+            expected = next(row for row in constants.OVERALL_SCORE_TABLE if result["score"] >= row[0])
+            self.assertEqual(result["state"], expected[1])
+
+
+class TestRecords(unittest.TestCase):
+    def test_shared_and_read_only(self):
+        a = health.classify_memory(10)
+        self.assertIs(a, health.classify_memory(20))
+        with self.assertRaises(TypeError):
+            a["state"] = "x"
+        self.assertEqual({**a, "usage_percent": 10}["state"], "spacious")
+
+    def test_records_serialize_as_json(self):
+        result = health.evaluate({"cpu_usage": 5, "temperature": 40})
+        self.assertEqual(json.loads(json.dumps(result))["cpu"], dict(result["cpu"]))
+
+    def test_nan_falls_to_catch_all(self):
+        self.assertEqual(health.classify_cpu(math.nan)["state"], "critical")
+        self.assertEqual(nurture.classify_energy(math.nan)["state"], "exhausted")
+
+
+class TestValidation(unittest.TestCase):
+    def test_unsorted_bounds(self):
+        with self.assertRaises(ValueError):
+            ThresholdClassifier.upper_bounds([(50, "a"), (20, "b"), (None, "c")], {})
+        with self.assertRaises(ValueError):
+            ThresholdClassifier.lower_bounds([(20, "a"), (50, "b"), (None, "c")], {})
+
+    def test_catch_all_must_be_last(self):
+        with self.assertRaises(ValueError):
+            ThresholdClassifier.upper_bounds([(None, "a"), (20, "b")], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+"""Tests for collectors/collect_activity.py — reverse session log reader."""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from collectors import collect_activity
+from collectors.collect_activity import (
+    build_output,
+    complete_end,
+    get_recent_activity,
+    ingest_sessions,
+    read_lines_forward,
+    read_lines_reverse,
+)
+from domain.activity import get_checkpoint, init_db, recent, search
+
+
+def _message(i, role="assistant", text=None):
+    return json.dumps({
+        "type": "message",
+        "timestamp": f"2026-02-16T00:{i // 60:02d}:{i % 60:02d}Z",
+        "message": {"role": role, "content": [{"type": "text", "text": text or f"message number {i}"}]},
+    })
+
+
+class TestReverseReader(unittest.TestCase):
+    def test_lines_last_first_across_blocks(self):
+        data = b"one\ntwo\n\nthree\nfour\n"
+        f = io.BytesIO(data)
+        self.assertEqual(
+            list(read_lines_reverse(f, 0, len(data), block_size=3)),
+            [b"four", b"three", b"two", b"one"],
+        )
+
+    def test_range_start(self):
+        data = b"one\ntwo\nthree\n"
+        f = io.BytesIO(data)
+        self.assertEqual(list(read_lines_reverse(f, 4, len(data), block_size=2)), [b"three", b"two"])
+
+    def test_forward_lines_with_offsets(self):
+        data = b"one\n\ntwo\nthree\n"
+        f = io.BytesIO(data)
+        self.assertEqual(list(read_lines_forward(f, 0, 9)), [(0, b"one"), (5, b"two")])
+
+    def test_complete_end_drops_partial_line(self):
+        data = b"one\ntwo\nthr"
+        f = io.BytesIO(data)
+        self.assertEqual(complete_end(f, 0, len(data), block_size=2), 8)
+        self.assertEqual(complete_end(io.BytesIO(b"abc"), 0, 3), 0)
+
+
+class TestRecentActivity(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.checkpoint = {}
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _session(self, name, lines, mtime=None):
+        path = self.dir / name
+        with open(path, "a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def _get(self, limit=15):
+        return get_recent_activity(limit, sessions_dir=self.dir, checkpoint=self.checkpoint)
+
+    def test_newest_messages_first(self):
+        self._session("a.jsonl", [_message(i) for i in range(30)])
+        texts = [a["text"] for a in self._get(limit=3)]
+        self.assertEqual(texts, ["message number 29", "message number 28", "message number 27"])
+
+    def test_filters(self):
+        self._session("a.jsonl", [
+            _message(1),
+            "not json",
+            json.dumps({"type": "tool_call"}),
+            _message(2, role="user", text="HEARTBEAT check"),
+            _message(3, text="[cron: job] ran"),
+            _message(4, text="short"),
+            _message(5, role="system"),
+        ])
+        self.assertEqual([a["text"] for a in self._get()], ["message number 1"])
+
+    def test_sessions_in_mtime_order(self):
+        self._session("old.jsonl", [_message(1)], mtime=1000)
+        self._session("new.jsonl", [_message(2)], mtime=2000)
+        self.assertEqual(len(self._get()), 2)
+        self.assertEqual(len(self._get(limit=1)), 1)
+
+    def test_stops_reading_at_limit(self):
+        self._session("a.jsonl", [_message(i % 3600) for i in range(20000)])
+        with mock.patch.object(collect_activity, "parse_activity",
+                               wraps=collect_activity.parse_activity) as parse:
+            self._get(limit=5)
+        self.assertEqual(parse.call_count, 5)
+
+    def test_unchanged_session_is_not_opened(self):
+        self._session("a.jsonl", [_message(1)])
+        first = self._get()
+        with mock.patch("builtins.open", side_effect=AssertionError("opened")):
+            self.assertEqual(self._get(), first)
+
+    def test_grown_session_reads_only_new_lines(self):
+        path = self._session("a.jsonl", [_message(i) for i in range(5)])
+        self._get(limit=3)
+        self._session("a.jsonl", [_message(10)])
+        with mock.patch.object(collect_activity, "parse_activity",
+                               wraps=collect_activity.parse_activity) as parse:
+            texts = [a["text"] for a in self._get(limit=3)]
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(texts, ["message number 10", "message number 4", "message number 3"])
+        self.assertEqual(self.checkpoint[str(path)]["offset"], path.stat().st_size)
+
+    def test_half_written_line_is_read_once_complete(self):
+        path = self._session("a.jsonl", [_message(1)])
+        line = _message(2)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line[:20])
+        self.assertEqual(len(self._get()), 1)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line[20:] + "\n")
+        self.assertEqual(len(self._get()), 2)
+
+    def test_replaced_session_is_rescanned(self):
+        path = self._session("a.jsonl", [_message(1), _message(2)])
+        self._get()
+        path.unlink()
+        self._session("a.jsonl", [_message(3)])
+        self.assertEqual([a["text"] for a in self._get()], ["message number 3"])
+
+    def test_checkpoint_drops_missing_sessions(self):
+        path = self._session("a.jsonl", [_message(1)])
+        self._get()
+        path.unlink()
+        self.assertEqual(self._get(), [])
+        self.assertEqual(self.checkpoint, {})
+
+
+class TestIngestion(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.sessions = self.dir / "sessions"
+        self.sessions.mkdir()
+        self.conn = init_db(self.dir / "activity.db")
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.dir)
+
+    def _append(self, name, lines):
+        path = self.sessions / name
+        with open(path, "a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+        return path
+
+    def _ingest(self):
+        return ingest_sessions(self.conn, self.sessions)
+
+    def test_incremental_ingest(self):
+        self._append("s1.jsonl", [_message(1), _message(2, role="user", text="HEARTBEAT")])
+        self._append("s2.jsonl", [_message(3)])
+        self.assertEqual(self._ingest(), 2)
+        self.assertEqual(self._ingest(), 0)
+        self._append("s1.jsonl", [_message(4)])
+        with mock.patch.object(collect_activity, "parse_activity",
+                               wraps=collect_activity.parse_activity) as parse:
+            self.assertEqual(self._ingest(), 1)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual([r["session"] for r in recent(self.conn)], ["s1", "s2", "s1"])
+
+    def test_replaced_session_is_reingested(self):
+        path = self._append("s1.jsonl", [_message(1), _message(2)])
+        self._ingest()
+        path.unlink()
+        self._append("s1.jsonl", [_message(3)])
+        self._ingest()
+        self.assertEqual([r["text"] for r in recent(self.conn)], ["message number 3"])
+
+    def test_deleted_session_is_removed(self):
+        self._append("s1.jsonl", [_message(1, text="needle in s1")])
+        gone = self._append("s2.jsonl", [_message(2, text="needle in s2")])
+        self._ingest()
+        gone.unlink()
+        with mock.patch.object(collect_activity, "log"):
+            self.assertEqual(self._ingest(), 0)
+        self.assertEqual([r["session"] for r in recent(self.conn)], ["s1"])
+        self.assertEqual([r["session"] for r in search(self.conn, "needle")], ["s1"])
+        self.assertIsNone(get_checkpoint(self.conn, "s2"))
+
+    def test_missing_sessions_dir_keeps_messages(self):
+        self._append("s1.jsonl", [_message(1)])
+        self._ingest()
+        shutil.rmtree(self.sessions)
+        self.assertEqual(self._ingest(), 0)
+        self.assertEqual(len(recent(self.conn)), 1)
+
+    def test_long_text_is_searchable_but_shown_truncated(self):
+        long_text = "start " + "x" * 300 + " needle"
+        self._append("s1.jsonl", [_message(1, text=long_text)])
+        self._ingest()
+        self.assertEqual(len(search(self.conn, "needle")), 1)
+        shown = build_output(self.conn)["activities"][0]["text"]
+        self.assertEqual(len(shown), 123)
+        self.assertTrue(shown.endswith("..."))
+
+    def test_output_matches_tail_reader(self):
+        self._append("s1.jsonl", [_message(i) for i in range(20)])
+        self._ingest()
+        output = build_output(self.conn)
+        self.assertEqual(output["activities"], get_recent_activity(sessions_dir=self.sessions))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,323 @@
+"""Tests for collectors/collect_health.py — metric sources over fixture trees."""
+
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from collectors import collect_health
+from collectors.collect_health import CpuSampler, LinuxProcSource, format_uptime
+
+PROC_STAT = """\
+cpu  1000 0 500 8000 500 0 0 0 0 0
+cpu0 1000 0 500 8000 500 0 0 0 0 0
+intr 12345
+"""
+
+MEMINFO = """\
+MemTotal:       16384000 kB
+MemFree:         2048000 kB
+MemAvailable:    8192000 kB
+Buffers:          512000 kB
+Cached:          4096000 kB
+"""
+
+
+class ProcTreeTestCase(unittest.TestCase):
+    """Base test case with a fixture /proc and /sys tree."""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        (self.root / "proc").mkdir()
+        self._write("proc/stat", PROC_STAT)
+        self._write("proc/meminfo", MEMINFO)
+        self._write("proc/uptime", "273720.55 1000.00\n")
+        self.source = LinuxProcSource(str(self.root))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write(self, rel, text):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="ascii")
+
+    def _zone(self, n, kind, milli):
+        self._write(f"sys/class/thermal/thermal_zone{n}/type", f"{kind}\n")
+        self._write(f"sys/class/thermal/thermal_zone{n}/temp", f"{milli}\n")
+
+
+class TestLinuxCPU(ProcTreeTestCase):
+    def test_first_reading_is_average_since_boot(self):
+        # busy = user + system = 1500 of 10000 ticks
+        self.assertEqual(self.source.cpu_usage(), 15.0)
+
+    def test_second_reading_uses_delta(self):
+        self.source.cpu_usage()
+        self._write("proc/stat", "cpu  1300 0 600 8600 500 0 0 0 0 0\n")
+        # +400 busy of +1000 total
+        self.assertEqual(self.source.cpu_usage(), 40.0)
+
+    def test_iowait_counts_as_idle(self):
+        self._write("proc/stat", "cpu  0 0 0 500 500 0 0 0 0 0\n")
+        self.assertEqual(self.source.cpu_usage(), 0.0)
+
+    def test_bad_header_raises(self):
+        self._write("proc/stat", "intr 1\n")
+        with self.assertRaises(ValueError):
+            self.source.cpu_usage()
+
+
+class FakeTicks:
+    """Scripted (busy, total) readings and wall clock for CpuSampler."""
+
+    def __init__(self):
+        self.busy = 0
+        self.total = 0
+        self.now = 1000.0
+
+    def advance(self, seconds, busy_pct, ticks_per_sec=100):
+        ticks = int(seconds * ticks_per_sec)
+        self.busy += ticks * busy_pct // 100
+        self.total += ticks
+        self.now += seconds
+
+    def __call__(self):
+        return self.busy, self.total
+
+
+class TestCpuSampler(ProcTreeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ticks = FakeTicks()
+        self.ticks.advance(1000, 10)
+
+    def _sampler(self, state_path=None):
+        return CpuSampler(self.ticks, state_path, tau=600, clock=lambda: self.ticks.now)
+
+    def test_interval_usage_and_ewma(self):
+        sampler = self._sampler()
+        self.assertEqual(sampler.sample(), 10.0)
+        self.assertEqual(sampler.ewma, 10.0)
+        self.ticks.advance(600, 90)
+        self.assertEqual(sampler.sample(), 90.0)
+        # one time constant: 1 - 1/e of the step
+        self.assertEqual(sampler.ewma, 60.6)
+
+    def test_ewma_damps_short_spikes(self):
+        sampler = self._sampler()
+        sampler.sample()
+        self.ticks.advance(60, 100)
+        sampler.sample()
+        self.assertLess(sampler.ewma, 20.0)
+
+    def test_state_file_survives_restarts(self):
+        state = str(self.root / "cpu-state.json")
+        self._sampler(state).sample()
+        self.ticks.advance(600, 50)
+        sampler = self._sampler(state)
+        self.assertEqual(sampler.sample(), 50.0)
+        self.assertEqual(sampler.ewma, 35.3)
+
+    def test_counter_reset_starts_over(self):
+        sampler = self._sampler()
+        sampler.sample()
+        self.ticks.busy, self.ticks.total = 30, 100  # reboot
+        self.assertEqual(sampler.sample(), 30.0)
+        self.assertEqual(sampler.ewma, 30.0)
+
+    def test_wrapped_counters_keep_ewma(self):
+        wrap = collect_health.MACH_TICK_WRAP
+        self.ticks.busy, self.ticks.total = wrap - 1000, 2 * wrap - 1000
+        boot = lambda: 500.0
+        sampler = CpuSampler(lambda: (self.ticks.busy % wrap, self.ticks.total % wrap),
+                             tau=600, clock=lambda: self.ticks.now, wrap=wrap, read_boot_time=boot)
+        sampler.sample()
+        ewma = sampler.ewma
+        self.ticks.advance(600, 40)  # busy and total both wrap
+        self.assertEqual(sampler.sample(), 40.0)
+        self.assertNotEqual(sampler.ewma, 40.0)  # continued, not reset
+        self.assertAlmostEqual(sampler.ewma, ewma + (1 - math.exp(-1)) * (40.0 - ewma), delta=0.1)
+
+    def test_boot_time_change_starts_over(self):
+        boots = iter([500.0, 90000.0])
+        sampler = CpuSampler(self.ticks, tau=600, clock=lambda: self.ticks.now,
+                             read_boot_time=lambda: next(boots))
+        sampler.sample()
+        self.ticks.advance(600, 90)  # counters kept growing, but it's a new boot
+        busy, total = self.ticks()
+        self.assertEqual(sampler.sample(), round(busy / total * 100, 1))
+        self.assertEqual(sampler.ewma, sampler.usage)
+
+    def test_linux_boot_time(self):
+        self.assertIsNone(self.source.read_boot_time())
+        self._write("proc/stat", PROC_STAT + "btime 1770940800\n")
+        self.assertEqual(self.source.read_boot_time(), 1770940800.0)
+
+    def test_corrupt_state_is_ignored(self):
+        self._write("cpu-state.json", "{not json")
+        sampler = self._sampler(str(self.root / "cpu-state.json"))
+        self.assertEqual(sampler.sample(), 10.0)
+
+    def test_score_uses_smoothed_usage(self):
+        self.source.cpu_usage()  # 15% since boot
+        self._write("proc/stat", "cpu  11000 0 500 8000 500 0 0 0 0 0\n")
+        data = collect_health.collect_all(self.source)
+        self.assertEqual(data["cpu"]["usage_percent"], 100.0)
+        self.assertLess(data["cpu"]["smoothed_percent"], 100.0)
+        self.assertEqual(data["cpu"]["state"], "idle")
+
+
+class TestLinuxMemory(ProcTreeTestCase):
+    def test_used_is_total_minus_available(self):
+        mem = self.source.memory()
+        self.assertEqual(mem["usage_percent"], 50.0)
+        self.assertEqual(mem["total_gb"], 15.6)
+
+    def test_old_kernel_without_memavailable(self):
+        self._write("proc/meminfo", "MemTotal: 1000 kB\nMemFree: 100 kB\nBuffers: 100 kB\nCached: 50 kB\n")
+        self.assertEqual(self.source.memory()["usage_percent"], 75.0)
+
+
+class TestLinuxTemperature(ProcTreeTestCase):
+    def test_no_thermal_zones(self):
+        self.assertIsNone(self.source.temperature())
+
+    def test_prefers_cpu_zone(self):
+        self._zone(0, "acpitz", 80000)
+        self._zone(1, "x86_pkg_temp", 55500)
+        self.assertEqual(self.source.temperature(), 55.5)
+
+    def test_falls_back_to_hottest_zone(self):
+        self._zone(0, "acpitz", 40000)
+        self._zone(1, "pch_skylake", 61000)
+        self.assertEqual(self.source.temperature(), 61.0)
+
+    def test_unreadable_zone_is_skipped(self):
+        self._zone(0, "x86_pkg_temp", 50000)
+        self._write("sys/class/thermal/thermal_zone1/type", "acpitz\n")
+        self.assertEqual(self.source.temperature(), 50.0)
+
+
+class TestLinuxUptime(ProcTreeTestCase):
+    def test_uptime(self):
+        self.assertEqual(self.source.uptime(), {"seconds": 273720, "display": "3d 4h 2m"})
+
+    def test_format_uptime(self):
+        self.assertEqual(format_uptime(59), "0m")
+        self.assertEqual(format_uptime(3600), "1h 0m")
+
+
+class TestCollectAll(ProcTreeTestCase):
+    def test_feeds_domain_evaluate(self):
+        self._zone(0, "x86_pkg_temp", 45000)
+        data = collect_health.collect_all(self.source)
+        self.assertEqual(data["cpu"]["usage_percent"], 15.0)
+        self.assertEqual(data["memory"]["usage_percent"], 50.0)
+        self.assertEqual(data["temperature"]["celsius"], 45.0)
+        self.assertEqual(data["uptime"]["seconds"], 273720)
+        self.assertIn("score", data["overall"])
+
+    def test_metric_dicts_are_copies_of_domain_records(self):
+        self._zone(0, "x86_pkg_temp", 45000)
+        data = collect_health.collect_all(self.source)
+        for name in ("cpu", "memory", "disk", "temperature", "uptime"):
+            data[name]["state"] = "edited"  # shared domain records are read-only
+        again = collect_health.collect_all(self.source)
+        self.assertNotEqual(again["cpu"]["state"], "edited")
+
+    def test_missing_files_null_their_metric(self):
+        os.remove(self.root / "proc" / "meminfo")
+        data = collect_health.collect_all(self.source)
+        self.assertIsNone(data["memory"])
+        self.assertIsNotNone(data["uptime"])
+
+    @unittest.skipUnless(os.path.exists("/proc/stat"), "needs Linux /proc")
+    def test_real_proc_is_fast(self):
+        source = LinuxProcSource()
+        start = time.perf_counter()
+        collect_health.collect_all(source)
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+
+class SlowSource(LinuxProcSource):
+    """Fixture source whose probes sleep for the given seconds."""
+
+    def __init__(self, root, delays):
+        super().__init__(root)
+        self.delays = delays
+
+    def _delayed(self, name, fn):
+        time.sleep(self.delays.get(name, 0))
+        return fn()
+
+    def cpu_usage(self):
+        return self._delayed("cpu", super().cpu_usage)
+
+    def memory(self):
+        return self._delayed("memory", super().memory)
+
+    def uptime(self):
+        return self._delayed("uptime", super().uptime)
+
+
+class HungSource(LinuxProcSource):
+    """Fixture source whose uptime probe runs a command that never returns in time."""
+
+    def uptime(self):
+        return collect_health.run_command([sys.executable, "-c", "import time; time.sleep(30)"])
+
+
+class TestRunProbes(ProcTreeTestCase):
+    def test_probes_run_concurrently(self):
+        source = SlowSource(str(self.root), {"cpu": 0.2, "memory": 0.2, "uptime": 0.2})
+        start = time.perf_counter()
+        results, timed_out = collect_health.run_probes(source)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(timed_out, [])
+        self.assertEqual(results["cpu"], 15.0)
+
+    def test_probe_deadline(self):
+        source = SlowSource(str(self.root), {"memory": 1.0})
+        timeouts = dict(collect_health.PROBE_TIMEOUTS, memory=0.05)
+        start = time.perf_counter()
+        results, timed_out = collect_health.run_probes(source, timeouts)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(timed_out, ["memory"])
+        self.assertNotIn("memory", results)
+        self.assertIn("uptime", results)
+
+    def test_global_budget(self):
+        source = SlowSource(str(self.root), {"cpu": 1.0, "uptime": 1.0})
+        results, timed_out = collect_health.run_probes(source, budget=0.05)
+        self.assertEqual(timed_out, ["cpu", "uptime"])
+        self.assertIn("memory", results)
+
+    def test_hung_command_is_killed_at_deadline(self):
+        source = HungSource(str(self.root))
+        timeouts = dict(collect_health.PROBE_TIMEOUTS, uptime=0.2)
+        results, timed_out = collect_health.run_probes(source, timeouts)
+        self.assertEqual(timed_out, ["uptime"])
+        probes = [t for t in threading.enumerate() if t.name == "probe-uptime"]
+        self.assertTrue(all(t.daemon for t in probes))
+        for t in probes:
+            t.join(timeout=2)  # the child is killed, so the thread ends too
+            self.assertFalse(t.is_alive())
+
+    def test_timed_out_probes_are_reported(self):
+        source = SlowSource(str(self.root), {"uptime": 1.0})
+        with mock.patch.dict(collect_health.PROBE_TIMEOUTS, uptime=0.05):
+            data = collect_health.collect_all(source)
+        self.assertEqual(data["timed_out"], ["uptime"])
+        self.assertIsNone(data["uptime"])
+        self.assertIsNotNone(data["memory"])
+
+
+if __name__ == "__main__":
+    unittest.main()
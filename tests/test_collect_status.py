@@ -0,0 +1,285 @@
+"""Tests for collectors/collect_status.py — memory-directory scan and --watch mode."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from collectors import collect_status
+from collectors.collect_status import (
+    JST,
+    GatewayProbe,
+    PresenceWatcher,
+    get_last_activity,
+    scan_memory_dir,
+    seconds_until_change,
+)
+
+
+class MemoryScanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.memory = self.tmpdir / "memory"
+        self.memory.mkdir()
+        self.state = self.tmpdir / "scan.json"
+        self.now = 1_000_000.0
+        for n in range(20):
+            self._note(f"2026-01-{n + 1:02d}.md", 1_700_000_000 + n)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _note(self, name, mtime):
+        path = self.memory / name
+        path.write_text("- note\n", encoding="utf-8")
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def _latest(self):
+        dt, path = get_last_activity(self.memory, self.state, clock=lambda: self.now)
+        return path.name if path else None, dt.timestamp() if dt else None
+
+
+class TestScanMemoryDir(MemoryScanTestCase):
+    def test_newest_first_md_only(self):
+        (self.memory / "notes.txt").write_text("x", encoding="utf-8")
+        hot = scan_memory_dir(self.memory, keep=3)
+        self.assertEqual([name for _, name in hot], ["2026-01-20.md", "2026-01-19.md", "2026-01-18.md"])
+
+
+class TestGetLastActivity(MemoryScanTestCase):
+    def test_latest_note(self):
+        self.assertEqual(self._latest(), ("2026-01-20.md", 1_700_000_019))
+
+    def test_unchanged_dir_skips_full_scan(self):
+        self._latest()
+        with mock.patch.object(collect_status, "scan_memory_dir") as scan:
+            self.assertEqual(self._latest()[0], "2026-01-20.md")
+        scan.assert_not_called()
+
+    def test_in_place_edit_of_hot_note_is_seen(self):
+        self._latest()
+        dir_mtime = self.memory.stat().st_mtime_ns
+        os.utime(self.memory / "2026-01-15.md", (1_800_000_000, 1_800_000_000))
+        self.assertEqual(self.memory.stat().st_mtime_ns, dir_mtime)
+        self.assertEqual(self._latest(), ("2026-01-15.md", 1_800_000_000))
+
+    def test_new_note_triggers_rescan(self):
+        self._latest()
+        self._note("2026-02-01.md", 1_750_000_000)
+        os.utime(self.memory, ns=(0, 1))  # make sure the dir mtime differs
+        self.assertEqual(self._latest()[0], "2026-02-01.md")
+
+    def test_periodic_full_rescan(self):
+        self._latest()
+        os.utime(self.memory / "2026-01-01.md", (1_800_000_000, 1_800_000_000))  # not in hot set
+        self.assertEqual(self._latest()[0], "2026-01-20.md")
+        self.now += collect_status.FULL_RESCAN_SEC
+        self.assertEqual(self._latest()[0], "2026-01-01.md")
+
+    def test_forced_scan_sees_cold_in_place_edit(self):
+        self._latest()
+        os.utime(self.memory / "2026-01-01.md", (1_800_000_000, 1_800_000_000))  # not in hot set
+        dt, path = get_last_activity(self.memory, self.state, clock=lambda: self.now, force=True)
+        self.assertEqual(path.name, "2026-01-01.md")
+
+    def test_unchanged_state_is_not_rewritten(self):
+        self._latest()
+        with mock.patch.object(collect_status, "write_json_atomic") as write:
+            self._latest()
+            write.assert_not_called()
+            os.utime(self.memory / "2026-01-18.md", (1_800_000_000, 1_800_000_000))
+            self._latest()
+            write.assert_called_once()
+
+    def test_vanished_hot_note_triggers_rescan(self):
+        self._latest()
+        dir_mtime = self.memory.stat().st_mtime_ns
+        (self.memory / "2026-01-20.md").unlink()
+        os.utime(self.memory, ns=(dir_mtime, dir_mtime))
+        self.assertEqual(self._latest()[0], "2026-01-19.md")
+
+    def test_missing_dir_and_empty_dir(self):
+        shutil.rmtree(self.memory)
+        self.assertEqual(self._latest(), (None, None))
+        self.memory.mkdir()
+        self.assertEqual(self._latest(), (None, None))
+
+    def test_without_state_file(self):
+        dt, path = get_last_activity(self.memory, None)
+        self.assertEqual(path.name, "2026-01-20.md")
+        self.assertFalse(self.state.exists())
+
+
+class TestGatewayProbe(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.proc = self.tmpdir / "proc"
+        self.proc.mkdir()
+        self.pidfile = self.tmpdir / "gateway.pid"
+        self.probe = GatewayProbe(self.proc, self.pidfile)
+        patcher = mock.patch.object(collect_status, "heartbeat_alive", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _process(self, pid, comm):
+        (self.proc / str(pid)).mkdir()
+        (self.proc / str(pid) / "comm").write_text(comm + "\n", encoding="utf-8")
+
+    def test_pidfile(self):
+        self._process(os.getpid(), "openclaw-gatewa")
+        self.pidfile.write_text(f"{os.getpid()}\n", encoding="ascii")
+        self.assertTrue(self.probe.alive())
+        self.assertEqual(self.probe.pid, os.getpid())
+
+    def test_proc_scan_by_truncated_name(self):
+        self._process(1, "init")
+        self._process(os.getpid(), "openclaw-gatewa")
+        self.assertTrue(self.probe.alive())
+        self.assertEqual(self.probe.pid, os.getpid())
+
+    def test_stale_pid_is_dropped(self):
+        self._process(os.getpid(), "openclaw-gatewa")
+        self.assertTrue(self.probe.alive())
+        (self.proc / str(os.getpid()) / "comm").write_text("python3\n", encoding="utf-8")
+        self.assertFalse(self.probe.alive())
+        self.assertIsNone(self.probe.pid)
+
+    def test_no_gateway_falls_back_to_heartbeat(self):
+        self._process(1, "init")
+        self.assertFalse(self.probe.alive())
+        collect_status.heartbeat_alive.return_value = True
+        self.assertTrue(self.probe.alive())
+
+    def test_without_proc_uses_pgrep_check(self):
+        probe = GatewayProbe(self.tmpdir / "missing", self.pidfile)
+        with mock.patch.object(collect_status, "check_gateway", return_value=True) as check:
+            self.assertTrue(probe.alive())
+        check.assert_called_once()
+
+
+class TestSecondsUntilChange(unittest.TestCase):
+    NOW = datetime(2026, 2, 1, 10, 30, tzinfo=JST)
+
+    def test_next_period_boundary(self):
+        # 10:30 "active" -> 12:00 "afternoon"
+        self.assertEqual(seconds_until_change(None, None, self.NOW), 90 * 60)
+
+    def test_online_threshold(self):
+        last = self.NOW - timedelta(minutes=20)
+        self.assertEqual(seconds_until_change(last, None, self.NOW),
+                         collect_status.ONLINE_THRESHOLD_SEC - 20 * 60 + 1)
+
+    def test_heartbeat_expiry(self):
+        mtime = self.NOW.timestamp() - 100
+        self.assertEqual(seconds_until_change(None, mtime, self.NOW),
+                         collect_status.HEARTBEAT_THRESHOLD_SEC - 100 + 1)
+
+    def test_past_thresholds_are_ignored(self):
+        last = self.NOW - timedelta(days=1)
+        self.assertEqual(seconds_until_change(last, None, self.NOW), 90 * 60)
+
+
+class FakeGateway:
+    def __init__(self):
+        self.up = True
+
+    def alive(self):
+        return self.up
+
+
+class TestPresenceWatcher(MemoryScanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now_dt = datetime.fromtimestamp(1_700_000_100, tz=JST)
+        self.gateway = FakeGateway()
+        self.writes = []
+        patchers = [
+            mock.patch.object(collect_status, "MEMORY_DIR", self.memory),
+            mock.patch.object(collect_status, "SCAN_STATE_FILE", None),
+            mock.patch.object(collect_status, "HEARTBEAT_FILE", self.tmpdir / "HEARTBEAT.md"),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+        self.watcher = PresenceWatcher(
+            self.gateway,
+            write=lambda data, path: self.writes.append(data),
+            clock=lambda: self.now_dt,
+        )
+
+    def test_writes_only_when_inputs_change(self):
+        self.assertTrue(self.watcher.update())
+        self.assertEqual(self.writes[-1]["status"], "online")
+        self.now_dt += timedelta(seconds=30)
+        self.assertFalse(self.watcher.update())
+        self.gateway.up = False
+        self.assertTrue(self.watcher.update())
+        self.assertEqual(self.writes[-1]["status"], "offline")
+        self.assertEqual(len(self.writes), 2)
+
+    def test_new_note_is_written(self):
+        self.watcher.update()
+        self._note("2026-02-01.md", 1_700_000_200)
+        self.watcher.notify()
+        self.assertTrue(self.watcher.update())
+        self.assertEqual(self.writes[-1]["last_activity"],
+                         collect_status.format_iso(datetime.fromtimestamp(1_700_000_200, tz=JST)))
+
+    def test_event_forces_full_scan(self):
+        with mock.patch.object(collect_status, "SCAN_STATE_FILE", self.state):
+            self.watcher.update()
+            os.utime(self.memory / "2026-01-01.md", (1_700_000_300, 1_700_000_300))  # cold note
+            self.assertFalse(self.watcher.update())  # no event: hot set only
+            self.watcher.notify()
+            self.assertTrue(self.watcher.update())
+        self.assertTrue(self.writes[-1]["last_activity"].startswith(
+            collect_status.format_iso(datetime.fromtimestamp(1_700_000_300, tz=JST))))
+
+    def test_pidfile_events_wake(self):
+        pidfile = self.tmpdir / "gateway.pid"
+        handler = collect_status._WakeHandler(self.watcher, pidfile)
+        handler.on_any_event(mock.Mock(event_type="modified", src_path=str(pidfile), dest_path=""))
+        self.assertTrue(self.watcher._wake.is_set())
+
+    def test_note_change_events_wake(self):
+        handler = collect_status._WakeHandler(self.watcher, self.tmpdir / "gateway.pid")
+        for event_type in ("created", "modified", "deleted", "moved"):
+            self.watcher._wake.clear()
+            handler.on_any_event(mock.Mock(event_type=event_type,
+                                           src_path=str(self.memory / "2026-02-01.md"), dest_path=""))
+            self.assertTrue(self.watcher._wake.is_set(), event_type)
+
+    def test_read_events_do_not_wake(self):
+        handler = collect_status._WakeHandler(self.watcher, self.tmpdir / "gateway.pid")
+        for event_type in ("opened", "closed", "closed_no_write"):
+            handler.on_any_event(mock.Mock(event_type=event_type,
+                                           src_path=str(self.memory / "2026-02-01.md"), dest_path=""))
+        self.assertFalse(self.watcher._wake.is_set())
+
+    def test_idle_wake_writes_nothing(self):
+        with mock.patch.object(collect_status, "SCAN_STATE_FILE", self.state):
+            self.watcher.update()
+            self.assertEqual(self.watcher.timeout(), collect_status.GATEWAY_POLL_SEC)
+            state_mtime = self.state.stat().st_mtime_ns
+            self.now_dt += timedelta(seconds=collect_status.GATEWAY_POLL_SEC)
+            self.assertFalse(self.watcher.update())
+        self.assertEqual(self.state.stat().st_mtime_ns, state_mtime)
+        self.assertEqual(len(self.writes), 1)
+
+    def test_threshold_crossing_without_events(self):
+        self.watcher.update()
+        self.assertLessEqual(self.watcher.timeout(), collect_status.GATEWAY_POLL_SEC)
+        self.now_dt += timedelta(seconds=collect_status.ONLINE_THRESHOLD_SEC)
+        self.assertTrue(self.watcher.update())
+        self.assertEqual(self.writes[-1]["status"], "away")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ import tempfile
 import unittest
 from pathlib import Path
 
+from domain import diary
 from domain.diary import (
     SCHEMA_VERSION,
     init_db,
@@ -15,6 +16,8 @@ from domain.diary import (
     upsert_entry,
     get_entry,
     get_all_entries,
+    iter_entries,
+    RENDER_COLUMNS,
     delete_entry,
     count_entries,
     get_translation_cache,
@@ -26,6 +29,13 @@ from domain.diary import (
     set_metadata,
     get_metadata,
     migrate_file_caches,
+    get_source_fingerprints,
+    set_source_fingerprint,
+    delete_source_fingerprint,
+    get_stale_render_dates,
+    set_rendered_fragments,
+    transaction,
+    in_transaction,
 )
 
 
@@ -64,6 +74,7 @@ class TestInitDB(DiaryDBTestCase):
             "recap_cache",
             "entry_tags",
             "entry_metadata",
+            "source_fingerprints",
         }
         self.assertTrue(expected.issubset(tables), f"Missing tables: {expected - tables}")
 
@@ -89,6 +100,21 @@ class TestInitDB(DiaryDBTestCase):
         self.assertEqual(get_schema_version(conn2), "99.0")
         conn2.close()
 
+    def test_adds_columns_to_old_schema(self):
+        """A DB created before fragment caching gains the new columns."""
+        self.conn.close()
+        os.unlink(self.db_path)
+        old = sqlite3.connect(self.db_path)
+        old.execute(
+            "CREATE TABLE diary_entries (date TEXT PRIMARY KEY, integrated_md TEXT NOT NULL,"
+            " integrated_hash TEXT NOT NULL, html_en TEXT NOT NULL)"
+        )
+        old.commit()
+        old.close()
+        self.conn = init_db(self.db_path)
+        columns = {r["name"] for r in self.conn.execute("PRAGMA table_info(diary_entries)")}
+        self.assertTrue({"article_html", "card_html", "render_version"} <= columns)
+
     def test_row_factory(self):
         """Connection uses Row factory for dict-like access."""
         self.assertIs(self.conn.row_factory, sqlite3.Row)
@@ -241,6 +267,61 @@ class TestGetAllEntries(DiaryDBTestCase):
             get_all_entries(self.conn, order="RANDOM")
 
 
+class TestIterEntries(DiaryDBTestCase):
+    """Test lazy, projected entry iteration."""
+
+    def setUp(self):
+        super().setUp()
+        self.dates = [f"2026-02-{d:02d}" for d in range(1, 8)]
+        for d in self.dates:
+            upsert_entry(
+                self.conn,
+                date=d,
+                memory_md=f"memory {d}",
+                integrated_md=f"content {d}",
+                integrated_hash=f"h{d}",
+                html_en=f"<p>{d}</p>",
+                preview_en=f"preview {d}",
+            )
+
+    def test_is_lazy(self):
+        it = iter_entries(self.conn)
+        self.assertEqual(next(it)["date"], "2026-02-07")
+
+    def test_batches_cover_all_rows_desc(self):
+        dates = [e["date"] for e in iter_entries(self.conn, batch_size=3)]
+        self.assertEqual(dates, sorted(self.dates, reverse=True))
+
+    def test_batches_cover_all_rows_asc(self):
+        dates = [e["date"] for e in iter_entries(self.conn, order="asc", batch_size=2)]
+        self.assertEqual(dates, self.dates)
+
+    def test_exact_batch_multiple(self):
+        dates = [e["date"] for e in iter_entries(self.conn, batch_size=7)]
+        self.assertEqual(len(dates), 7)
+
+    def test_render_projection_excludes_markdown(self):
+        entry = next(iter_entries(self.conn, columns="render"))
+        self.assertEqual(set(entry), set(RENDER_COLUMNS))
+        self.assertNotIn("memory_md", entry)
+        self.assertEqual(entry["preview_en"], "preview 2026-02-07")
+
+    def test_explicit_columns_always_include_date(self):
+        entry = next(iter_entries(self.conn, columns=["html_en"]))
+        self.assertEqual(entry, {"date": "2026-02-07", "html_en": "<p>2026-02-07</p>"})
+
+    def test_full_matches_get_all_entries(self):
+        self.assertEqual(list(iter_entries(self.conn, batch_size=2)), get_all_entries(self.conn))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            list(iter_entries(self.conn, columns="everything"))
+        with self.assertRaises(ValueError):
+            list(iter_entries(self.conn, columns=["date; DROP TABLE diary_entries"]))
+        with self.assertRaises(ValueError):
+            list(iter_entries(self.conn, batch_size=0))
+
+
 class TestDeleteEntry(DiaryDBTestCase):
     """Test entry deletion."""
 
@@ -291,6 +372,90 @@ class TestCountEntries(DiaryDBTestCase):
         self.assertEqual(count_entries(self.conn), 3)
 
 
+# ─── Rendered Fragments ──────────────────────────────────────────────────────
+
+
+class TestRenderedFragments(DiaryDBTestCase):
+    """Test cached article/card HTML bookkeeping."""
+
+    def setUp(self):
+        super().setUp()
+        for d in ["2026-02-15", "2026-02-16"]:
+            upsert_entry(
+                self.conn,
+                date=d,
+                integrated_md="test",
+                integrated_hash="h",
+                html_en="<p>test</p>",
+            )
+
+    def _render(self, d, version="v1"):
+        set_rendered_fragments(
+            self.conn, d, render_version=version,
+            article_html=f"<article>{d}</article>", card_html=f"<a>{d}</a>",
+        )
+
+    def test_new_entries_are_stale(self):
+        self.assertEqual(get_stale_render_dates(self.conn, "v1"), ["2026-02-16", "2026-02-15"])
+
+    def test_rendered_entries_are_fresh(self):
+        self._render("2026-02-15")
+        self._render("2026-02-16")
+        self.assertEqual(get_stale_render_dates(self.conn, "v1"), [])
+        entry = get_entry(self.conn, "2026-02-16")
+        self.assertEqual(entry["article_html"], "<article>2026-02-16</article>")
+        self.assertEqual(entry["card_html"], "<a>2026-02-16</a>")
+
+    def test_version_change_makes_all_stale(self):
+        self._render("2026-02-15")
+        self._render("2026-02-16")
+        self.assertEqual(len(get_stale_render_dates(self.conn, "v2")), 2)
+
+    def test_upsert_clears_fragments(self):
+        self._render("2026-02-15")
+        self._render("2026-02-16")
+        upsert_entry(
+            self.conn,
+            date="2026-02-16",
+            integrated_md="changed",
+            integrated_hash="h2",
+            html_en="<p>changed</p>",
+        )
+        self.assertEqual(get_stale_render_dates(self.conn, "v1"), ["2026-02-16"])
+        self.assertIsNone(get_entry(self.conn, "2026-02-16")["article_html"])
+
+    def test_unchanged_upsert_keeps_fragments(self):
+        self._render("2026-02-15")
+        self._render("2026-02-16")
+        before = get_entry(self.conn, "2026-02-16")
+        upsert_entry(
+            self.conn,
+            date="2026-02-16",
+            memory_md="sources moved, content unchanged",
+            integrated_md="test",
+            integrated_hash="h",
+            html_en="<p>test</p>",
+        )
+        after = get_entry(self.conn, "2026-02-16")
+        self.assertEqual(get_stale_render_dates(self.conn, "v1"), [])
+        self.assertEqual(after["article_html"], "<article>2026-02-16</article>")
+        self.assertEqual(after["render_version"], "v1")
+        self.assertEqual(after["created_at"], before["created_at"])
+        self.assertEqual(after["memory_md"], "sources moved, content unchanged")
+
+    def test_recap_change_clears_fragments(self):
+        self._render("2026-02-16")
+        upsert_entry(
+            self.conn,
+            date="2026-02-16",
+            integrated_md="test",
+            integrated_hash="h",
+            html_en="<p>test</p>",
+            recap_en="new recap",
+        )
+        self.assertIn("2026-02-16", get_stale_render_dates(self.conn, "v1"))
+
+
 # ─── Translation Cache ───────────────────────────────────────────────────────
 
 
@@ -426,6 +591,136 @@ class TestMetadata(DiaryDBTestCase):
         self.assertEqual(get_metadata(self.conn, "2026-02-16"), {})
 
 
+# ─── Transactions ────────────────────────────────────────────────────────────
+
+
+class TestTransaction(DiaryDBTestCase):
+    """Test batching writes with transaction()."""
+
+    def setUp(self):
+        super().setUp()
+        self.reader = sqlite3.connect(self.db_path)
+
+    def tearDown(self):
+        self.reader.close()
+        super().tearDown()
+
+    def _visible(self):
+        return self.reader.execute("SELECT COUNT(*) FROM diary_entries").fetchone()[0]
+
+    def _upsert(self, date):
+        upsert_entry(
+            self.conn, date=date, integrated_md="x", integrated_hash="h", html_en="<p>x</p>",
+        )
+
+    def test_autocommit_by_default(self):
+        self._upsert("2026-02-16")
+        self.assertEqual(self._visible(), 1)
+
+    def test_commits_once_at_exit(self):
+        with transaction(self.conn):
+            self._upsert("2026-02-15")
+            self._upsert("2026-02-16")
+            set_tags(self.conn, "2026-02-16", ["a", "b"])
+            self.assertTrue(in_transaction(self.conn))
+            self.assertEqual(self._visible(), 0)
+        self.assertFalse(in_transaction(self.conn))
+        self.assertEqual(self._visible(), 2)
+        self.assertEqual(get_tags(self.conn, "2026-02-16"), ["a", "b"])
+
+    def test_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with transaction(self.conn):
+                self._upsert("2026-02-16")
+                raise RuntimeError("boom")
+        self.assertIsNone(get_entry(self.conn, "2026-02-16"))
+        self.assertFalse(in_transaction(self.conn))
+
+    def test_nested_blocks_join_outer(self):
+        with transaction(self.conn):
+            with transaction(self.conn):
+                self._upsert("2026-02-16")
+            self.assertEqual(self._visible(), 0)
+        self.assertEqual(self._visible(), 1)
+
+    def test_depth_is_per_connection(self):
+        other = init_db(self.db_path)
+        try:
+            with transaction(self.conn):
+                self.assertFalse(in_transaction(other))
+                upsert_entry(other, date="2026-02-14", integrated_md="x",
+                             integrated_hash="h", html_en="<p>x</p>")
+                self.assertEqual(self._visible(), 1)  # other autocommits
+        finally:
+            other.close()
+
+    def test_plain_connection(self):
+        plain = sqlite3.connect(self.db_path)
+        try:
+            upsert_entry(plain, date="2026-02-13", integrated_md="x",
+                         integrated_hash="h", html_en="<p>x</p>")
+            self.assertEqual(self._visible(), 1)  # autocommits outside a block
+            with transaction(plain):
+                with transaction(plain):
+                    upsert_entry(plain, date="2026-02-14", integrated_md="x",
+                                 integrated_hash="h", html_en="<p>x</p>")
+                self.assertTrue(in_transaction(plain))
+                self.assertFalse(in_transaction(self.conn))
+                self.assertEqual(self._visible(), 1)
+            self.assertFalse(in_transaction(plain))
+            self.assertEqual(self._visible(), 2)
+            with self.assertRaises(RuntimeError):
+                with transaction(plain):
+                    delete_entry(plain, "2026-02-14")
+                    raise RuntimeError("boom")
+            self.assertEqual(self._visible(), 2)
+            self.assertEqual(diary._PLAIN_TXN_DEPTH, {})
+        finally:
+            plain.close()
+
+
+# ─── Source Fingerprints ─────────────────────────────────────────────────────
+
+
+class TestSourceFingerprints(DiaryDBTestCase):
+    """Test source fingerprint bookkeeping."""
+
+    def test_set_and_get(self):
+        set_source_fingerprint(
+            self.conn, "2026-02-16", "memory", size=10, mtime_ns=123, sha256="abc"
+        )
+        self.assertEqual(
+            get_source_fingerprints(self.conn),
+            {("2026-02-16", "memory"): {"size": 10, "mtime_ns": 123, "sha256": "abc"}},
+        )
+
+    def test_overwrite(self):
+        set_source_fingerprint(self.conn, "2026-02-16", "memory", size=1, mtime_ns=1, sha256="a")
+        set_source_fingerprint(self.conn, "2026-02-16", "memory", size=2, mtime_ns=2, sha256="b")
+        fp = get_source_fingerprints(self.conn)[("2026-02-16", "memory")]
+        self.assertEqual(fp["sha256"], "b")
+
+    def test_delete(self):
+        set_source_fingerprint(self.conn, "2026-02-16", "memory", size=1, mtime_ns=1, sha256="a")
+        set_source_fingerprint(self.conn, "2026-02-16", "obsidian", size=1, mtime_ns=1, sha256="b")
+        delete_source_fingerprint(self.conn, "2026-02-16", "memory")
+        self.assertEqual(
+            list(get_source_fingerprints(self.conn)), [("2026-02-16", "obsidian")]
+        )
+
+    def test_delete_entry_cleans_fingerprints(self):
+        upsert_entry(
+            self.conn,
+            date="2026-02-16",
+            integrated_md="test",
+            integrated_hash="h",
+            html_en="<p>test</p>",
+        )
+        set_source_fingerprint(self.conn, "2026-02-16", "memory", size=1, mtime_ns=1, sha256="a")
+        delete_entry(self.conn, "2026-02-16")
+        self.assertEqual(get_source_fingerprints(self.conn), {})
+
+
 # ─── Cache Migration ────────────────────────────────────────────────────────
 
 
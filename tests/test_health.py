@@ -1,5 +1,6 @@
 """Tests for domain/health.py — classification, scoring, and alerts."""
 
+import random
 import unittest
 
 from domain.health import (
@@ -13,6 +14,7 @@ from domain.health import (
     determine_alert_level,
     get_alert_message,
     evaluate,
+    evaluate_many,
 )
 from domain.constants import CPU_THRESHOLDS, ALERT_MESSAGES
 
@@ -266,5 +268,45 @@ class TestEvaluate(unittest.TestCase):
         self.assertEqual(result["alert_level"], 0)
 
 
+class TestEvaluateMany(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        n = 3000
+        self.columns = (
+            [rng.uniform(0, 100) for _ in range(n)],
+            [rng.uniform(20, 100) for _ in range(n)],
+            [rng.choice([rng.uniform(10, 100), 50, 80, 95]) for _ in range(n)],
+            [rng.choice([None, float("nan"), rng.uniform(30, 90), 80]) for _ in range(n)],
+            [rng.randint(0, 20 * 86400) for _ in range(n)],
+        )
+
+    def test_matches_evaluate(self):
+        result = evaluate_many(*self.columns)
+        for i, (c, m, d, t, u) in enumerate(zip(*self.columns)):
+            temp = None if t != t else t
+            expected = evaluate({"cpu_usage": c, "mem_usage": m, "disk_usage": d,
+                                 "temperature": temp, "uptime_seconds": u})
+            self.assertEqual(result["score"][i], expected["overall"]["score"])
+            self.assertEqual(result["overall"][i], expected["overall"]["state"])
+            for key in ("cpu", "memory", "disk", "uptime"):
+                self.assertEqual(result[key][i], expected[key]["state"])
+            self.assertEqual(result["temperature"][i], expected["temperature"] and expected["temperature"]["state"])
+            self.assertEqual(result["alert_level"][i], expected["alert_level"])
+            if expected["alert_level"]:
+                self.assertIn(result["alert_message"][i], ALERT_MESSAGES[expected["alert_level"]])
+            else:
+                self.assertIsNone(result["alert_message"][i])
+
+    def test_seed_reproducible(self):
+        first = evaluate_many(*self.columns, seed=11)["alert_message"]
+        self.assertEqual(evaluate_many(*self.columns, seed=11)["alert_message"], first)
+        self.assertNotEqual(evaluate_many(*self.columns, seed=12)["alert_message"], first)
+
+    def test_empty_and_mismatched_columns(self):
+        self.assertEqual(evaluate_many([], [], [], [], [])["score"], [])
+        with self.assertRaises(ValueError):
+            evaluate_many([1], [1], [1], [], [1])
+
+
 if __name__ == "__main__":
     unittest.main()
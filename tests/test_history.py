@@ -0,0 +1,133 @@
+"""Tests for domain/history.py — health metric time-series store."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from domain.history import (
+    RESOLUTIONS,
+    bucket_start,
+    export_recent,
+    init_db,
+    query,
+    record_sample,
+    sample_from_health,
+)
+
+T0 = 1_769_990_400  # a whole UTC day boundary (divisible by 86400), 09:00 JST
+JST_MIDNIGHT = T0 - 9 * 3600  # 2026-02-02 00:00 JST
+
+
+def _values(cpu=10.0, mem=50.0, disk=40.0, temp=None, score=90.0):
+    return {"cpu": cpu, "mem": mem, "disk": disk, "temp": temp, "score": score}
+
+
+class HistoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.conn = init_db(self.tmpdir / "history.db")
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _count(self, resolution):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM health_rollups WHERE resolution = ?", (resolution,)
+        ).fetchone()[0]
+
+
+class TestRollups(HistoryTestCase):
+    def test_samples_fold_into_buckets(self):
+        record_sample(self.conn, T0 + 5, _values(cpu=10.0))
+        record_sample(self.conn, T0 + 35, _values(cpu=30.0))
+        record_sample(self.conn, T0 + 65, _values(cpu=50.0))
+
+        minutes = query(self.conn, "1m")
+        self.assertEqual([r["t"] for r in minutes], [T0, T0 + 60])
+        self.assertEqual(minutes[0]["cpu"], {"avg": 20.0, "min": 10.0, "max": 30.0})
+
+        (hour,) = query(self.conn, "1h")
+        self.assertEqual(hour["cpu"], {"avg": 30.0, "min": 10.0, "max": 50.0})
+        self.assertEqual(len(query(self.conn, "1d")), 1)
+
+    def test_missing_metric_is_none(self):
+        record_sample(self.conn, T0, _values(temp=None))
+        record_sample(self.conn, T0 + 1, _values(temp=60.0))
+        (row,) = query(self.conn, "1m")
+        self.assertEqual(row["temp"], {"avg": 60.0, "min": 60.0, "max": 60.0})
+
+        record_sample(self.conn, T0 + 120, _values(temp=None))
+        self.assertEqual(query(self.conn, "1m")[-1]["temp"], {"avg": None, "min": None, "max": None})
+
+    def test_retention_bounds_size(self):
+        width, keep = RESOLUTIONS["1m"]
+        for i in range(keep + 100):
+            record_sample(self.conn, T0 + i * width, _values())
+        self.assertEqual(self._count("1m"), keep)
+        self.assertEqual(query(self.conn, "1m")[0]["t"], T0 + 100 * width)
+
+    def test_query_range(self):
+        for i in range(5):
+            record_sample(self.conn, T0 + i * 60, _values(cpu=float(i)))
+        rows = query(self.conn, "1m", since=T0 + 60, until=T0 + 180)
+        self.assertEqual([r["cpu"]["avg"] for r in rows], [1.0, 2.0, 3.0])
+
+    def test_days_follow_jst(self):
+        record_sample(self.conn, JST_MIDNIGHT + 23.5 * 3600, _values(cpu=10.0))  # 23:30 JST
+        record_sample(self.conn, JST_MIDNIGHT + 24.5 * 3600, _values(cpu=30.0))  # 00:30 next day
+        days = query(self.conn, "1d")
+        self.assertEqual([r["t"] for r in days], [JST_MIDNIGHT, JST_MIDNIGHT + 86400])
+        self.assertEqual([r["cpu"]["avg"] for r in days], [10.0, 30.0])
+        self.assertEqual(bucket_start(JST_MIDNIGHT + 23.5 * 3600, 3600), JST_MIDNIGHT + 23 * 3600)
+
+    def test_utc_day_buckets_are_realigned(self):
+        record_sample(self.conn, T0 + 3600, _values(cpu=10.0))
+        self.conn.execute("UPDATE health_rollups SET bucket = ? WHERE resolution = '1d'", (T0,))
+        self.conn.commit()
+        self.conn.close()
+        self.conn = init_db(self.tmpdir / "history.db")
+        (day,) = query(self.conn, "1d")
+        self.assertEqual(day["t"], JST_MIDNIGHT)
+
+    def test_unknown_resolution(self):
+        with self.assertRaises(ValueError):
+            query(self.conn, "5m")
+
+
+class TestExport(HistoryTestCase):
+    def test_recent_windows_are_columnar(self):
+        for i in range(90):
+            record_sample(self.conn, T0 + i * 60, _values(cpu=float(i)))
+        out = export_recent(self.conn, T0 + 89 * 60)
+        self.assertEqual(set(out), {"1m", "1h", "1d"})
+        self.assertEqual(len(out["1m"]["t"]), 60)
+        self.assertEqual(out["1m"]["cpu"][-1], 89.0)
+        self.assertEqual(out["1m"]["temp"][-1], None)
+        self.assertEqual(out["1h"]["t"], [T0, T0 + 3600])
+        self.assertEqual(out["1d"]["t"], [JST_MIDNIGHT])
+
+    def test_day_window_uses_jst_days(self):
+        for day in range(3):
+            record_sample(self.conn, JST_MIDNIGHT + day * 86400 + 23.5 * 3600, _values())
+        out = export_recent(self.conn, JST_MIDNIGHT + 2 * 86400 + 23.5 * 3600, {"1d": 2})
+        self.assertEqual(out["1d"]["t"], [JST_MIDNIGHT + 86400, JST_MIDNIGHT + 2 * 86400])
+
+
+class TestSampleFromHealth(unittest.TestCase):
+    def test_extracts_metrics(self):
+        ts, values = sample_from_health({
+            "timestamp": "2026-02-16T12:00:00+09:00",
+            "cpu": {"usage_percent": 12.5},
+            "memory": None,
+            "disk": {"usage_percent": 40},
+            "temperature": None,
+            "overall": {"score": 88},
+        })
+        self.assertEqual(ts, 1771210800.0)
+        self.assertEqual(values, {"cpu": 12.5, "mem": None, "disk": 40.0, "temp": None, "score": 88.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
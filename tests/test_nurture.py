@@ -1,5 +1,7 @@
 """Tests for domain/nurture.py — nurture parameter calculations."""
 
+import random
+import time
 import unittest
 from datetime import datetime, timezone, timedelta
 
@@ -13,11 +15,18 @@ from domain.nurture import (
     calc_intimacy,
     calc_exp,
     calc_level,
+    level_formula,
+    build_level_index,
+    level_progress,
     get_next_level_exp,
     get_current_level_exp,
     calc_day,
     update_visits,
     evaluate,
+    evaluate_visits,
+    replay_visits,
+    state_from_visit_log,
+    visit_log_from_state,
 )
 from domain.constants import (
     NURTURE_FIRST_DAY,
@@ -26,6 +35,7 @@ from domain.constants import (
     ENERGY_BASE,
     ENERGY_THRESHOLDS,
     MOOD_THRESHOLDS,
+    VISIT_MAX_GAP_SEC,
 )
 
 JST = timezone(timedelta(hours=9))
@@ -398,6 +408,86 @@ class TestLevelExpFunctions(unittest.TestCase):
         self.assertEqual(get_current_level_exp(21), expected)
 
 
+def _reference_level(total_exp, table, step):
+    """calc_level before the precomputed index (linear scan)."""
+    level = 1
+    for i, threshold in enumerate(table):
+        if total_exp >= threshold:
+            level = i + 1
+        else:
+            break
+    if total_exp >= table[-1]:
+        level = len(table) + int((total_exp - table[-1]) // step)
+    return level
+
+
+def _reference_next(level, table, step):
+    if level < len(table):
+        return table[level]
+    return table[-1] + (level - len(table) + 1) * step
+
+
+def _reference_current(level, table, step):
+    if level <= 1:
+        return 0
+    if level - 1 < len(table):
+        return table[level - 1]
+    return table[-1] + (level - 1 - len(table)) * step
+
+
+class TestLevelProgress(unittest.TestCase):
+    """level_progress must agree with the original scan/offset functions everywhere."""
+
+    def _check(self, total_exp, table=EXP_TABLE, step=EXP_EXTRAPOLATION_STEP, index=None):
+        index = build_level_index(table, step) if index is None else index
+        level = _reference_level(total_exp, table, step)
+        expected = (level, _reference_current(level, table, step), _reference_next(level, table, step))
+        self.assertEqual(level_progress(total_exp, index), expected, total_exp)
+
+    def test_every_exp_value_of_default_table(self):
+        index = build_level_index()
+        for total_exp in range(-10, EXP_TABLE[-1] + 40 * EXP_EXTRAPOLATION_STEP):
+            self._check(total_exp, index=index)
+
+    def test_table_boundaries_and_large_values(self):
+        for threshold in EXP_TABLE:
+            for total_exp in (threshold - 1, threshold, threshold + 1):
+                self._check(total_exp)
+        for total_exp in (10 ** 6, 10 ** 9 + 7, 2 ** 62, 12345.5, -(10 ** 6)):
+            self._check(total_exp)
+
+    def test_random_tables(self):
+        rng = random.Random(1234)
+        for _ in range(200):
+            table = [0]
+            for _ in range(rng.randint(0, 30)):
+                table.append(table[-1] + rng.randint(1, 500))
+            step = rng.randint(1, 1000)
+            index = build_level_index(table, step)
+            for _ in range(200):
+                self._check(rng.randint(-100, table[-1] + 20 * step), table, step, index)
+
+    def test_level_formula_with_params(self):
+        rng = random.Random(99)
+        for _ in range(100):
+            table = [0]
+            for _ in range(rng.randint(0, 30)):
+                table.append(table[-1] + rng.randint(1, 500))
+            step = rng.randint(1, 1000)
+            p = {"EXP_TABLE": table, "EXP_EXTRAPOLATION_STEP": step}
+            for _ in range(100):
+                total_exp = rng.randint(-100, table[-1] + 20 * step)
+                self.assertEqual(level_formula(total_exp, p), _reference_level(total_exp, table, step))
+
+    def test_calc_level_uses_index(self):
+        for total_exp in (0, 99, 100, 15499, 15500, 18000, 20499, 20500):
+            self.assertEqual(calc_level(total_exp), _reference_level(total_exp, EXP_TABLE, EXP_EXTRAPOLATION_STEP))
+
+    def test_within_table(self):
+        level, current, nxt = level_progress(1200)
+        self.assertEqual((level, current, nxt), (6, 1000, 1350))
+
+
 class TestCalcDay(unittest.TestCase):
     """Test day calculation from datetime."""
 
@@ -557,5 +647,123 @@ class TestEvaluate(unittest.TestCase):
         self.assertEqual(updated_vlog["total_visits"], 1)
 
 
+class TestReplayVisits(unittest.TestCase):
+    """Test the visit event fold."""
+
+    DAY = datetime(2026, 2, 13, 0, 0, 0, tzinfo=JST).timestamp()
+
+    def _at(self, hours, day=0):
+        return self.DAY + day * 86400 + hours * 3600
+
+    def test_empty(self):
+        state = replay_visits([])
+        self.assertEqual(state["total_visits"], 0)
+        self.assertEqual(state["status"], "offline")
+
+    def test_visit_and_real_online_time(self):
+        events = [(self._at(10), "offline"), (self._at(10.5), "online"),
+                  (self._at(10.6), "online"), (self._at(10.7), "away")]
+        state = replay_visits(events)
+        self.assertEqual(state["total_visits"], 1)
+        self.assertAlmostEqual(state["online_seconds"], 0.2 * 3600)
+        self.assertEqual(state["streak"], 1)
+
+    def test_same_result_for_any_sampling(self):
+        per_minute = [(self._at(10 + m / 60), "online") for m in range(120)]
+        per_five = [(self._at(10 + m / 60), "online") for m in range(0, 120, 5)]
+        closing = [(self._at(12), "offline")]
+        a = replay_visits(per_minute + closing)
+        b = replay_visits(per_five + closing)
+        self.assertAlmostEqual(a["online_seconds"], 7200)
+        self.assertAlmostEqual(a["online_seconds"], b["online_seconds"])
+
+    def test_gap_is_capped(self):
+        state = replay_visits([(self._at(10), "online"), (self._at(20), "online")])
+        self.assertEqual(state["online_seconds"], VISIT_MAX_GAP_SEC)
+
+    def test_online_time_split_at_midnight(self):
+        state = replay_visits([(self._at(23.9), "online"), (self._at(0.05, day=1), "online")])
+        self.assertAlmostEqual(state["online_seconds"], 0.15 * 3600)
+        self.assertAlmostEqual(state["today_online_seconds"], 0.05 * 3600)
+
+    def test_streak_and_reset(self):
+        events = []
+        for day in range(3):
+            events += [(self._at(12, day), "online"), (self._at(13, day), "offline")]
+        self.assertEqual(replay_visits(events)["streak"], 3)
+        events += [(self._at(12, 5), "online")]
+        self.assertEqual(replay_visits(events)["streak"], 1)
+
+    def test_incremental_equals_full(self):
+        events = [(self._at(h / 4), "online" if h % 7 < 4 else "offline") for h in range(400)]
+        full = replay_visits(events)
+        part = replay_visits(events[:150])
+        self.assertEqual(replay_visits(events[150:], part), full)
+
+    def test_observe_reports_every_step(self):
+        events = [(self._at(h / 4), "online" if h % 7 < 4 else "offline") for h in range(200)]
+        steps = []
+        final = replay_visits(events, observe=steps.append)
+        self.assertEqual(len(steps), len(events))
+        for i in (0, 37, 96, 199):
+            prefix = replay_visits(events[:i + 1])
+            self.assertEqual(steps[i], (
+                prefix["total_visits"], prefix["online_seconds"], prefix["streak"],
+                prefix["today_visits"], prefix["today_online_seconds"],
+            ))
+        self.assertEqual(steps[-1][0], final["total_visits"])
+
+    def test_day_offset(self):
+        # Online 23:30-00:30 JST: crosses the default (JST) midnight, not the UTC one
+        events = [(self._at(23.5 + k / 6), "online") for k in range(7)]
+        jst = replay_visits(events)
+        self.assertAlmostEqual(jst["today_online_seconds"], 1800)
+        utc = replay_visits(events, day_offset=0)
+        self.assertAlmostEqual(utc["today_online_seconds"], 3600)
+        self.assertAlmostEqual(utc["online_seconds"], jst["online_seconds"])
+
+    def test_view_resets_past_days(self):
+        state = replay_visits([(self._at(12), "online")])
+        view = visit_log_from_state(state, datetime(2026, 2, 13, 18, 0, tzinfo=JST))
+        self.assertEqual((view["today_visits"], view["streak"]), (1, 1))
+        self.assertEqual(view["last_visit_date"], "2026-02-13")
+        self.assertEqual(view["last_visit"], "2026-02-13T12:00:00+09:00")
+        later = visit_log_from_state(state, datetime(2026, 2, 16, 12, 0, tzinfo=JST))
+        self.assertEqual((later["today_visits"], later["streak"]), (0, 0))
+
+    def test_legacy_round_trip(self):
+        legacy = {
+            "total_visits": 12, "total_time_minutes": 300, "streak": 4,
+            "last_visit": "2026-02-13T09:00:00+09:00", "last_visit_date": "2026-02-13",
+            "today_visits": 2, "today_time_minutes": 30, "previous_status": "online",
+        }
+        state = state_from_visit_log(legacy)
+        now = datetime(2026, 2, 13, 10, 0, tzinfo=JST)
+        self.assertEqual(visit_log_from_state(state, now), legacy)
+
+    def test_evaluate_visits_matches_evaluate(self):
+        legacy = {
+            "total_visits": 12, "total_time_minutes": 300, "streak": 4,
+            "last_visit": "2026-02-13T09:00:00+09:00", "last_visit_date": "2026-02-13",
+            "today_visits": 2, "today_time_minutes": 30, "previous_status": "away",
+        }
+        now = datetime(2026, 2, 13, 10, 0, tzinfo=JST)
+        status = {"status": "away", "time_context": {"period": "active"}}
+        health = {"overall": {"score": 80}, "uptime": {"seconds": 3600}}
+        expected, _ = evaluate(health, status, None, dict(legacy), now)
+        state = replay_visits([(now.timestamp(), "away")], state_from_visit_log(legacy))
+        nurture, _ = evaluate_visits(health, status, None, state, now)
+        self.assertEqual(nurture, expected)
+
+    def test_year_of_minutes_replays_fast(self):
+        start = self.DAY
+        events = [(start + i * 60, "online" if (i // 90) % 4 == 0 else "offline")
+                  for i in range(365 * 24 * 60)]
+        t0 = time.perf_counter()
+        state = replay_visits(events)
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        self.assertEqual(state["total_visits"], 365 * 24 * 60 // 360)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,150 @@
+"""Tests for collectors/run_collectors.py — in-process collector scheduler."""
+
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from collectors import collect_health, collect_nurture, collect_skills, collect_status
+from collectors.run_collectors import Job, Scheduler, default_jobs
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.writes = []
+        self.calls = []
+
+    def _scheduler(self, jobs):
+        return Scheduler(
+            jobs, data_dir=Path("/data"), clock=self.clock,
+            write=lambda data, path: self.writes.append((path.name, data)),
+        )
+
+    def _job(self, name, interval, fn=None):
+        def run(results):
+            self.calls.append(name)
+            return fn(results) if fn else {name: {"n": self.calls.count(name)}}
+        return Job(name, interval, run)
+
+
+class TestScheduler(SchedulerTestCase):
+    def test_each_job_runs_on_its_interval(self):
+        s = self._scheduler([self._job("fast", 60), self._job("slow", 300)])
+        for t in range(0, 601, 60):
+            self.clock.now = t
+            s.run_due()
+        self.assertEqual(self.calls.count("fast"), 11)
+        self.assertEqual(self.calls.count("slow"), 3)
+
+    def test_results_are_shared_and_written(self):
+        seen = []
+        s = self._scheduler([
+            self._job("health", 60),
+            self._job("nurture", 60, lambda r: seen.append(r["health"]) or {"nurture": {}}),
+        ])
+        s.run_due()
+        self.assertEqual(seen, [{"n": 1}])
+        self.assertEqual([name for name, _ in self.writes], ["health.json", "nurture.json"])
+
+    def test_failing_job_does_not_stop_others(self):
+        def boom(results):
+            raise RuntimeError("boom")
+        s = self._scheduler([self._job("bad", 60, boom), self._job("good", 60)])
+        with mock.patch("sys.stderr"):
+            self.assertEqual(s.run_due(), ["bad", "good"])
+        self.assertEqual([name for name, _ in self.writes], ["good.json"])
+        self.clock.now = 30
+        self.assertEqual(s.run_due(), [])
+
+    def test_failing_write_is_logged_and_retried(self):
+        def write(data, path):
+            if path.name == "a.json":
+                raise OSError(28, "No space left on device")
+            self.writes.append((path.name, data))
+        s = Scheduler([self._job("a", 60), self._job("b", 60)], data_dir=Path("/data"),
+                      clock=self.clock, write=write)
+        with mock.patch("sys.stderr"):
+            self.assertFalse(s.run_job(s.jobs[0]))
+            self.assertEqual(s.run_due(), ["a", "b"])
+        self.assertEqual(s.results["a"], {"n": 2})  # later jobs still see fresh data
+        self.assertEqual([name for name, _ in self.writes], ["b.json"])
+
+    def test_serve_survives_write_errors(self):
+        attempts = []
+        stop = threading.Event()
+
+        def write(data, path):
+            attempts.append(path.name)
+            if len(attempts) >= 3:
+                stop.set()
+            raise PermissionError("read-only")
+
+        s = Scheduler([self._job("a", 0)], write=write)
+        worker = threading.Thread(target=s.serve, args=(stop,))
+        with mock.patch("sys.stderr"):
+            worker.start()
+            worker.join(timeout=2)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(len(attempts), 3)
+
+    def test_seconds_until_due(self):
+        s = self._scheduler([self._job("a", 60), self._job("b", 300)])
+        s.run_due()
+        self.clock.now = 45
+        self.assertEqual(s.seconds_until_due(), 15)
+
+    def test_serve_stops(self):
+        s = Scheduler([self._job("a", 3600)], write=lambda data, path: None)
+        stop = threading.Event()
+        worker = threading.Thread(target=s.serve, args=(stop,))
+        worker.start()
+        stop.set()
+        worker.join(timeout=2)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(self.calls, ["a"])
+
+
+class TestDefaultJobs(SchedulerTestCase):
+    def test_nurture_uses_in_memory_results(self):
+        health = {"overall": {"score": 90}}
+        status = {"status": "online"}
+        skills = {"skills": []}
+        conn = object()
+        with mock.patch.object(collect_status, "collect", return_value=status), \
+                mock.patch.object(collect_health, "collect_all", return_value=health), \
+                mock.patch("domain.history.init_db"), \
+                mock.patch.object(collect_health, "record_history", return_value={"1m": {}}), \
+                mock.patch.object(collect_skills, "collect", return_value=skills), \
+                mock.patch.object(collect_nurture, "open_visit_store", return_value=conn) as store, \
+                mock.patch.object(collect_nurture, "load_json") as load_json, \
+                mock.patch.object(collect_nurture, "collect_events",
+                                  return_value=({"level": 1}, {"total_visits": 4})) as nurture:
+            s = self._scheduler(default_jobs())
+            s.run_due()
+            self.clock.now = 300
+            s.run_due()
+
+        load_json.assert_not_called()
+        self.assertEqual(store.call_count, 1)  # later runs reuse the open store
+        self.assertEqual(nurture.call_args_list[0].args, (health, status, skills, conn))
+        self.assertEqual(nurture.call_args_list[1].args[3], conn)
+        self.assertEqual(
+            [name for name, _ in self.writes],
+            ["status.json", "health.json", "health_history.json", "skills.json",
+             "nurture.json", "visit_log.json",
+             "status.json", "health.json", "health_history.json",
+             "nurture.json", "visit_log.json"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Tests for domain/schema.py — atomic JSON writes with change detection."""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from domain import schema
+from domain.schema import content_digest, write_json_atomic
+
+
+def _payload(timestamp="2026-02-01T10:00:00+09:00", cpu=12.5):
+    return {"timestamp": timestamp, "staleness": "fresh", "cpu": {"usage_percent": cpu}}
+
+
+class WriteTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.path = self.tmpdir / "data" / "health.json"
+        schema._digest_cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+
+class TestContentDigest(unittest.TestCase):
+    def test_ignores_volatile_fields_and_key_order(self):
+        a = _payload()
+        b = {"cpu": {"usage_percent": 12.5}, "timestamp": "later", "staleness": "stale"}
+        self.assertEqual(content_digest(a), content_digest(b))
+
+    def test_detects_real_changes(self):
+        self.assertNotEqual(content_digest(_payload()), content_digest(_payload(cpu=13.0)))
+
+    def test_non_dict_payload(self):
+        self.assertEqual(content_digest([1, 2]), content_digest([1, 2]))
+
+
+class TestWriteJsonAtomic(WriteTestCase):
+    def test_default_writes_indented(self):
+        result = write_json_atomic(_payload(), self.path)
+        text = self.path.read_text(encoding="utf-8")
+        self.assertTrue(result.written)
+        self.assertEqual(result.bytes, len(text.encode("utf-8")))
+        self.assertIn('\n  "cpu"', text)
+        self.assertFalse(os.path.exists(str(self.path) + ".tmp"))
+
+    def test_compact(self):
+        write_json_atomic(_payload(), self.path, compact=True)
+        text = self.path.read_text(encoding="utf-8")
+        self.assertEqual(text.count("\n"), 1)
+        self.assertNotIn(": ", text)
+        self.assertEqual(json.loads(text), _payload())
+
+    def test_skip_unchanged(self):
+        write_json_atomic(_payload(), self.path, skip_unchanged=True)
+        mtime = self.path.stat().st_mtime_ns
+        result = write_json_atomic(
+            _payload(timestamp="2026-02-01T10:01:00+09:00"), self.path, skip_unchanged=True
+        )
+        self.assertFalse(result.written)
+        self.assertGreater(result.bytes, 0)
+        self.assertEqual(self.path.stat().st_mtime_ns, mtime)
+        self.assertIn("10:00:00", self.path.read_text(encoding="utf-8"))
+
+    def test_changed_content_is_written(self):
+        write_json_atomic(_payload(), self.path, skip_unchanged=True)
+        self.assertTrue(write_json_atomic(_payload(cpu=99.0), self.path, skip_unchanged=True).written)
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8"))["cpu"]["usage_percent"], 99.0)
+
+    def test_compares_against_file_from_another_process(self):
+        write_json_atomic(_payload(), self.path)
+        schema._digest_cache.clear()  # fresh process: only the file on disk
+        self.assertFalse(write_json_atomic(_payload(), self.path, skip_unchanged=True).written)
+
+    def test_external_edit_is_noticed(self):
+        write_json_atomic(_payload(), self.path, skip_unchanged=True)
+        self.path.write_text(json.dumps(_payload(cpu=1.0)) + "\n   ", encoding="utf-8")
+        self.assertTrue(write_json_atomic(_payload(), self.path, skip_unchanged=True).written)
+
+    def test_old_file_is_refreshed(self):
+        write_json_atomic(_payload(), self.path, skip_unchanged=True)
+        old = time.time() - schema.UNCHANGED_MAX_AGE_SEC - 1
+        os.utime(self.path, (old, old))
+        self.assertTrue(write_json_atomic(_payload(), self.path, skip_unchanged=True).written)
+        self.assertFalse(
+            write_json_atomic(_payload(), self.path, skip_unchanged=True, max_age=None).written
+        )
+
+    def test_corrupt_existing_file_is_replaced(self):
+        self.path.parent.mkdir()
+        self.path.write_text("{oops", encoding="utf-8")
+        self.assertTrue(write_json_atomic(_payload(), self.path, skip_unchanged=True).written)
+
+    def test_fsync(self):
+        with mock.patch.object(schema.os, "fsync", wraps=os.fsync) as fsync:
+            write_json_atomic(_payload(), self.path, fsync=True)
+        self.assertEqual(fsync.call_count, 2)  # file, then directory
+
+    def test_stats(self):
+        with mock.patch.dict(schema.WRITE_STATS, written=0, skipped=0, bytes_written=0, bytes_skipped=0):
+            first = write_json_atomic(_payload(), self.path, skip_unchanged=True)
+            write_json_atomic(_payload(), self.path, skip_unchanged=True)
+            self.assertEqual(schema.WRITE_STATS["written"], 1)
+            self.assertEqual(schema.WRITE_STATS["skipped"], 1)
+            self.assertEqual(schema.WRITE_STATS["bytes_skipped"], first.bytes)
+
+    def test_failed_write_leaves_no_tmp(self):
+        with self.assertRaises(TypeError):
+            write_json_atomic({"x": object()}, self.path)
+        self.assertFalse(self.path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Tests for scripts/simulate_nurture.py — batch nurture simulation."""
+
+import contextlib
+import csv
+import io
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from domain import nurture as domain_nurture
+from domain.presence import get_time_context
+from scripts import simulate_nurture
+from scripts.simulate_nurture import load_params, simulate, summarize, synthetic_inputs
+
+JST = timezone(timedelta(hours=9))
+
+
+COMPARED = ("health", "energy", "mood", "trust", "intimacy", "exp", "level", "total_visits", "streak")
+
+
+def scalar_reference(inputs):
+    """Evaluate each step through domain.nurture, as collect_nurture would."""
+    out = {name: [] for name in COMPARED}
+    state = None
+    for ts, on, score, uptime in zip(inputs["ts"], inputs["online"],
+                                     inputs["health_score"], inputs["uptime_seconds"]):
+        status = "online" if on else "offline"
+        state = domain_nurture.replay_visits([(ts, status)], state)
+        now = datetime.fromtimestamp(ts, tz=JST)
+        period = get_time_context(now.hour)["period"]
+        nurture, visit_log = domain_nurture.evaluate_visits(
+            {"overall": {"score": score}, "uptime": {"seconds": uptime}},
+            {"status": status, "time_context": {"period": period}},
+            {"skills": [None] * inputs["skill_count"]},
+            state, now,
+        )
+        row = {
+            "health": nurture["health"], "energy": nurture["energy"]["value"],
+            "mood": nurture["mood"]["value"], "trust": nurture["trust"],
+            "intimacy": nurture["intimacy"], "exp": nurture["exp"]["total"],
+            "level": nurture["level"], "total_visits": visit_log["total_visits"],
+            "streak": visit_log["streak"],
+        }
+        for name in COMPARED:
+            out[name].append(row[name])
+    return out
+
+
+class SimulationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.inputs = synthetic_inputs(days=10, step=300, seed=3, visit_prob=0.7, lunch_prob=0.5)
+
+    def _as_lists(self, result):
+        return {k: [int(v) for v in values] for k, values in result.items() if k != "ts"}
+
+
+class TestPurePython(SimulationTestCase):
+    def test_matches_domain_evaluation(self):
+        result = self._as_lists(simulate(self.inputs, use_numpy=False))
+        expected = scalar_reference(self.inputs)
+        for name, values in expected.items():
+            self.assertEqual(result[name], values, name)
+
+    def test_overrides_change_results(self):
+        base = simulate(self.inputs, use_numpy=False)
+        params = load_params({"TRUST_LOG_COEFFICIENT": 40, "MOOD_WEIGHTS": {"health": 0.6}})
+        tuned = simulate(self.inputs, params, use_numpy=False)
+        self.assertGreater(tuned["trust"][-1], base["trust"][-1])
+        self.assertGreater(sum(tuned["mood"]), sum(base["mood"]))
+        self.assertEqual(params["MOOD_WEIGHTS"]["energy"], 0.2)  # merged, not replaced
+
+    def test_unknown_override(self):
+        with self.assertRaises(ValueError):
+            load_params({"NOT_A_CONSTANT": 1})
+
+    def test_synthetic_inputs_are_reproducible(self):
+        again = synthetic_inputs(days=10, step=300, seed=3, visit_prob=0.7, lunch_prob=0.5)
+        self.assertEqual(again, self.inputs)
+        self.assertNotEqual(synthetic_inputs(days=10, step=300, seed=4)["online"], self.inputs["online"])
+
+
+@unittest.skipIf(simulate_nurture.np is None, "NumPy not installed")
+class TestNumpy(SimulationTestCase):
+    def test_matches_domain_evaluation(self):
+        result = self._as_lists(simulate(self.inputs, use_numpy=True))
+        expected = scalar_reference(self.inputs)
+        for name, values in expected.items():
+            self.assertEqual(result[name], values, name)
+
+    def test_overrides_match_pure_python(self):
+        params = load_params({"TRUST_LOG_COEFFICIENT": 40, "EXP_EXTRAPOLATION_STEP": 500,
+                              "MOOD_TIME_FACTORS": {"night": -20}})
+        fast = self._as_lists(simulate(self.inputs, params, use_numpy=True))
+        slow = self._as_lists(simulate(self.inputs, params, use_numpy=False))
+        for name in slow:
+            self.assertEqual(fast[name], slow[name], name)
+
+
+class TestOutputs(SimulationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.result = simulate(self.inputs, use_numpy=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_summary(self):
+        summary = summarize(self.result)
+        self.assertEqual(summary["steps"], len(self.inputs["ts"]))
+        self.assertEqual(summary["level"]["final"], self.result["level"][-1])
+        self.assertLessEqual(summary["mood"]["min"], summary["mood"]["mean"])
+        self.assertAlmostEqual(sum(summary["mood_states"].values()), 1.0, places=2)
+        self.assertEqual(list(summary["level_at_day"]), [7])
+
+    def test_csv_downsampled_with_last_row(self):
+        path = self.tmpdir / "out.csv"
+        rows = simulate_nurture.write_csv(self.result, path, every=100)
+        with open(path, encoding="utf-8") as f:
+            lines = list(csv.reader(f))
+        self.assertEqual(lines[0], list(simulate_nurture.COLUMNS))
+        self.assertEqual(len(lines) - 1, rows)
+        self.assertEqual(int(lines[-1][8]), self.result["level"][-1])
+
+    def test_cli(self):
+        path = self.tmpdir / "cli.csv"
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+            code = simulate_nurture.main(["--days", "3", "--step", "600", "--pure-python",
+                                          "--json", "--csv", str(path),
+                                          "--set", "EXP_EXTRAPOLATION_STEP=1000"])
+        self.assertEqual(code, 0)
+        self.assertIn('"level_at_day"', stdout.getvalue())
+        self.assertTrue(path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
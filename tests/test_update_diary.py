@@ -0,0 +1,658 @@
+"""Tests for scripts/update_diary.py — diary SSG pipeline."""
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from domain.diary import (
+    init_db,
+    get_entry,
+    get_recap_cache,
+    get_translation_cache,
+    get_source_fingerprints,
+    upsert_entry,
+)
+from scripts import update_diary
+
+TEMPLATE = """\
+<html><body>
+<!-- DIARY_CARDS_PLACEHOLDER -->
+<!-- DIARY_ENTRIES_PLACEHOLDER -->
+<!-- DIARY_PAGINATION_PLACEHOLDER -->
+</body></html>
+"""
+
+
+class DiarySiteTestCase(unittest.TestCase):
+    """Base test case with temp source dirs, template and DB."""
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.memory_dir = self.tmpdir / "memory"
+        self.obsidian_dir = self.tmpdir / "obsidian"
+        self.memory_dir.mkdir()
+        self.obsidian_dir.mkdir()
+        self.template = self.tmpdir / "template.html"
+        self.template.write_text(TEMPLATE, encoding="utf-8")
+        self.output = self.tmpdir / "diary.html"
+        self.conn = init_db(self.tmpdir / "diary.db")
+        self.config = {
+            "memory_dir": self.memory_dir,
+            "obsidian_dir": self.obsidian_dir,
+            "template_html": self.template,
+            "index_html": self.output,
+        }
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, directory, date_str, text):
+        path = directory / f"{date_str}.md"
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def _generate(self, **kwargs):
+        return update_diary.generate_site_with_db(
+            self.config, self.conn, skip_translation=True, **kwargs
+        )
+
+
+# ─── Incremental Rebuild ─────────────────────────────────────────────────────
+
+
+class TestPlanIncremental(DiarySiteTestCase):
+    """Test fingerprint-based change detection."""
+
+    def test_new_files_are_changed(self):
+        self._write(self.memory_dir, "2026-02-10", "- a")
+        self._write(self.obsidian_dir, "2026-02-11", "- b")
+        dates, updates = update_diary.plan_incremental(
+            self.conn, self.memory_dir, self.obsidian_dir
+        )
+        self.assertEqual(dates, ["2026-02-11", "2026-02-10"])
+        self.assertIn(("2026-02-10", "memory"), updates)
+        self.assertIn(("2026-02-11", "obsidian"), updates)
+
+    def test_unchanged_after_build(self):
+        self._write(self.memory_dir, "2026-02-10", "- a")
+        self.assertTrue(self._generate(incremental=True))
+        dates, updates = update_diary.plan_incremental(
+            self.conn, self.memory_dir, self.obsidian_dir
+        )
+        self.assertEqual(dates, [])
+        self.assertEqual(updates, {})
+
+    def test_touch_without_change_refreshes_fingerprint_only(self):
+        path = self._write(self.memory_dir, "2026-02-10", "- a")
+        self._generate(incremental=True)
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+        dates, updates = update_diary.plan_incremental(
+            self.conn, self.memory_dir, self.obsidian_dir
+        )
+        self.assertEqual(dates, [])
+        self.assertEqual(
+            updates[("2026-02-10", "memory")]["mtime_ns"],
+            st.st_mtime_ns + 10_000_000,
+        )
+
+    def test_modified_content_is_changed(self):
+        self._write(self.memory_dir, "2026-02-10", "- a")
+        self._generate(incremental=True)
+        self._write(self.memory_dir, "2026-02-10", "- a\n- and more")
+        dates, _ = update_diary.plan_incremental(
+            self.conn, self.memory_dir, self.obsidian_dir
+        )
+        self.assertEqual(dates, ["2026-02-10"])
+
+    def test_deleted_source_is_changed(self):
+        self._write(self.memory_dir, "2026-02-10", "- a")
+        path = self._write(self.obsidian_dir, "2026-02-10", "- b")
+        self._generate(incremental=True)
+        path.unlink()
+        dates, updates = update_diary.plan_incremental(
+            self.conn, self.memory_dir, self.obsidian_dir
+        )
+        self.assertEqual(dates, ["2026-02-10"])
+        self.assertIsNone(updates[("2026-02-10", "obsidian")])
+
+    def test_missing_directory_is_not_a_deletion(self):
+        self._write(self.obsidian_dir, "2026-02-10", "- b")
+        self._generate(incremental=True)
+        shutil.rmtree(self.obsidian_dir)
+        dates, updates = update_diary.plan_incremental(
+            self.conn, self.memory_dir, self.obsidian_dir
+        )
+        self.assertEqual(dates, [])
+        self.assertEqual(updates, {})
+
+
+class TestIncrementalGenerate(DiarySiteTestCase):
+    """Test generate_site_with_db in incremental mode."""
+
+    def test_builds_only_changed_dates(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        self._write(self.memory_dir, "2026-02-11", "- second")
+        self._generate(incremental=True)
+        before = get_entry(self.conn, "2026-02-10")["updated_at"]
+
+        self._write(self.memory_dir, "2026-02-11", "- second, edited")
+        self._generate(incremental=True)
+
+        self.assertEqual(get_entry(self.conn, "2026-02-10")["updated_at"], before)
+        self.assertIn("edited", get_entry(self.conn, "2026-02-11")["html_en"])
+        self.assertIn("edited", self.output.read_text(encoding="utf-8"))
+
+    def test_deleting_all_sources_removes_entry(self):
+        path = self._write(self.memory_dir, "2026-02-10", "- gone soon")
+        self._generate(incremental=True)
+        path.unlink()
+        self._generate(incremental=True)
+        self.assertIsNone(get_entry(self.conn, "2026-02-10"))
+        self.assertEqual(get_source_fingerprints(self.conn), {})
+        self.assertNotIn("gone soon", self.output.read_text(encoding="utf-8"))
+
+    def test_full_rebuild_records_fingerprints(self):
+        self._write(self.memory_dir, "2026-02-10", "- a")
+        self._write(self.obsidian_dir, "2026-02-10", "- b")
+        self._generate(rebuild=True)
+        self.assertEqual(
+            set(get_source_fingerprints(self.conn)),
+            {("2026-02-10", "memory"), ("2026-02-10", "obsidian")},
+        )
+
+    def test_unfingerprinted_entries_are_rebuilt_once(self):
+        """Entries from a pre-fingerprint DB are rebuilt on the first incremental run."""
+        self._write(self.memory_dir, "2026-02-10", "- fresh")
+        upsert_entry(
+            self.conn,
+            date="2026-02-10",
+            integrated_md="stale",
+            integrated_hash="h",
+            html_en="<p>stale</p>",
+        )
+        self._generate(incremental=True)
+        self.assertIn("fresh", get_entry(self.conn, "2026-02-10")["html_en"])
+
+    def test_explicit_dates(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        gone = self._write(self.memory_dir, "2026-02-11", "- second")
+        self._generate(rebuild=True)
+        before = get_entry(self.conn, "2026-02-10")["updated_at"]
+
+        gone.unlink()
+        self._write(self.memory_dir, "2026-02-12", "- third")
+        self._generate(dates=["2026-02-11", "2026-02-12"])
+
+        self.assertEqual(get_entry(self.conn, "2026-02-10")["updated_at"], before)
+        self.assertIsNone(get_entry(self.conn, "2026-02-11"))
+        self.assertIn("third", self.output.read_text(encoding="utf-8"))
+
+    def test_explicit_dates_keep_entries_when_vault_missing(self):
+        self._write(self.obsidian_dir, "2026-02-10", "- vault note")
+        self._generate(rebuild=True)
+        shutil.rmtree(self.obsidian_dir)  # e.g. vault not mounted
+        self._generate(dates=["2026-02-10"])
+        self.assertIn("vault note", get_entry(self.conn, "2026-02-10")["html_en"])
+
+
+# ─── Daemon ──────────────────────────────────────────────────────────────────
+
+
+class TestDiaryDaemon(DiarySiteTestCase):
+    """Test the in-process refresh(dates) API used by watch_diary.py."""
+
+    def setUp(self):
+        super().setUp()
+        self.daemon = update_diary.DiaryDaemon(
+            self.config, self.tmpdir / "diary.db", skip_translation=True
+        )
+
+    def tearDown(self):
+        self.daemon.close()
+        super().tearDown()
+
+    def test_refresh_updates_output(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        self.assertTrue(self.daemon.refresh(["2026-02-10"]))
+        self._write(self.memory_dir, "2026-02-10", "- first, edited")
+        self.assertTrue(self.daemon.refresh(["2026-02-10"]))
+        self.assertIn("first, edited", self.output.read_text(encoding="utf-8"))
+
+    def test_state_is_reused_between_refreshes(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        with mock.patch("domain.diary.init_db", wraps=init_db) as opened, \
+                mock.patch.object(update_diary, "_load_template",
+                                  wraps=update_diary._load_template) as loaded:
+            self.daemon.refresh(["2026-02-10"])
+            self.daemon.refresh(["2026-02-10"])
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(loaded.call_count, 1)
+
+    def test_template_change_is_picked_up(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        self.daemon.refresh(["2026-02-10"])
+        self.template.write_text(TEMPLATE.replace("<body>", "<body class=v2>"), encoding="utf-8")
+        os.utime(self.template, ns=(0, 0))
+        self.daemon.refresh(["2026-02-10"])
+        self.assertIn("<body class=v2>", self.output.read_text(encoding="utf-8"))
+
+    def test_refresh_from_another_thread(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        self.daemon.refresh(["2026-02-10"])
+        results = []
+        worker = threading.Thread(target=lambda: results.append(self.daemon.refresh(["2026-02-10"])))
+        worker.start()
+        worker.join()
+        self.assertEqual(results, [True])
+
+
+# ─── Streaming Renderer ──────────────────────────────────────────────────────
+
+
+class TestStreamingRender(DiarySiteTestCase):
+    """Test the streaming template renderer."""
+
+    def _entry(self, date_str):
+        entry = update_diary.DiaryEntry(date=date_str)
+        entry.sections.append(update_diary.DiarySection(
+            title="Log", icon="*", css_class="integrated",
+            body_html=f"<p>{date_str}</p>", raw_md=f"- {date_str}",
+        ))
+        return entry
+
+    def test_matches_string_substitution(self):
+        entries = [self._entry("2026-02-11"), self._entry("2026-02-10")]
+        update_diary._render_html(self.template, self.output, entries)
+        expected = (
+            TEMPLATE
+            .replace(update_diary.CARDS_PLACEHOLDER, "\n\n".join(e.to_card_html() for e in entries))
+            .replace(update_diary.ENTRIES_PLACEHOLDER, "\n\n".join(e.to_html() for e in entries))
+            .replace(update_diary.PAGINATION_PLACEHOLDER, "")
+        )
+        self.assertEqual(self.output.read_text(encoding="utf-8"), expected)
+
+    def test_entry_source_is_iterated_per_pass(self):
+        calls = []
+
+        def source():
+            calls.append(1)
+            yield self._entry("2026-02-10")
+
+        update_diary._render_html(self.template, self.output, source)
+        self.assertEqual(len(calls), 2)
+        html = self.output.read_text(encoding="utf-8")
+        self.assertEqual(html.count('class="diary-card"'), 1)
+        self.assertEqual(html.count('class="diary-entry"'), 1)
+
+    def test_db_render_uses_stored_previews(self):
+        self._write(self.memory_dir, "2026-02-10", "# Title\n\n- **Shipped** the thing")
+        self._generate(rebuild=True)
+        html = self.output.read_text(encoding="utf-8")
+        self.assertIn('data-lang="en">Shipped the thing</div>', html)
+        self.assertIn('data-lang="ja">Shipped the thing</div>', html)
+
+    def test_only_changed_entries_are_rerendered(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        self._write(self.memory_dir, "2026-02-11", "- second")
+        self._generate(rebuild=True)
+        with mock.patch.object(
+            update_diary.DiaryEntry, "to_html", autospec=True,
+            side_effect=update_diary.DiaryEntry.to_html,
+        ) as to_html:
+            self._write(self.memory_dir, "2026-02-11", "- second, edited")
+            self._generate(incremental=True)
+        self.assertEqual([c.args[0].date for c in to_html.call_args_list], ["2026-02-11"])
+        self.assertIn("second, edited", self.output.read_text(encoding="utf-8"))
+
+    def test_unchanged_rebuild_reuses_fragments(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        self._write(self.memory_dir, "2026-02-11", "- second")
+        self._generate(rebuild=True)
+        with mock.patch.object(
+            update_diary.DiaryEntry, "to_html", autospec=True,
+            side_effect=update_diary.DiaryEntry.to_html,
+        ) as to_html:
+            self._generate(rebuild=True)
+        self.assertEqual(to_html.call_count, 0)
+        self.assertIn("second", self.output.read_text(encoding="utf-8"))
+
+    def test_plain_sqlite_connection(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        plain = sqlite3.connect(self.tmpdir / "diary.db")
+        plain.row_factory = sqlite3.Row
+        self.addCleanup(plain.close)
+        self.assertTrue(update_diary.generate_site_with_db(
+            self.config, plain, skip_translation=True, rebuild=True))
+        self.assertEqual(update_diary.refresh_rendered_fragments(plain, "other"), 1)
+        self.assertIn("first", self.output.read_text(encoding="utf-8"))
+
+    def test_render_version_change_rerenders_everything(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        self._write(self.memory_dir, "2026-02-11", "- second")
+        self._generate(rebuild=True)
+        self.assertEqual(update_diary.refresh_rendered_fragments(self.conn), 0)
+        self.assertEqual(update_diary.refresh_rendered_fragments(self.conn, "other"), 2)
+
+    def test_cached_fragments_match_fresh_render(self):
+        self._write(self.memory_dir, "2026-02-10", "- first")
+        self._generate(rebuild=True)
+        first = self.output.read_text(encoding="utf-8")
+        entry = update_diary._entry_from_db_row(get_entry(self.conn, "2026-02-10"))
+        self.assertIn(entry.to_html(), first)
+        self.assertIn(entry.to_card_html(), first)
+
+    def test_failed_render_keeps_previous_output(self):
+        self.output.write_text("previous", encoding="utf-8")
+
+        def broken():
+            yield self._entry("2026-02-10")
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            update_diary._render_html(self.template, self.output, broken)
+        self.assertEqual(self.output.read_text(encoding="utf-8"), "previous")
+        self.assertEqual([p.name for p in self.tmpdir.glob("*.tmp")], [])
+
+
+# ─── Sharded Output ──────────────────────────────────────────────────────────
+
+
+class TestShardedOutput(DiarySiteTestCase):
+    """Test index / per-month / per-entry page output."""
+
+    def setUp(self):
+        super().setUp()
+        for d in ["2026-01-30", "2026-01-31", "2026-02-01", "2026-02-02"]:
+            self._write(self.memory_dir, d, f"- body of {d}")
+
+    def _page(self, name):
+        return (self.tmpdir / name).read_text(encoding="utf-8")
+
+    def test_writes_index_month_and_entry_pages(self):
+        self.assertTrue(self._generate(rebuild=True, shard=True))
+        names = sorted(p.name for p in self.tmpdir.glob("diary*.html"))
+        self.assertEqual(names, [
+            "diary-2026-01-30.html", "diary-2026-01-31.html", "diary-2026-01.html",
+            "diary-2026-02-01.html", "diary-2026-02-02.html", "diary-2026-02.html",
+            "diary.html",
+        ])
+
+    def test_index_has_cards_only(self):
+        self._generate(rebuild=True, shard=True, index_size=2)
+        index = self._page("diary.html")
+        self.assertNotIn('class="diary-entry"', index)
+        self.assertEqual(index.count('class="diary-card"'), 2)
+        self.assertIn('href="diary-2026-02-02.html#diary-2026-02-02"', index)
+        self.assertNotIn("2026-01-31.html#", index)
+        # Month archive links
+        self.assertIn('href="diary-2026-01.html"', index)
+        self.assertIn('href="diary-2026-02.html"', index)
+
+    def test_month_page_contains_only_its_entries(self):
+        self._generate(rebuild=True, shard=True)
+        month = self._page("diary-2026-01.html")
+        self.assertIn("body of 2026-01-30", month)
+        self.assertIn("body of 2026-01-31", month)
+        self.assertNotIn("body of 2026-02-01", month)
+        self.assertIn('href="diary-2026-02.html"', month)  # newer month
+        self.assertIn('href="diary.html"', month)
+
+    def test_entry_page_links_neighbours(self):
+        self._generate(rebuild=True, shard=True)
+        page = self._page("diary-2026-01-31.html")
+        self.assertEqual(page.count('class="diary-entry"'), 1)
+        self.assertIn('href="diary-2026-02-01.html#diary-2026-02-01"', page)
+        self.assertIn('href="diary-2026-01-30.html#diary-2026-01-30"', page)
+
+    def test_stale_shards_are_removed(self):
+        self._generate(rebuild=True, shard=True)
+        (self.memory_dir / "2026-01-30.md").unlink()
+        self._generate(incremental=True, shard=True)
+        self.assertFalse((self.tmpdir / "diary-2026-01-30.html").exists())
+        self.assertTrue((self.tmpdir / "diary-2026-01-31.html").exists())
+
+    def test_single_page_mode_drops_pagination_placeholder(self):
+        self._generate(rebuild=True)
+        html = self.output.read_text(encoding="utf-8")
+        self.assertNotIn("DIARY_PAGINATION_PLACEHOLDER", html)
+        self.assertNotIn("diary-pagination", html)
+        self.assertIn('href="#diary-2026-02-02"', html)
+
+
+# ─── Generation Pool ─────────────────────────────────────────────────────────
+
+
+class _StubGateway(BaseHTTPRequestHandler):
+    """Minimal stand-in for the OpenClaw /v1/chat/completions endpoint."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            fail = server.failures > 0
+            if fail:
+                server.failures -= 1
+        try:
+            time.sleep(server.delay)
+            if fail:
+                self.send_response(getattr(server, "fail_status", 500))
+                self.end_headers()
+                return
+            system, user = (m["content"] for m in body["messages"])
+            if "translation machine" in system:
+                content = "JA " + user
+            else:
+                content = json.dumps({"ja": "まじか", "en": "No way"})
+            payload = json.dumps({"choices": [{"message": {"content": content}}]})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(payload.encode("utf-8"))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPrefetchGenerations(DiarySiteTestCase):
+    """Test the concurrent translation/recap pool against a stub Gateway."""
+
+    def setUp(self):
+        super().setUp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubGateway)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.failures = 0
+        self.server.delay = 0.02
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/chat/completions"
+        for patcher in (
+            mock.patch.object(update_diary, "_gateway_url_and_token", return_value=(url, "")),
+            mock.patch.object(update_diary, "TRANSLATION_CACHE_DIR", self.tmpdir / "tc"),
+            mock.patch.object(update_diary, "RECAP_CACHE_DIR", self.tmpdir / "rc"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.dates = [f"2026-02-{day:02d}" for day in range(10, 16)]
+        for d in self.dates:
+            self._write(self.memory_dir, d, f"- note for {d}")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def _prefetch(self, **kwargs):
+        kwargs.setdefault("backoff", 0.01)
+        return update_diary.prefetch_generations(
+            self.dates, self.memory_dir, self.obsidian_dir, db_conn=self.conn, **kwargs
+        )
+
+    def _md_hash(self, d):
+        import hashlib
+        md = update_diary.merge_markdown_sources(f"- note for {d}", None)
+        return hashlib.sha256(md.encode("utf-8")).hexdigest()
+
+    def test_fills_both_caches(self):
+        stats = self._prefetch(workers=3)
+        self.assertEqual(stats, {"translations": 6, "recaps": 6, "failed": 0})
+        for d in self.dates:
+            h = self._md_hash(d)
+            self.assertIn(f"note for {d}", get_translation_cache(self.conn, d, "integrated", h))
+            self.assertEqual(get_recap_cache(self.conn, d, h), ("まじか", "No way"))
+
+    def test_concurrency_is_bounded(self):
+        self._prefetch(workers=3)
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 3)
+
+    def test_cached_dates_are_skipped(self):
+        self._prefetch(workers=3)
+        requests = self.server.requests
+        stats = self._prefetch(workers=3)
+        self.assertEqual(stats, {"translations": 0, "recaps": 0, "failed": 0})
+        self.assertEqual(self.server.requests, requests)
+
+    def test_retries_transient_failures(self):
+        self.server.failures = 2
+        stats = self._prefetch(workers=1, retries=2)
+        self.assertEqual(stats["failed"], 0)
+        self.assertEqual(self.server.requests, 12 + 2)
+
+    def test_gives_up_after_retries(self):
+        self.server.failures = 100
+        stats = self._prefetch(workers=2, retries=1)
+        self.assertEqual(stats, {"translations": 0, "recaps": 0, "failed": 12})
+
+    def test_requests_run_outside_write_transaction(self):
+        from domain.diary import in_transaction
+        seen = []
+        real = update_diary._chat_completion
+
+        def spy(payload, *, timeout):
+            seen.append(in_transaction(self.conn))
+            return real(payload, timeout=timeout)
+
+        with mock.patch.object(update_diary, "_chat_completion", spy):
+            update_diary.generate_site_with_db(self.config, self.conn, rebuild=True, workers=1)
+        self.assertEqual(len(seen), 12)
+        self.assertFalse(any(seen))
+
+    def test_failed_batch_keeps_fetched_generations(self):
+        with mock.patch.object(update_diary, "_save_entry_to_db", side_effect=RuntimeError("disk")):
+            with self.assertRaises(RuntimeError):
+                update_diary.generate_site_with_db(self.config, self.conn, rebuild=True, workers=2)
+        for d in self.dates:
+            self.assertIsNotNone(get_recap_cache(self.conn, d, self._md_hash(d)))
+        self.assertIsNone(get_entry(self.conn, self.dates[0]))
+
+    def test_client_errors_are_not_retried(self):
+        self.server.failures = 100
+        self.server.fail_status = 400
+        stats = self._prefetch(workers=2, retries=3)
+        self.assertEqual(stats["failed"], 12)
+        self.assertEqual(self.server.requests, 12)
+
+    def test_rate_limit_is_retried(self):
+        self.server.failures = 1
+        self.server.fail_status = 429
+        stats = self._prefetch(workers=1, retries=1)
+        self.assertEqual(stats["failed"], 0)
+        self.assertEqual(self.server.requests, 13)
+
+    def test_generate_uses_prefetched_results(self):
+        update_diary.generate_site_with_db(
+            self.config, self.conn, rebuild=True, workers=3
+        )
+        entry = get_entry(self.conn, "2026-02-12")
+        self.assertIn("JA", entry["raw_md_ja"])
+        self.assertEqual(entry["recap_en"], "No way")
+        self.assertEqual(self.server.requests, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestMarkdownConverter(unittest.TestCase):
+    """Golden output for the Markdown subset used by diary entries."""
+
+    def convert(self, text):
+        return update_diary.MarkdownConverter().convert(text)
+
+    def test_blocks(self):
+        md = (
+            "# Title\n"
+            "\n"
+            "## Morning\n"
+            "Plain line\n"
+            "- one\n"
+            "  continued\n"
+            "- two\n"
+            "1. first\n"
+            "2. second\n"
+            "#### Deep\n"
+            "##### Too deep\n"
+            "-not a list\n"
+        )
+        self.assertEqual(
+            self.convert(md),
+            "<h3>Morning</h3>\n"
+            "<p>Plain line</p>\n"
+            "<ul>\n  <li>one continued</li>\n  <li>two</li>\n</ul>\n"
+            "<ol>\n  <li>first</li>\n  <li>second</li>\n</ol>\n"
+            "<h5>Deep</h5>\n"
+            "<p>##### Too deep</p>\n"
+            "<p>-not a list</p>",
+        )
+
+    def test_table(self):
+        md = "| a | b |\n|---|:-:|\n| **x** | `y` |"
+        self.assertEqual(
+            self.convert(md),
+            '<table class="diary-table">\n'
+            "  <thead><tr>\n    <th>a</th>\n    <th>b</th>\n  </tr></thead>\n"
+            "  <tbody>\n  <tr>\n    <td><strong>x</strong></td>\n"
+            "    <td><code>y</code></td>\n  </tr>\n  </tbody>\n</table>",
+        )
+
+    def test_inline(self):
+        inline = update_diary.MarkdownConverter._inline
+        self.assertEqual(inline("plain"), "plain")
+        self.assertEqual(inline("**b** and *i*"), "<strong>b</strong> and <em>i</em>")
+        self.assertEqual(inline("[home](/x)"), '<a href="/x">home</a>')
+        self.assertEqual(inline("[not a link] (x)"), "[not a link] (x)")
+        self.assertEqual(inline("a * b"), "a * b")
+
+    def test_inline_passes_cascade(self):
+        """Later passes apply inside markup produced by earlier ones."""
+        inline = update_diary.MarkdownConverter._inline
+        self.assertEqual(inline("**a `b` c**"), "<strong>a <code>b</code> c</strong>")
+        self.assertEqual(inline("`*x*`"), "<code><em>x</em></code>")
+        self.assertEqual(inline("[**t**](u)"), '<a href="u"><strong>t</strong></a>')
+
+    def test_synthetic_diary(self):
+        from scripts.bench_markdown import synthetic_diary
+
+        html = self.convert(synthetic_diary(20))
+        self.assertEqual(html.count("<h3>"), 20)
+        self.assertNotIn("**", html)
@@ -0,0 +1,92 @@
+"""Tests for domain/visits.py — event-sourced visit store."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from domain import visits
+from domain.constants import VISIT_HEARTBEAT_SEC
+from domain.nurture import new_visit_state, replay_visits
+
+T0 = 1_770_940_800  # 2026-02-13 09:00 JST
+
+
+class VisitStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.conn = visits.init_db(self.tmpdir / "visits.db")
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _observe(self, minutes, statuses):
+        """Record one observation per minute starting `minutes` after T0."""
+        state = None
+        for i, status in enumerate(statuses):
+            state = visits.record(self.conn, T0 + (minutes + i) * 60, status)
+        return state
+
+
+class TestRecord(VisitStoreTestCase):
+    def test_only_transitions_and_heartbeats_are_stored(self):
+        self._observe(0, ["offline"] * 5 + ["online"] * 30 + ["away"] * 5)
+        events = [status for _, _, status in visits.iter_events(self.conn)]
+        # offline, online, online heartbeat, online heartbeat, away
+        self.assertEqual(events[0], "offline")
+        self.assertEqual(events[-1], "away")
+        self.assertEqual(events.count("online"), 1 + 29 // (VISIT_HEARTBEAT_SEC // 60))
+
+    def test_state_matches_replay_of_every_observation(self):
+        statuses = (["offline"] * 3 + ["online"] * 50 + ["away"] * 10 + ["online"] * 7) * 3
+        state = self._observe(0, statuses)
+        expected = replay_visits((T0 + i * 60, s) for i, s in enumerate(statuses))
+        self.assertEqual(state, expected)
+        self.assertEqual(visits.current_state(self.conn)[1]["online_seconds"],
+                         expected["online_seconds"] - 6 * 60)  # tail not stored yet
+
+    def test_snapshot_bounds_replay(self):
+        with mock.patch.object(visits, "VISIT_SNAPSHOT_EVERY", 10):
+            self._observe(0, ["online", "offline"] * 12)
+            snapshot_id, snapshot = visits.latest_snapshot(self.conn)
+            self.assertEqual(snapshot_id, 20)  # taken when replaying 10+ events
+            self.assertEqual(snapshot["total_visits"], 10)
+            self._observe(24, ["online", "offline"] * 6)
+            self.assertEqual(visits.latest_snapshot(self.conn)[0], 30)
+        self.assertEqual(visits.current_state(self.conn)[1]["total_visits"], 18)
+
+
+class TestSeedAndRebuild(VisitStoreTestCase):
+    def test_seed_is_base_of_replay(self):
+        base = new_visit_state()
+        base.update(total_visits=40, online_seconds=36000.0)
+        visits.seed(self.conn, base)
+        state = self._observe(0, ["online", "online", "offline"])
+        self.assertEqual(state["total_visits"], 41)
+        self.assertEqual(state["online_seconds"], 36000.0 + 120)
+
+    def test_seed_requires_empty_store(self):
+        self._observe(0, ["online"])
+        with self.assertRaises(ValueError):
+            visits.seed(self.conn, new_visit_state())
+
+    def test_rebuild_replaces_derived_snapshots(self):
+        with mock.patch.object(visits, "VISIT_SNAPSHOT_EVERY", 5):
+            self._observe(0, ["online", "offline"] * 10)
+        visits.save_snapshot(self.conn, 12, new_visit_state())  # stale/corrupt snapshot
+        self.conn.commit()
+        state = visits.rebuild(self.conn)
+        self.assertEqual(state["total_visits"], 10)
+        self.assertEqual(visits.latest_snapshot(self.conn), (20, state))
+
+    def test_replay_all_with_other_rules(self):
+        self._observe(0, ["online"])
+        visits.record(self.conn, T0 + 3600, "offline")
+        self.assertEqual(visits.replay_all(self.conn)["online_seconds"], 15 * 60)
+        self.assertEqual(visits.replay_all(self.conn, max_gap=3600)["online_seconds"], 3600)
+
+
+if __name__ == "__main__":
+    unittest.main()
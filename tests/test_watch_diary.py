@@ -0,0 +1,161 @@
+"""Tests for scripts/watch_diary.py — debounced diary update queue."""
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from scripts import update_diary
+from scripts.watch_diary import DiaryHandler, UpdateQueue, daemon_runner, date_from_path
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _event(path, *, dest=None, is_directory=False):
+    return SimpleNamespace(src_path=path, dest_path=dest, is_directory=is_directory)
+
+
+class TestDateFromPath(unittest.TestCase):
+    def test_daily_note(self):
+        self.assertEqual(date_from_path("/vault/2026-02-16.md"), "2026-02-16")
+
+    def test_other_files(self):
+        self.assertIsNone(date_from_path("/vault/Ideas.md"))
+        self.assertIsNone(date_from_path("/vault/2026-02-16.md.swp"))
+        self.assertIsNone(date_from_path("/vault/.2026-02-16.md.tmp"))
+
+
+class TestUpdateQueue(unittest.TestCase):
+    """Drive the queue with a fake event source and a fake clock."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.runs = []
+        self.queue = UpdateQueue(self.runs.append, quiet=2.0, clock=self.clock)
+        self.handler = DiaryHandler(self.queue)
+
+    def test_burst_is_coalesced(self):
+        for t in range(10):  # autosave every 0.5s
+            self.clock.now = t * 0.5
+            self.handler.on_modified(_event("/vault/2026-02-16.md"))
+            self.assertEqual(self.queue.run_pending(), [])
+        self.clock.now += 2.0
+        self.assertEqual(self.queue.run_pending(), ["2026-02-16"])
+        self.assertEqual(self.runs, [["2026-02-16"]])
+        self.assertEqual(self.queue.pending(), [])
+
+    def test_settled_dates_share_one_run(self):
+        self.handler.on_created(_event("/memory/2026-02-15.md"))
+        self.handler.on_modified(_event("/vault/2026-02-16.md"))
+        self.clock.now = 3.0
+        self.queue.run_pending()
+        self.assertEqual(self.runs, [["2026-02-15", "2026-02-16"]])
+
+    def test_quiet_window_is_per_date(self):
+        self.handler.on_modified(_event("/vault/2026-02-15.md"))
+        self.clock.now = 1.5
+        self.handler.on_modified(_event("/vault/2026-02-16.md"))
+        self.clock.now = 2.5
+        self.assertEqual(self.queue.run_pending(), ["2026-02-15"])
+        self.assertEqual(self.queue.pending(), ["2026-02-16"])
+
+    def test_ignores_directories_and_other_files(self):
+        self.handler.on_modified(_event("/vault/2026-02-16.md", is_directory=True))
+        self.handler.on_modified(_event("/vault/Ideas.md"))
+        self.assertEqual(self.queue.pending(), [])
+
+    def test_atomic_save_rename(self):
+        self.handler.on_moved(_event("/vault/.tmp123", dest="/vault/2026-02-16.md"))
+        self.handler.on_deleted(_event("/vault/2026-02-14.md"))
+        self.assertEqual(self.queue.pending(), ["2026-02-14", "2026-02-16"])
+
+
+class TestUpdateWorker(unittest.TestCase):
+    """Run the real worker thread with a short quiet window."""
+
+    def test_one_update_at_a_time(self):
+        active = 0
+        max_active = 0
+        runs = []
+        lock = threading.Lock()
+
+        def runner(dates):
+            nonlocal active, max_active
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.1)
+            runs.append(dates)
+            with lock:
+                active -= 1
+
+        queue = UpdateQueue(runner, quiet=0.05)
+        worker, stop = queue.start()
+        try:
+            queue.add("2026-02-15")
+            time.sleep(0.08)  # first update starts and is still running...
+            queue.add("2026-02-16")  # ...while more events arrive
+            queue.add("2026-02-16")
+            deadline = time.monotonic() + 2
+            while len(runs) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            stop.set()
+            queue.wake()
+            worker.join(timeout=2)
+        self.assertEqual(runs, [["2026-02-15"], ["2026-02-16"]])
+        self.assertEqual(max_active, 1)
+        self.assertFalse(worker.is_alive())
+
+
+    def test_idle_worker_waits_without_timeout(self):
+        queue = UpdateQueue(lambda dates: None, quiet=0.05)
+        timeouts = []
+        wait = queue._cond.wait
+
+        def recording_wait(timeout=None):
+            timeouts.append(timeout)
+            return wait(timeout)
+
+        queue._cond.wait = recording_wait
+        worker, stop = queue.start()
+        time.sleep(0.2)
+        stop.set()
+        queue.wake()
+        worker.join(timeout=2)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(timeouts, [None])
+
+
+class TestDaemonRunner(unittest.TestCase):
+    def test_refreshes_through_daemon(self):
+        calls = []
+        daemon = SimpleNamespace(refresh=lambda dates: calls.append(dates) or True)
+        daemon_runner(daemon)(["2026-02-15", "2026-02-16"])
+        self.assertEqual(calls, [["2026-02-15", "2026-02-16"]])
+
+    def test_errors_do_not_escape(self):
+        def refresh(dates):
+            raise RuntimeError("boom")
+
+        daemon_runner(SimpleNamespace(refresh=refresh))(["2026-02-15"])
+
+
+class TestUpdateDiaryDates(unittest.TestCase):
+    def test_cli_accepts_dates(self):
+        args = update_diary.parse_args(["2026-02-16", "2026-02-15"])
+        self.assertEqual(args.dates, ["2026-02-16", "2026-02-15"])
+
+    def test_cli_rejects_non_dates(self):
+        with self.assertRaises(SystemExit):
+            update_diary.parse_args(["20260216"])
+
+
+if __name__ == "__main__":
+    unittest.main()